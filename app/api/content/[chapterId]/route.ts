@@ -2,12 +2,20 @@ import { NextRequest, NextResponse } from 'next/server';
 import fs from 'fs';
 import path from 'path';
 import prisma from '@/lib/db/prisma';
+import { findBundledChapter, readBundledChapter } from '@/lib/content/chapter-bundle';
+import { loadChapterManifest, resolveChapter } from '@/lib/content/chapter-manifest';
 
 type ChapterCandidate = {
   file: string;
   data: any;
 };
 
+type CurriculumRow = {
+  subject: string;
+  grade: number;
+  chapterNumber: number;
+};
+
 function loadCandidate(contentDir: string, file: string): ChapterCandidate | null {
   try {
     const raw = fs.readFileSync(path.join(contentDir, file), 'utf-8');
@@ -17,6 +25,19 @@ function loadCandidate(contentDir: string, file: string): ChapterCandidate | nul
   }
 }
 
+// The manifest may have classified a chapter from its filename, so a file it
+// points at still has to agree with its own metadata. The bundle only holds
+// chapters whose metadata matches their key (scripts/chapter_bundle.py).
+function metadataMismatch(chapterData: any, curriculum: CurriculumRow): string | null {
+  if (chapterData?.metadata?.chapterNumber !== curriculum.chapterNumber) {
+    return 'Chapter number mismatch in content file';
+  }
+  if (chapterData?.metadata?.subject !== curriculum.subject) {
+    return 'Subject mismatch in content file';
+  }
+  return null;
+}
+
 export async function GET(
   _request: NextRequest,
   { params }: { params: Promise<{ chapterId: string }> }
@@ -34,8 +55,34 @@ export async function GET(
       );
     }
 
-    const contentDir = path.join(process.cwd(), 'content', 'chapters');
+    // Fast path: slice the chapter straight out of the packed bundle, unparsed.
+    const contentRoot = path.join(process.cwd(), 'content');
+    const bundled = findBundledChapter(
+      contentRoot,
+      curriculum.subject,
+      curriculum.grade,
+      curriculum.chapterNumber
+    );
+    const raw = bundled ? readBundledChapter(contentRoot, bundled) : null;
+    if (raw) {
+      return new NextResponse(new Uint8Array(raw), {
+        headers: { 'Content-Type': 'application/json' },
+      });
+    }
+
+    // Then the chapter manifest.
+    const contentDir = path.join(contentRoot, 'chapters');
+    const manifest = loadChapterManifest(contentRoot);
+    const picked = manifest
+      ? resolveChapter(manifest, curriculum.subject, curriculum.grade, curriculum.chapterNumber)
+      : undefined;
+    const fromManifest = picked ? loadCandidate(contentDir, picked.file) : null;
+    if (fromManifest && !metadataMismatch(fromManifest.data, curriculum)) {
+      return NextResponse.json(fromManifest.data);
+    }
 
+    // Manifest missing, stale (a chapter added without `chapter_manifest.py build`)
+    // or wrong: scan the chapter files.
     if (!fs.existsSync(contentDir)) {
       return NextResponse.json({ error: 'Content directory not found' }, { status: 404 });
     }
@@ -74,15 +121,11 @@ export async function GET(
     }
 
     const gradeMatch = subjectMatches.find(c => c.data?.metadata?.grade === curriculum.grade);
-    const picked = gradeMatch ?? subjectMatches[0];
-    const chapterData = picked.data;
-
-    if (chapterData?.metadata?.chapterNumber !== curriculum.chapterNumber) {
-      return NextResponse.json({ error: 'Chapter number mismatch in content file' }, { status: 400 });
-    }
+    const chapterData = (gradeMatch ?? subjectMatches[0]).data;
 
-    if (chapterData?.metadata?.subject !== curriculum.subject) {
-      return NextResponse.json({ error: 'Subject mismatch in content file' }, { status: 400 });
+    const mismatch = metadataMismatch(chapterData, curriculum);
+    if (mismatch) {
+      return NextResponse.json({ error: mismatch }, { status: 400 });
     }
 
     return NextResponse.json(chapterData);
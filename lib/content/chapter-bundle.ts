@@ -0,0 +1,137 @@
+import fs from 'fs';
+import path from 'path';
+
+// Reader for content/chapters.bundle, written by scripts/chapter_bundle.py.
+// The offset table is read once per bundle file; each request then reads
+// only the byte range of the chapter it serves.
+
+const MAGIC = 'HARYACB1';
+const FORMAT_VERSION = 2;
+const HEADER_SIZE = 32;
+const ENTRY_SIZE = 32;
+
+export type BundleEntry = {
+  subject: string;
+  grade: number;
+  chapterNumber: number;
+  file: string;
+  offset: number;
+  length: number;
+};
+
+type BundleIndex = {
+  mtimeMs: number;
+  size: number;
+  // `${subject}\0${chapterNumber}` -> entries in (grade, file) order
+  entries: Map<string, BundleEntry[]>;
+};
+
+let cached: BundleIndex | null = null;
+
+const key = (subject: string, chapterNumber: number) => `${subject}\0${chapterNumber}`;
+
+function readAt(fd: number, length: number, position: number): Buffer {
+  const buf = Buffer.alloc(length);
+  let done = 0;
+  while (done < length) {
+    const n = fs.readSync(fd, buf, done, length - done, position + done);
+    if (n === 0) throw new Error('Chapter bundle is truncated');
+    done += n;
+  }
+  return buf;
+}
+
+function bundlePath(contentDir: string) {
+  return path.join(contentDir, 'chapters.bundle');
+}
+
+function loadIndex(contentDir: string): BundleIndex | null {
+  let stat: fs.Stats;
+  try {
+    stat = fs.statSync(bundlePath(contentDir));
+  } catch {
+    return null;
+  }
+
+  // In development chapters are edited in place. Adding, removing or atomically
+  // rewriting one bumps the directory mtime; a bundle older than that is stale,
+  // so fall back to the files. Production images ship content read-only.
+  if (process.env.NODE_ENV !== 'production') {
+    const chaptersStat = fs.statSync(path.join(contentDir, 'chapters'), { throwIfNoEntry: false });
+    if (chaptersStat && chaptersStat.mtimeMs > stat.mtimeMs) return null;
+  }
+
+  if (cached && cached.mtimeMs === stat.mtimeMs && cached.size === stat.size) return cached;
+
+  const fd = fs.openSync(bundlePath(contentDir), 'r');
+  try {
+    const header = readAt(fd, HEADER_SIZE, 0);
+    if (header.toString('latin1', 0, 8) !== MAGIC || header.readUInt32LE(8) !== FORMAT_VERSION) {
+      return null;
+    }
+    const count = header.readUInt32LE(12);
+    const tableOffset = header.readUInt32LE(16);
+    const stringsOffset = header.readUInt32LE(20);
+    const stringsLength = header.readUInt32LE(24);
+    const dataOffset = header.readUInt32LE(28);
+
+    const table = readAt(fd, count * ENTRY_SIZE, tableOffset);
+    const strings = readAt(fd, stringsLength, stringsOffset);
+    const entries = new Map<string, BundleEntry[]>();
+
+    for (let i = 0; i < count; i++) {
+      const at = i * ENTRY_SIZE;
+      const subjectOffset = table.readUInt32LE(at + 8);
+      const fileOffset = table.readUInt32LE(at + 16);
+      const entry: BundleEntry = {
+        chapterNumber: table.readUInt32LE(at),
+        grade: table.readUInt32LE(at + 4),
+        subject: strings.toString('utf-8', subjectOffset, subjectOffset + table.readUInt32LE(at + 12)),
+        file: strings.toString('utf-8', fileOffset, fileOffset + table.readUInt32LE(at + 20)),
+        offset: dataOffset + table.readUInt32LE(at + 24),
+        length: table.readUInt32LE(at + 28),
+      };
+      const k = key(entry.subject, entry.chapterNumber);
+      const list = entries.get(k);
+      if (list) list.push(entry);
+      else entries.set(k, [entry]);
+    }
+
+    cached = { mtimeMs: stat.mtimeMs, size: stat.size, entries };
+    return cached;
+  } finally {
+    fs.closeSync(fd);
+  }
+}
+
+/**
+ * Find a chapter in the bundle, preferring an exact grade match.
+ * Returns undefined when there is no current bundle or no such chapter,
+ * in which case callers read the file named in the chapter manifest.
+ */
+export function findBundledChapter(
+  contentDir: string,
+  subject: string,
+  grade: number | null | undefined,
+  chapterNumber: number
+): BundleEntry | undefined {
+  const index = loadIndex(contentDir);
+  const matches = index?.entries.get(key(subject, chapterNumber));
+  if (!matches || matches.length === 0) return undefined;
+  return matches.find(e => e.grade === grade) ?? matches[0];
+}
+
+/**
+ * The chapter's raw JSON bytes, ready to send without parsing, or null if the
+ * bundle was replaced since the entry was looked up.
+ */
+export function readBundledChapter(contentDir: string, entry: BundleEntry): Buffer | null {
+  const fd = fs.openSync(bundlePath(contentDir), 'r');
+  try {
+    const stat = fs.fstatSync(fd);
+    if (!cached || stat.mtimeMs !== cached.mtimeMs || stat.size !== cached.size) return null;
+    return readAt(fd, entry.length, entry.offset);
+  } finally {
+    fs.closeSync(fd);
+  }
+}
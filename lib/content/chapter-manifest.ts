@@ -0,0 +1,49 @@
+import fs from 'fs';
+import path from 'path';
+
+// Reader for content/chapter-manifest.json, generated by scripts/chapter_manifest.py.
+// Every chapter file is classified there once (subject, grade, language,
+// chapter number), so the API never has to guess from filenames.
+
+export type ManifestEntry = {
+  file: string;
+  subject: string;
+  grade: number;
+  language: string;
+  chapterNumber: number;
+  contentHash: string;
+};
+
+let cached: { mtimeMs: number; entries: ManifestEntry[] } | null = null;
+
+export function loadChapterManifest(contentDir: string): ManifestEntry[] | null {
+  const manifestPath = path.join(contentDir, 'chapter-manifest.json');
+  let stat: fs.Stats;
+  try {
+    stat = fs.statSync(manifestPath);
+  } catch {
+    return null;
+  }
+  if (cached && cached.mtimeMs === stat.mtimeMs) return cached.entries;
+
+  const raw = JSON.parse(fs.readFileSync(manifestPath, 'utf-8'));
+  if (raw?.version !== 1 || !Array.isArray(raw.chapters)) return null;
+  cached = { mtimeMs: stat.mtimeMs, entries: raw.chapters };
+  return cached.entries;
+}
+
+/** Entries for one chapter number, in (subject, grade, file) order. */
+export function manifestCandidates(entries: ManifestEntry[], chapterNumber: number): ManifestEntry[] {
+  return entries.filter(e => e.chapterNumber === chapterNumber);
+}
+
+/** The chapter to serve for a subject/chapter: exact grade first, else any grade. */
+export function resolveChapter(
+  entries: ManifestEntry[],
+  subject: string,
+  grade: number | null | undefined,
+  chapterNumber: number
+): ManifestEntry | undefined {
+  const matches = manifestCandidates(entries, chapterNumber).filter(e => e.subject === subject);
+  return matches.find(e => e.grade === grade) ?? matches[0];
+}
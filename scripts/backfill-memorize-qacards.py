@@ -1,19 +1,12 @@
 #!/usr/bin/env python3
-import json, os
+from chapter_corpus import corpus, save_chapter
 
-chapters_dir = "/opt/h-arya/content/chapters"
-updated = 0
 
-for fn in os.listdir(chapters_dir):
-    if not fn.endswith('.json'):
-        continue
-    p = os.path.join(chapters_dir, fn)
-    try:
-        with open(p, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except Exception:
-        continue
+def backfill_qa_cards(data, force=False):
+    """Derive memorize qaCards from test explanations. Returns True if data changed.
 
+    Existing cards are kept unless force is set.
+    """
     test = data.get('test', [])
     qa_cards = []
     if isinstance(test, list):
@@ -26,7 +19,7 @@ for fn in os.listdir(chapters_dir):
                 })
 
     if not qa_cards:
-        continue
+        return False
 
     if 'textbookExercise' not in data or not isinstance(data['textbookExercise'], dict):
         data['textbookExercise'] = {
@@ -37,10 +30,23 @@ for fn in os.listdir(chapters_dir):
         }
 
     existing_cards = data['textbookExercise'].get('qaCards', [])
-    if not isinstance(existing_cards, list) or len(existing_cards) == 0:
+    if force or not isinstance(existing_cards, list) or len(existing_cards) == 0:
+        if existing_cards == qa_cards[:20]:
+            return False
         data['textbookExercise']['qaCards'] = qa_cards[:20]
-        updated += 1
-        with open(p, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        return True
+    return False
 
-print(f"Updated {updated} chapter files with memorize qaCards")
+
+def main():
+    updated = 0
+    for ch in corpus().chapters():
+        if backfill_qa_cards(ch.data):
+            updated += 1
+            save_chapter(ch)
+
+    print(f"Updated {updated} chapter files with memorize qaCards")
+
+
+if __name__ == "__main__":
+    main()
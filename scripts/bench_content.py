@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Benchmark the content scripts on synthetic corpora of 1k, 10k and 50k chapters.
+
+The generator clones the real chapters round-robin and mutates every long
+text field (word swaps plus words drawn from the corpus vocabulary of the
+same script, so Hindi and Marathi clones stay Devanagari). Derived sections
+(qaCards, longAnswers, interactiveElement) are stripped so every stage has
+real work to do.
+
+Each script then runs in its own process against the synthetic corpus, in
+the order a maintenance session would run them, and the harness records
+wall time, chapters per second and peak RSS. Results go to
+ops/reports/benchmarks/content-bench-<UTC time>.json and are compared with
+the previous run so regressions stand out.
+
+Usage:
+    python3 scripts/bench_content.py run                        # 1k, 10k, 50k
+    python3 scripts/bench_content.py run --sizes 1000 --jobs 4 --note "50k needs more memory"
+    python3 scripts/bench_content.py generate 5000 /tmp/synthetic/chapters
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from chapter_corpus import REPO_ROOT, corpus, dump_chapter
+from retrieval import tokenize
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPORTS_DIR = REPO_ROOT / "ops" / "reports" / "benchmarks"
+DEFAULT_SIZES = (1000, 10000, 50000)
+REGRESSION_THRESHOLD = 1.2  # flag stages that got 20% slower
+
+_DEVANAGARI_RE = re.compile(r"[\u0900-\u097F]")
+_MIN_MUTATED_LENGTH = 20  # leave ids, enums, colours and other short fields alone
+
+
+def _vocabulary(chapters):
+    """Distinct corpus words split by script: (latin, devanagari)."""
+    latin, devanagari = set(), set()
+    for ch in chapters:
+        for c in ch.data.get("concepts") or []:
+            if isinstance(c, dict):
+                for word in tokenize(str(c.get("content") or "")):
+                    (devanagari if _DEVANAGARI_RE.match(word) else latin).add(word)
+    return sorted(latin), sorted(devanagari)
+
+
+def _mutate(value, rng, vocab):
+    if isinstance(value, dict):
+        return {k: _mutate(v, rng, vocab) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_mutate(v, rng, vocab) for v in value]
+    if not isinstance(value, str) or len(value) < _MIN_MUTATED_LENGTH:
+        return value
+    words = value.split(" ")
+    if len(words) > 3:
+        i, j = rng.randrange(len(words)), rng.randrange(len(words))
+        words[i], words[j] = words[j], words[i]
+    if vocab and rng.random() < 0.5:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(vocab))
+    return " ".join(words)
+
+
+def _strip_derived(data):
+    data.pop("interactiveElement", None)
+    te = data.get("textbookExercise")
+    if isinstance(te, dict):
+        te.pop("qaCards", None)
+        te.pop("longAnswers", None)
+
+
+def _strip_exercises(chapters_dir, filenames):
+    """Drop textbookExercise from the chapters the extractor fills, so it parses them instead of skipping."""
+    for name in filenames:
+        path = Path(chapters_dir) / name
+        if path.exists():
+            data = json.loads(path.read_bytes())
+            if data.pop("textbookExercise", None) is not None:
+                path.write_bytes(dump_chapter(data))
+
+
+def generate_corpus(size, out_dir, seed=7, source=None):
+    """Write `size` synthetic chapters to out_dir. Returns (bytes written, Devanagari chapters)."""
+    source = source or corpus()
+    originals = source.chapters()
+    latin, devanagari = _vocabulary(originals)
+    rng = random.Random(seed)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    written = 0
+    deva_docs = 0
+    for k in range(size):
+        ch = originals[k % len(originals)]
+        is_deva = ch.subject in ("Hindi", "Marathi")
+        data = _mutate(ch.data, rng, devanagari if is_deva else latin)
+        _strip_derived(data)
+        meta = data.get("metadata")
+        if isinstance(meta, dict) and k >= len(originals):
+            meta["title"] = f"{meta.get('title', '')} ({k})"
+        stem = ch.filename[:-len(".json")]
+        name = ch.filename if k < len(originals) else f"{stem}-syn{k}.json"
+        payload = dump_chapter(data)
+        (out_dir / name).write_bytes(payload)
+        written += len(payload)
+        deva_docs += is_deva
+    return written, deva_docs
+
+
+def _textbook_text(size, source=None):
+    """Synthetic pdftotext output: `size` chapter sections with headings and exercises."""
+    extractor = _load_extractor()
+    source = source or corpus()
+    by_name = {ch.filename: ch for ch in source.chapters()}
+    parts = []
+    for k in range(size):
+        filename, heading = extractor.CHAPTERS[k % len(extractor.CHAPTERS)]
+        ch = by_name.get(filename)
+        concepts = (ch.data.get("concepts") or []) if ch else []
+        tests = (ch.data.get("test") or []) if ch else []
+        parts.append(f"{k % len(extractor.CHAPTERS) + 1}. {heading}\n")
+        parts.extend(f"{c.get('content', '')}\n" for c in concepts if isinstance(c, dict))
+        parts.append("Exercise\n")
+        for i, q in enumerate(tests, 1):
+            if isinstance(q, dict):
+                parts.append(f"{i}. {q.get('question', '')}\n   (a) {q.get('explanation', '')}\n")
+        parts.append("Project :\n")
+    return "".join(parts)
+
+
+def _load_extractor():
+    from content_pipeline import load_script
+    return load_script("extract-textbook-exercises.py")
+
+
+def _targets(jobs, text_path):
+    j = ["--jobs", str(jobs)]
+    return [
+        ("load", ["-c", "from chapter_corpus import corpus; len(corpus())"]),
+        ("manifest", ["chapter_manifest.py", "build"]),
+        ("validate", ["validate_chapters.py", "--full", *j]),
+        ("add-interactive-elements", ["add-interactive-elements.py"]),
+        ("stage:qacards", ["content_pipeline.py", "--stages", "qacards", "--full", *j]),
+        ("stage:longanswers", ["content_pipeline.py", "--stages", "longanswers", "--full", *j]),
+        ("stage:interactive", ["content_pipeline.py", "--stages", "interactive", "--full", *j]),
+        ("stage:trustpass", ["content_pipeline.py", "--stages", "trustpass", "--full", *j]),
+        ("trust_pass_fixer", ["trust_pass_fixer.py"]),
+        ("simple_fixer", ["simple_fixer.py"]),
+        ("extract-textbook-exercises", ["extract-textbook-exercises.py", "--text", str(text_path)]),
+        ("bundle", ["chapter_bundle.py", "build"]),
+        ("corpus-index", ["corpus_index.py", "build"]),
+        # The no-op run follows a full build, so it only measures the up-to-date check.
+        ("pipeline:full", ["content_pipeline.py", "--full", *j]),
+        ("pipeline:no-op", ["content_pipeline.py", *j]),
+    ]
+
+
+def _measure(argv, env):
+    """Run one script to completion; (seconds, peak RSS in MiB, exit code, stderr tail)."""
+    with tempfile.TemporaryFile() as err:
+        t0 = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, *argv], cwd=SCRIPTS_DIR, env=env,
+                                stdout=subprocess.DEVNULL, stderr=err)
+        # wait4 reports this child's own peak RSS (and that of its worker processes).
+        _, status, usage = os.wait4(proc.pid, 0)
+        elapsed = time.perf_counter() - t0
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        err.seek(0)
+        tail = err.read()[-2000:].decode("utf-8", "replace")
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    rss = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return elapsed, rss, proc.returncode, tail
+
+
+def bench_size(size, jobs, work_dir):
+    root = Path(work_dir) / f"corpus-{size}"
+    chapters_dir = root / "content" / "chapters"
+    if root.exists():
+        shutil.rmtree(root)
+    t0 = time.perf_counter()
+    total_bytes, deva_docs = generate_corpus(size, chapters_dir)
+    text_path = root / "textbook.txt"
+    text_path.write_text(_textbook_text(max(20, size // 20)), encoding="utf-8")
+    generated = time.perf_counter() - t0
+    print(f"[{size}] generated {total_bytes / 1e6:.1f} MB ({deva_docs} Devanagari chapters) in {generated:.1f}s")
+
+    env = dict(os.environ, HARYA_CHAPTERS_DIR=str(chapters_dir), HARYA_CACHE_DIR=str(root / ".cache"))
+    stages = []
+    for name, argv in _targets(jobs, text_path):
+        if name == "extract-textbook-exercises":
+            _strip_exercises(chapters_dir, [f for f, _ in _load_extractor().CHAPTERS])
+        seconds, rss, code, tail = _measure(argv, env)
+        row = {"name": name, "seconds": round(seconds, 4), "chaptersPerSecond": round(size / seconds, 1),
+               "peakRssMiB": round(rss, 1), "exitCode": code}
+        # The validator exits 1 when it finds violations; anything else is a failure.
+        if code not in (0, 1) or (code == 1 and name != "validate"):
+            row["stderr"] = tail
+        stages.append(row)
+        print(f"[{size}] {name:28s} {seconds:8.2f}s {size / seconds:10.1f} ch/s {rss:8.1f} MiB"
+              + ("" if "stderr" not in row else f"  (exit {code})"))
+    return {"chapters": size, "bytes": total_bytes, "devanagariChapters": deva_docs,
+            "generateSeconds": round(generated, 2), "stages": stages}
+
+
+def _previous_report(exclude=None):
+    reports = sorted(p for p in REPORTS_DIR.glob("content-bench-*.json") if p != exclude)
+    if not reports:
+        return None
+    with open(reports[-1], "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(current, previous):
+    """Lines describing stages that got noticeably slower than in the previous report."""
+    lines = []
+    for size, result in current["sizes"].items():
+        before = {s["name"]: s["seconds"] for s in previous.get("sizes", {}).get(size, {}).get("stages", [])}
+        for stage in result["stages"]:
+            old = before.get(stage["name"])
+            if old and stage["seconds"] > old * REGRESSION_THRESHOLD:
+                lines.append(f"  REGRESSION [{size}] {stage['name']}: {old:.2f}s -> {stage['seconds']:.2f}s")
+    return lines
+
+
+def run(sizes, jobs, work_dir=None, keep=False, note=None):
+    work_dir = Path(work_dir or tempfile.mkdtemp(prefix="harya-bench-"))
+    report = {
+        "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpuCount": os.cpu_count(),
+        "jobs": jobs,
+        "omittedSizes": [s for s in DEFAULT_SIZES if s not in sizes],
+        "sizes": {},
+    }
+    if note:
+        report["note"] = note
+    try:
+        for size in sizes:
+            report["sizes"][str(size)] = bench_size(size, jobs, work_dir)
+            if not keep:
+                shutil.rmtree(work_dir / f"corpus-{size}", ignore_errors=True)
+    finally:
+        if not keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    previous = _previous_report()
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = REPORTS_DIR / f"content-bench-{stamp}.json"
+    path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Report: {path.relative_to(REPO_ROOT)}")
+    if previous:
+        regressions = compare(report, previous)
+        print("\n".join(regressions) if regressions else "No regressions against the previous report")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the content scripts on synthetic corpora.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    r = sub.add_parser("run", help="Generate corpora and time every script against them")
+    r.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                   help="Comma-separated corpus sizes (default: %(default)s)")
+    r.add_argument("--jobs", type=int, default=1, help="--jobs passed to the pipeline and validator")
+    r.add_argument("--work-dir", help="Where to generate corpora (default: a temp dir)")
+    r.add_argument("--keep", action="store_true", help="Keep the generated corpora")
+    r.add_argument("--note", help="Recorded in the report, e.g. why a default size was left out")
+    g = sub.add_parser("generate", help="Only write a synthetic corpus")
+    g.add_argument("size", type=int)
+    g.add_argument("out_dir")
+    g.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        total_bytes, deva_docs = generate_corpus(args.size, args.out_dir, args.seed)
+        print(f"Wrote {args.size} chapters ({total_bytes / 1e6:.1f} MB, {deva_docs} Devanagari) to {args.out_dir}")
+        return
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    run(sizes, args.jobs, args.work_dir, args.keep, args.note)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,66 +1,81 @@
 #!/usr/bin/env python3
-import json, os, re
+import heapq
 from collections import Counter
 
-CHAPTERS_DIR = "/opt/h-arya/content/chapters"
+from corpus_idf import STOPWORDS, data_group, group_idf, long_answer_snippets
+from retrieval import SnippetIndex, tokenize
 
 
-def tokenize(s: str):
-    return re.findall(r"[a-zA-Z]{3,}", s.lower())
+def build_context_index(concepts: list, tests: list):
+    return SnippetIndex(long_answer_snippets(concepts, tests), tokenize)
 
 
-def best_context(prompt: str, concepts: list, tests: list):
+def best_context(prompt: str, index: SnippetIndex):
     """Pick the most relevant concept+test snippets for a prompt."""
-    p_tokens = set(tokenize(prompt))
-    scored = []
-
-    for c in concepts or []:
-        text = " ".join([
-            str(c.get("title", "")),
-            str(c.get("content", "")),
-            " ".join(k.get("text", k) if isinstance(k, dict) else str(k) for k in c.get("keyPoints", []) if k),
-        ])
-        c_tokens = set(tokenize(text))
-        score = len(p_tokens & c_tokens)
-        if score > 0:
-            scored.append((score, text))
-
-    for t in tests or []:
-        text = " ".join([str(t.get("question", "")), str(t.get("explanation", ""))])
-        t_tokens = set(tokenize(text))
-        score = len(p_tokens & t_tokens)
-        if score > 0:
-            scored.append((score, text))
-
-    scored.sort(key=lambda x: x[0], reverse=True)
-    return [s[1] for s in scored[:3]]
-
-
-def summarize_to_bullets(snippets, max_points=4):
+    return index.search(prompt, k=3)
+
+
+def term_weights(index: SnippetIndex, idf):
+    """Per-snippet {term: tf * idf}, from the index's postings in one pass over the chapter.
+
+    Stopwords weigh 0 and are left out.
+    """
+    weights = [{} for _ in index.snippets]
+    for term, postings in index.postings.items():
+        w = idf[term]
+        if w:
+            for doc_id, tf in postings:
+                weights[doc_id][term] = tf * w
+    return weights
+
+
+def key_terms(weights, doc_ids, k=4):
+    """The k highest TF-IDF terms over the given snippets."""
+    total = Counter()
+    for doc_id in doc_ids:
+        total.update(weights[doc_id])
+    return [t for t, _ in heapq.nlargest(k, total.items(), key=lambda item: item[1])]
+
+
+def summarize_to_bullets(snippets, max_points=4, terms=None):
+    """Answer-outline bullets naming the snippets' key terms.
+
+    terms are normally the chapter's TF-IDF key terms; without them the most
+    frequent non-stopwords of the snippets are used.
+    """
     if not snippets:
         return ["Define the concept in textbook terms.", "Explain with key characteristics.", "Add one relevant example."]
 
-    words = []
-    for s in snippets:
-        words.extend(tokenize(s))
-    common = [w for w, _ in Counter(words).most_common(12)]
+    if terms is None:
+        counts = Counter(w for s in snippets for w in tokenize(s) if w not in STOPWORDS)
+        terms = [w for w, _ in counts.most_common(4)]
 
     bullets = []
-    if common:
+    if terms:
         bullets.append(f"Start with a clear definition of the concept.")
-        bullets.append(f"Explain key points: {', '.join(common[:4])}.")
+        bullets.append(f"Explain key points: {', '.join(terms[:4])}.")
         bullets.append("Include a textbook-style explanation in 3–5 lines.")
         bullets.append("Conclude with one simple real-life/example-based line.")
     return bullets[:max_points]
 
 
-def build_model_answer(prompt, snippets):
-    bullets = summarize_to_bullets(snippets)
+def _outline(prompt, bullets):
     intro = f"{prompt.strip()}\n\n"
     body = "\n".join([f"- {b}" for b in bullets])
     return intro + body
 
 
+def build_model_answer(prompt, snippets, terms=None):
+    return _outline(prompt, summarize_to_bullets(snippets, terms=terms))
+
+
+def is_generated(answer):
+    """True if a long answer is one of ours: the question followed by its key points as bullets."""
+    points = answer.get("keyPoints")
+    return (isinstance(points, list) and all(isinstance(p, str) for p in points)
+            and answer.get("modelAnswer") == _outline(str(answer.get("question", "")), points))
+
+
 def derive_long_questions_from_textbook_exercise(te):
     out = []
     if not isinstance(te, dict):
@@ -107,57 +122,79 @@ def derive_long_questions_from_test(test):
     return d[:6]
 
 
-def main():
-    updated = 0
-    total = 0
-    for fn in sorted(os.listdir(CHAPTERS_DIR)):
-        if not fn.endswith('.json'):
-            continue
-        path = os.path.join(CHAPTERS_DIR, fn)
-        try:
-            data = json.load(open(path, encoding='utf-8'))
-        except Exception:
-            continue
-
-        total += 1
-        concepts = data.get("concepts", [])
-        tests = data.get("test", [])
-        te = data.get("textbookExercise") if isinstance(data.get("textbookExercise"), dict) else {}
-
-        prompts = derive_long_questions_from_textbook_exercise(te)
-        if not prompts:
-            prompts = derive_long_questions_from_test(tests)
-
-        if not prompts:
-            continue
-
-        long_answers = []
-        for i, p in enumerate(prompts, start=1):
-            ctx = best_context(p, concepts, tests)
-            model = build_model_answer(p, ctx)
-            key_points = summarize_to_bullets(ctx)
-            long_answers.append({
-                "id": f"la{i}",
-                "question": p,
-                "modelAnswer": model,
-                "keyPoints": key_points,
-                "marks": 3 if i <= 3 else 5,
-            })
-
-        if not isinstance(data.get("textbookExercise"), dict):
-            data["textbookExercise"] = {
-                "chapterName": data.get("metadata", {}).get("title", ""),
-                "instructions": "Textbook-style long answer practice",
-            }
-
-        prev = data["textbookExercise"].get("longAnswers", [])
-        if len(prev) != len(long_answers):
-            data["textbookExercise"]["longAnswers"] = long_answers
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            updated += 1
-
-    print(f"Updated {updated}/{total} chapters with textbookExercise.longAnswers")
+def build_long_answers(data, force=False, idf=None):
+    """Regenerate textbookExercise.longAnswers. Returns True if data changed.
+
+    Only answers this script generated are ever replaced: all of them when
+    their count differs, or with force; curated answers (anything
+    is_generated() does not recognise) are kept, and with force the generated
+    answers among them are regenerated for the same question.
+    idf weighs key terms against the chapter's subject and language (default:
+    the group named by its metadata).
+    """
+    concepts = data.get("concepts", [])
+    tests = data.get("test", [])
+    te = data.get("textbookExercise") if isinstance(data.get("textbookExercise"), dict) else {}
+
+    prompts = derive_long_questions_from_textbook_exercise(te)
+    if not prompts:
+        prompts = derive_long_questions_from_test(tests)
+
+    if not prompts:
+        return False
+
+    index = build_context_index(concepts, tests)
+    weights = term_weights(index, idf if idf is not None else group_idf(*data_group(data)))
+    long_answers = []
+    for i, p in enumerate(prompts, start=1):
+        ids = index.top(p, k=3)
+        ctx = [index.snippets[doc_id] for doc_id in ids]
+        terms = key_terms(weights, ids)
+        model = build_model_answer(p, ctx, terms)
+        key_points = summarize_to_bullets(ctx, terms=terms)
+        long_answers.append({
+            "id": f"la{i}",
+            "question": p,
+            "modelAnswer": model,
+            "keyPoints": key_points,
+            "marks": 3 if i <= 3 else 5,
+        })
+
+    if not isinstance(data.get("textbookExercise"), dict):
+        data["textbookExercise"] = {
+            "chapterName": data.get("metadata", {}).get("title", ""),
+            "instructions": "Textbook-style long answer practice",
+        }
+
+    prev = data["textbookExercise"].get("longAnswers") or []
+    if all(isinstance(old, dict) and is_generated(old) for old in prev):
+        if prev == long_answers or (not force and len(prev) == len(long_answers)):
+            return False
+        data["textbookExercise"]["longAnswers"] = long_answers
+        return True
+    if not force:
+        return False
+    by_question = {a["question"].strip(): a for a in long_answers}
+    merged = []
+    for old in prev:
+        new = by_question.get(str(old.get("question", "")).strip()) if isinstance(old, dict) and is_generated(old) else None
+        merged.append({**new, "id": old.get("id", new["id"]), "marks": old.get("marks", new["marks"])} if new else old)
+    if merged == prev:
+        return False
+    data["textbookExercise"]["longAnswers"] = merged
+    return True
+
+
+def main(argv=None):
+    # Goes through the pipeline so unchanged chapters are skipped via the build manifest.
+    import argparse
+    from content_pipeline import add_jobs_argument, resolve_jobs, run
+
+    parser = argparse.ArgumentParser(description="Generate textbookExercise.longAnswers for every chapter.")
+    parser.add_argument("--full", action="store_true", help="Ignore the build manifest and reprocess every chapter")
+    add_jobs_argument(parser)
+    args = parser.parse_args(argv)
+    run(["longanswers"], full=args.full, jobs=resolve_jobs(args.jobs))
 
 
 if __name__ == "__main__":
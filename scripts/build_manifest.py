@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Persisted record of which inputs produced each derived chapter section.
+
+For every chapter the manifest stores the file's (mtime, size) after the last
+pipeline run, plus, per stage, the hash of the inputs it last ran on and the
+stage version that ran. The pipeline uses it to skip unchanged files without
+parsing them, and to recompute only the sections whose inputs or stage
+version changed.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from chapter_corpus import CACHE_DIR
+
+MANIFEST_PATH = CACHE_DIR / "build-manifest.json"
+_VERSION = 1
+
+
+def input_hash(value):
+    """Stable short hash of any JSON-serialisable value."""
+    raw = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class BuildManifest:
+    def __init__(self, chapters_dir, path=MANIFEST_PATH):
+        self.chapters_dir = str(chapters_dir)
+        self.path = Path(path)
+        self.chapters = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if raw.get("version") == _VERSION and raw.get("chaptersDir") == self.chapters_dir:
+            self.chapters = raw.get("chapters", {})
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": _VERSION, "chaptersDir": self.chapters_dir, "chapters": self.chapters}, f,
+                      sort_keys=True, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    def is_fresh(self, filename, stat, stage_versions):
+        """True if the file is unchanged since the last run and every stage ran on it at its current version.
+
+        stage_versions maps stage name -> version.
+        """
+        entry = self.chapters.get(filename)
+        if not entry or [entry.get("mtime_ns"), entry.get("size")] != list(stat):
+            return False
+        sections = entry.get("sections", {})
+        versions = entry.get("versions", {})
+        return all(name in sections and versions.get(name) == v for name, v in stage_versions.items())
+
+    def section_hash(self, filename, stage_name):
+        return self.chapters.get(filename, {}).get("sections", {}).get(stage_name)
+
+    def record(self, filename, stat, sections, versions):
+        entry = self.chapters.setdefault(filename, {"sections": {}})
+        entry["mtime_ns"], entry["size"] = stat
+        entry["sections"].update(sections)
+        entry.setdefault("versions", {}).update(versions)
+        self._dirty = True
+
+    def prune(self, filenames):
+        """Drop entries for chapters that no longer exist."""
+        for name in list(self.chapters):
+            if name not in filenames:
+                del self.chapters[name]
+                self._dirty = True
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Pack every chapter into one bundle file with an offset table, for zero-parse serving.
+
+The content API reads the offset table once, then serves a chapter by reading
+exactly its byte range, instead of listing content/chapters and parsing every
+candidate file on each request. Only chapters whose own metadata carries the
+subject and chapter number they are filed under are bundled, so a chapter
+served from the bundle needs no further checks.
+
+Layout (little-endian, 4-byte fields):
+
+    header  32 bytes  MAGIC "HARYACB1", version, entry count, table offset,
+                      strings offset, strings length, data offset, reserved
+    table   count x 32 bytes, sorted by (subject, grade, chapter number, file):
+                      chapterNumber, grade, subject offset, subject length,
+                      file offset, file length, data offset, data length
+    strings UTF-8 subjects and filenames (offsets relative to strings offset)
+    data    compact UTF-8 JSON of each chapter (offsets relative to data offset)
+
+Usage:
+    python3 scripts/chapter_bundle.py build
+    python3 scripts/chapter_bundle.py get Science 7 18
+"""
+import argparse
+import json
+import mmap
+import struct
+import sys
+
+from chapter_corpus import CHAPTERS_DIR, corpus, write_if_changed
+from chapter_manifest import classify
+
+BUNDLE_PATH = CHAPTERS_DIR.parent / "chapters.bundle"
+MAGIC = b"HARYACB1"
+FORMAT_VERSION = 2
+
+_HEADER = struct.Struct("<8sIIIIIII")
+_ENTRY = struct.Struct("<IIIIIIII")
+_MAX_OFFSET = 2 ** 32 - 1
+
+
+def build_bundle(path=BUNDLE_PATH, chapters=None):
+    """Write the bundle for the current corpus. Returns (entries, written)."""
+    chapters = chapters or corpus()
+    rows = []
+    for ch in chapters.chapters():
+        entry = classify(ch)
+        if not isinstance(entry["chapterNumber"], int):
+            print(f"  SKIP (no chapterNumber): {ch.filename}", file=sys.stderr)
+            continue
+        if entry["subject"] != ch.metadata.get("subject"):
+            # Filed under a subject guessed from the filename; the API checks
+            # such chapters against their metadata, which the bundle cannot.
+            print(f"  SKIP (no metadata.subject): {ch.filename}", file=sys.stderr)
+            continue
+        payload = json.dumps(ch.data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        rows.append((entry["subject"], entry["grade"], entry["chapterNumber"], ch.filename, payload))
+    rows.sort(key=lambda r: (r[0], r[1], r[2], r[3]))
+
+    strings = bytearray()
+    data = bytearray()
+    table = bytearray()
+    for subject, grade, number, filename, payload in rows:
+        subj = subject.encode("utf-8")
+        name = filename.encode("utf-8")
+        subj_off = len(strings)
+        strings += subj
+        name_off = len(strings)
+        strings += name
+        table += _ENTRY.pack(number, grade, subj_off, len(subj), name_off, len(name), len(data), len(payload))
+        data += payload
+
+    table_off = _HEADER.size
+    strings_off = table_off + len(table)
+    data_off = strings_off + len(strings)
+    if data_off + len(data) > _MAX_OFFSET:
+        raise ValueError("chapter bundle would exceed 4 GiB; the format uses 32-bit offsets")
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(rows), table_off, strings_off, len(strings), data_off, 0)
+    written = write_if_changed(path, bytes(header + table + strings + data))
+    return len(rows), written
+
+
+class ChapterBundle:
+    """Memory-mapped reader; the same lookups the content API does."""
+
+    def __init__(self, path=BUNDLE_PATH):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, table_off, strings_off, _, data_off, _ = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a chapter bundle this version can read")
+        self._data_off = data_off
+        self.entries = {}
+        for i in range(count):
+            number, grade, s_off, s_len, f_off, f_len, d_off, d_len = _ENTRY.unpack_from(
+                self._mm, table_off + i * _ENTRY.size)
+            subject = self._mm[strings_off + s_off:strings_off + s_off + s_len].decode("utf-8")
+            filename = self._mm[strings_off + f_off:strings_off + f_off + f_len].decode("utf-8")
+            # First file wins on duplicate keys, matching the sorted table order.
+            self.entries.setdefault((subject, grade, number), (filename, d_off, d_len))
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def raw(self, subject, grade, chapter_number):
+        """The chapter's JSON bytes, or None if the bundle has no such chapter."""
+        entry = self.entries.get((subject, grade, chapter_number))
+        if entry is None:
+            return None
+        _, off, length = entry
+        start = self._data_off + off
+        return self._mm[start:start + length]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect the packed chapter bundle.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help=f"Rebuild {BUNDLE_PATH}")
+    get = sub.add_parser("get", help="Print one chapter's JSON from the bundle")
+    get.add_argument("subject")
+    get.add_argument("grade", type=int)
+    get.add_argument("chapter_number", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        count, written = build_bundle()
+        state = "written" if written else "unchanged"
+        print(f"Bundled {count} chapters -> {BUNDLE_PATH} ({state})")
+        return
+
+    with ChapterBundle() as bundle:
+        raw = bundle.raw(args.subject, args.grade, args.chapter_number)
+    if raw is None:
+        sys.exit(f"No {args.subject} grade {args.grade} chapter {args.chapter_number} in the bundle")
+    sys.stdout.write(raw.decode("utf-8") + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Shared loader for the chapter JSON corpus used by the content scripts.
+
+Chapters are parsed once and cached in memory keyed by (mtime, size), so a
+file is only re-parsed after it changes on disk. The parsed set is also
+snapshotted to .cache/chapter-corpus.pickle, which lets the next script in a
+maintenance session skip JSON parsing for every unchanged chapter.
+
+Every call to chapters() hands out private copies of the documents, so a
+script can mutate what it gets without poisoning the cache for the next one.
+
+All writes go through save_chapter(): one canonical serialization (2-space
+indent, raw UTF-8, trailing newline), skipped entirely when the bytes on disk
+are already identical, and otherwise written to a temp file and renamed into
+place so readers never see a half-written chapter.
+"""
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import instrumentation
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CHAPTERS_DIR = Path(os.environ.get("HARYA_CHAPTERS_DIR", REPO_ROOT / "content" / "chapters"))
+CACHE_DIR = Path(os.environ.get("HARYA_CACHE_DIR", REPO_ROOT / ".cache"))
+
+_SNAPSHOT_VERSION = 1
+
+
+class Chapter:
+    """One chapter document plus the file it came from."""
+
+    def __init__(self, path, data):
+        self.path = Path(path)
+        self.data = data
+
+    @property
+    def filename(self):
+        return self.path.name
+
+    @property
+    def metadata(self):
+        meta = self.data.get("metadata")
+        return meta if isinstance(meta, dict) else {}
+
+    @property
+    def subject(self):
+        return str(self.metadata.get("subject") or "")
+
+    @property
+    def chapter_number(self):
+        return self.metadata.get("chapterNumber")
+
+    def __repr__(self):
+        return f"Chapter({self.filename!r})"
+
+
+class ChapterCorpus:
+    """mtime-invalidated cache over every chapter JSON in a directory."""
+
+    def __init__(self, chapters_dir=CHAPTERS_DIR, snapshot=True):
+        self.chapters_dir = Path(chapters_dir)
+        self.snapshot_path = CACHE_DIR / "chapter-corpus.pickle" if snapshot else None
+        # filename -> (mtime_ns, size, pickled document)
+        self._entries = {}
+        self.errors = {}
+        self._snapshot_loaded = False
+        self._dirty = False
+
+    def _load_snapshot(self):
+        self._snapshot_loaded = True
+        if not self.snapshot_path or not self.snapshot_path.exists():
+            return
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                snap = pickle.load(f)
+        except Exception:
+            return
+        if snap.get("version") == _SNAPSHOT_VERSION and snap.get("dir") == str(self.chapters_dir):
+            self._entries = snap["entries"]
+
+    def _save_snapshot(self):
+        if not self.snapshot_path or not self._dirty:
+            return
+        self._dirty = False
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.snapshot_path.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump({"version": _SNAPSHOT_VERSION, "dir": str(self.chapters_dir), "entries": self._entries},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.snapshot_path)
+        except OSError as e:
+            print(f"WARNING: could not write corpus snapshot: {e}", file=sys.stderr)
+
+    def _load_entry(self, name, st):
+        """Parse one file into the cache unless the cached copy is still current."""
+        cached = self._entries.get(name)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return True
+        t0 = time.perf_counter()
+        try:
+            with open(self.chapters_dir / name, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            self.errors[name] = str(e)
+            self._entries.pop(name, None)
+            return False
+        if not isinstance(data, dict):
+            self.errors[name] = "top-level JSON value is not an object"
+            self._entries.pop(name, None)
+            return False
+        instrumentation.note_parse(name, st.st_size, time.perf_counter() - t0)
+        self._entries[name] = (st.st_mtime_ns, st.st_size, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        self._dirty = True
+        return True
+
+    def refresh(self):
+        """Re-stat the directory and re-parse only files whose mtime/size changed."""
+        if not self._snapshot_loaded:
+            self._load_snapshot()
+        if not self.chapters_dir.is_dir():
+            raise FileNotFoundError(f"Missing chapters directory: {self.chapters_dir}")
+
+        seen = set()
+        self.errors = {}
+        with os.scandir(self.chapters_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                seen.add(entry.name)
+                self._load_entry(entry.name, entry.stat())
+
+        for name in list(self._entries):
+            if name not in seen:
+                del self._entries[name]
+                self._dirty = True
+        self._save_snapshot()
+
+    def save(self, chapter):
+        """Write a chapter if its canonical bytes changed. Returns True if it was written.
+
+        The cache entry is refreshed from the document just written, so the
+        next lookup does not have to parse the file again.
+        """
+        t0 = time.perf_counter()
+        payload = dump_chapter(chapter.data)
+        written = write_if_changed(chapter.path, payload)
+        instrumentation.note_save(chapter.filename, len(payload), time.perf_counter() - t0, written)
+        if written and chapter.path.parent == self.chapters_dir:
+            st = os.stat(chapter.path)
+            self._entries[chapter.filename] = (st.st_mtime_ns, st.st_size,
+                                               pickle.dumps(chapter.data, protocol=pickle.HIGHEST_PROTOCOL))
+            self._dirty = True
+        return written
+
+    def file_stats(self):
+        """{filename: (mtime_ns, size)} for every chapter file, without parsing any of them."""
+        out = {}
+        with os.scandir(self.chapters_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    st = entry.stat()
+                    out[entry.name] = (st.st_mtime_ns, st.st_size)
+        return out
+
+    def invalidate(self, filename=None):
+        """Forget one cached file (or all of them) so it is re-read on next access."""
+        if filename is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(Path(filename).name, None)
+        self._dirty = True
+
+    def chapters(self, subject=None, chapter_number=None):
+        """Chapters sorted by filename, optionally filtered by metadata fields.
+
+        To select by grade, or by subject for chapters whose metadata lacks
+        one, go through chapter_manifest, which owns those rules.
+        """
+        self.refresh()
+        out = []
+        for name in sorted(self._entries):
+            ch = Chapter(self.chapters_dir / name, pickle.loads(self._entries[name][2]))
+            if subject is not None and ch.subject.lower() != subject.lower():
+                continue
+            if chapter_number is not None and ch.chapter_number != chapter_number:
+                continue
+            out.append(ch)
+        return out
+
+    def get(self, filename):
+        """A single chapter by filename, or None if it is missing or unparsable.
+
+        Only this one file is stat'ed (and parsed if it changed), so looking up
+        a handful of chapters does not pay for a scan of the whole directory.
+        """
+        name = Path(filename).name
+        try:
+            st = os.stat(self.chapters_dir / name)
+        except FileNotFoundError:
+            self._entries.pop(name, None)
+            return None
+        self.errors.pop(name, None)
+        if not self._load_entry(name, st):
+            return None
+        return Chapter(self.chapters_dir / name, pickle.loads(self._entries[name][2]))
+
+    def __iter__(self):
+        return iter(self.chapters())
+
+    def __len__(self):
+        self.refresh()
+        return len(self._entries)
+
+
+def dump_chapter(data):
+    """Canonical on-disk bytes for a chapter document."""
+    return (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def write_if_changed(path, payload):
+    """Atomically replace path with payload unless it already holds exactly those bytes.
+
+    Returns True if the file was written.
+    """
+    path = Path(path)
+    try:
+        if path.stat().st_size == len(payload):
+            with open(path, "rb") as f:
+                if f.read() == payload:
+                    return False
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    return True
+
+
+_default = None
+
+
+def corpus():
+    """Process-wide corpus for the default chapters directory."""
+    global _default
+    if _default is None:
+        _default = ChapterCorpus()
+    return _default
+
+
+def save_chapter(chapter):
+    """Write a chapter through the shared corpus. Returns True if the file changed."""
+    return corpus().save(chapter)
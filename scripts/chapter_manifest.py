@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Generated lookup table classifying every chapter once: subject, grade,
+language, chapter number, file and content hash.
+
+Scripts and the content API resolve chapters through this table instead of
+each re-deriving subject and grade from filename substrings. The rules for
+chapters whose metadata is incomplete live here and nowhere else.
+
+content/chapter-manifest.json is committed; the pipeline rewrites it after
+each run, and `check` reports whether it still matches the chapters.
+
+Usage:
+    python3 scripts/chapter_manifest.py build
+    python3 scripts/chapter_manifest.py check
+    python3 scripts/chapter_manifest.py show Science 7 18
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+from build_manifest import input_hash
+from chapter_corpus import CACHE_DIR, CHAPTERS_DIR, corpus, write_if_changed
+
+MANIFEST_PATH = CHAPTERS_DIR.parent / "chapter-manifest.json"
+STATE_PATH = CACHE_DIR / "chapter-manifest-state.json"
+_VERSION = 1
+
+# Filename substrings used only when metadata.subject is missing, checked in order.
+SUBJECT_HINTS = [
+    ("Science", ("science",)),
+    ("Mathematics", ("math", "integer", "ratio", "algebra", "geometr", "circle", "pythag", "statistic",
+                     "proportion", "hcf", "lcm", "perimeter", "angle", "index", "indices", "bank")),
+    ("History", ("history",)),
+    ("Geography", ("geography", "geo")),
+    ("Civics", ("civics", "civic")),
+    ("English", ("english",)),
+    ("Hindi", ("hindi",)),
+    ("Marathi", ("marathi",)),
+]
+LANGUAGES = {"Hindi": "hi", "Marathi": "mr"}
+
+
+def guess_subject(filename):
+    name = filename.lower()
+    for subject, hints in SUBJECT_HINTS:
+        if any(h in name for h in hints):
+            return subject
+    return "General"
+
+
+def guess_grade(filename):
+    """Grade named by a filename ("-grade-8", "-science-8-", "-8.json"); 7 otherwise."""
+    # Skip the "chapter-<n>-" prefix so chapter 8 isn't mistaken for grade 8.
+    name = re.sub(r"^chapter-\d+-", "-", filename.lower())
+    if "grade-8" in name or "-8-" in name or name.endswith("-8.json"):
+        return 8
+    return 7
+
+
+def classify(chapter):
+    """Manifest entry for one chapter, minus the content hash."""
+    subject = chapter.subject or guess_subject(chapter.filename)
+    language = chapter.metadata.get("language") or LANGUAGES.get(subject, "en")
+    grade = chapter.metadata.get("grade")
+    return {
+        "file": chapter.filename,
+        "subject": subject,
+        "grade": grade if isinstance(grade, int) else guess_grade(chapter.filename),
+        "language": language,
+        "chapterNumber": chapter.chapter_number,
+    }
+
+
+def _sort_key(entry):
+    number = entry["chapterNumber"]
+    return (entry["subject"], entry["grade"], number if isinstance(number, int) else 0, entry["file"])
+
+
+class ChapterManifest:
+    def __init__(self, entries):
+        self.entries = sorted(entries, key=_sort_key)
+        self._by_file = {e["file"]: e for e in self.entries}
+
+    def entry(self, filename):
+        """The entry for a chapter file, or None."""
+        return self._by_file.get(filename)
+
+    def find(self, subject=None, grade=None, chapter_number=None, language=None):
+        """Entries matching every given field, in (subject, grade, number, file) order."""
+        subject = subject.lower() if subject else None
+        return [e for e in self.entries
+                if (subject is None or e["subject"].lower() == subject)
+                and (grade is None or e["grade"] == grade)
+                and (chapter_number is None or e["chapterNumber"] == chapter_number)
+                and (language is None or e["language"] == language)]
+
+    def resolve(self, subject, grade, chapter_number):
+        """The chapter the app serves for a curriculum row: exact grade first, else any grade."""
+        matches = self.find(subject, chapter_number=chapter_number)
+        exact = [e for e in matches if e["grade"] == grade]
+        return (exact or matches or [None])[0]
+
+    def to_json(self):
+        return {"version": _VERSION, "chapters": self.entries}
+
+
+def build_manifest(chapters=None, state_path=STATE_PATH):
+    """Classify every chapter. Entries of files unchanged since the last build
+    (same mtime and size) are reused from .cache without parsing the file."""
+    chapters = chapters or corpus()
+    stats = chapters.file_stats()
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") != _VERSION or state.get("dir") != str(chapters.chapters_dir):
+            state = {}
+    except (FileNotFoundError, ValueError):
+        state = {}
+    previous = state.get("files", {})
+
+    files = {}
+    for name in sorted(stats):
+        cached = previous.get(name)
+        if cached and cached[:2] == list(stats[name]):
+            files[name] = cached
+            continue
+        ch = chapters.get(name)
+        if ch is None:
+            continue
+        entry = classify(ch)
+        entry["contentHash"] = input_hash(ch.data)
+        files[name] = [*stats[name], entry]
+
+    if files != previous:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = state_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": _VERSION, "dir": str(chapters.chapters_dir), "files": files},
+                               ensure_ascii=False, separators=(",", ":")))
+        os.replace(tmp, state_path)
+    return ChapterManifest([entry for _, _, entry in files.values()])
+
+
+def write_manifest(manifest, path=MANIFEST_PATH):
+    """Write the manifest if it changed. Returns True if the file was written."""
+    payload = json.dumps(manifest.to_json(), indent=2, ensure_ascii=False) + "\n"
+    return write_if_changed(path, payload.encode("utf-8"))
+
+
+def load_manifest(path=MANIFEST_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    if raw.get("version") != _VERSION:
+        raise ValueError(f"{path} has an unsupported manifest version")
+    return ChapterManifest(raw["chapters"])
+
+
+_manifest = None
+_manifest_stats = None
+
+
+def chapter_manifest():
+    """The manifest for the chapters as they are now, rebuilt only when a file changed."""
+    global _manifest, _manifest_stats
+    stats = corpus().file_stats()
+    if _manifest is None or stats != _manifest_stats:
+        _manifest = build_manifest()
+        _manifest_stats = stats
+    return _manifest
+
+
+def refresh_manifest(path=MANIFEST_PATH):
+    """Regenerate the committed manifest from the chapters. Returns True if it changed."""
+    return write_manifest(chapter_manifest(), path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build, check or query the chapter lookup manifest.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help=f"Regenerate {MANIFEST_PATH}")
+    sub.add_parser("check", help="Exit 1 if the manifest is out of date")
+    show = sub.add_parser("show", help="Print the entry the app would serve")
+    show.add_argument("subject")
+    show.add_argument("grade", type=int)
+    show.add_argument("chapter_number", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        changed = refresh_manifest()
+        print(f"{len(chapter_manifest().entries)} chapters -> {MANIFEST_PATH} ({'written' if changed else 'unchanged'})")
+    elif args.command == "check":
+        try:
+            current = load_manifest().entries
+        except (FileNotFoundError, ValueError) as e:
+            sys.exit(f"{MANIFEST_PATH} is missing or unreadable: {e}")
+        if current != chapter_manifest().entries:
+            sys.exit(f"{MANIFEST_PATH} is out of date; run: python3 scripts/chapter_manifest.py build")
+        print(f"{MANIFEST_PATH} is up to date")
+    else:
+        entry = chapter_manifest().resolve(args.subject, args.grade, args.chapter_number)
+        if entry is None:
+            sys.exit(f"No {args.subject} chapter {args.chapter_number}")
+        print(json.dumps(entry, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+One entry point for the content scripts.
+
+    python3 scripts/content.py <command> [args...]
+    python3 scripts/content.py --help
+    npm run content -- validate --full
+
+Each command is the existing script, run as if it had been invoked directly
+(so `content validate --help` shows validate_chapters.py's own options).
+Nothing but the chosen script is imported, so `--help` and quick commands
+start as fast as the interpreter does.
+"""
+import os
+import sys
+import types
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# command -> (script in scripts/, one-line description)
+COMMANDS = {
+    "pipeline": ("content_pipeline.py", "Rebuild derived sections (qaCards, longAnswers, interactive, trust pass)"),
+    "watch": ("watch_content.py", "Rebuild derived content for chapters as they are edited"),
+    "validate": ("validate_chapters.py", "Validate chapters against the chapter JSON schema"),
+    "manifest": ("chapter_manifest.py", "Build, check or show the chapter lookup manifest"),
+    "bundle": ("chapter_bundle.py", "Build or read the packed chapter bundle"),
+    "index": ("corpus_index.py", "Build or query the corpus-wide BM25 index"),
+    "idf": ("corpus_idf.py", "Build or inspect the per-subject term frequency table"),
+    "patch": ("patch_pack.py", "Apply patch packs from content/patches"),
+    "qacards": ("backfill-memorize-qacards.py", "Derive memorize qaCards from test explanations"),
+    "longanswers": ("build-longanswers.py", "Build textbookExercise.longAnswers"),
+    "interactive": ("add-interactive-elements.py", "Add interactiveElement to chapters without one"),
+    "trust-pass": ("trust_pass_fixer.py", "Fix and risk-rank grade 7 chapters with the quality rules"),
+    "simple-fix": ("simple_fixer.py", "Apply the quality-rule fixes to grade 7 chapters"),
+    "pdf-text": ("pdf_text_cache.py", "Extract, import or page through cached textbook PDF text"),
+    "extract-exercises": ("extract-textbook-exercises.py", "Inject textbook exercises from PDF text"),
+    "update-long-answers": ("update_la.py", "Apply the hand-written grade 7 long answers pack"),
+    "hindi-tests": ("fix-hindi-tests.py", "Apply the extra Hindi test questions pack"),
+    "refine-questions": ("get_qs.py", "List long answers that still need refining"),
+    "refine-long-answers": ("refine_long_answers.py", "Refine long answers with a completion endpoint, as a patch pack"),
+    "responses": ("response_cache.py", "Inspect or prune the model response cache"),
+    "ingest-html": ("ingest_html.py", "Extract headings, text and links from saved textbook source pages"),
+    "near-duplicates": ("near_duplicates.py", "Report near-duplicate questions across the corpus"),
+    "bench": ("bench_content.py", "Benchmark the content scripts on synthetic corpora"),
+}
+
+
+def usage():
+    width = max(map(len, COMMANDS))
+    lines = ["usage: content <command> [args...]", "", "commands:"]
+    lines += [f"  {name:{width}}  {desc}" for name, (_, desc) in COMMANDS.items()]
+    lines += ["", "Run `content <command> --help` for a command's own options."]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print(usage())
+        return 0 if argv else 2
+    name, args = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"content: unknown command '{name}'\n\n{usage()}", file=sys.stderr)
+        return 2
+    script = os.path.join(SCRIPTS_DIR, COMMANDS[name][0])
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    with open(script, "rb") as f:
+        code = compile(f.read(), script, "exec")
+    # Like runpy.run_path, but keeping our argv[0], which run_path would reset
+    # to the script's path, so usage and errors read `content.py <command>`.
+    module = types.ModuleType("__main__")
+    module.__file__ = script
+    caller = sys.modules["__main__"]
+    sys.modules["__main__"] = module
+    sys.argv = [f"content.py {name}", *args]
+    try:
+        exec(code, module.__dict__)
+    finally:
+        sys.modules["__main__"] = caller
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
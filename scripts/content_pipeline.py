@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Run the chapter transform scripts as stages of one read-modify-write pass.
+
+Each chapter is read once, passed through every selected stage in order and
+written at most once, instead of one full load/dump cycle per script.
+
+Builds are incremental: .cache/build-manifest.json remembers a hash of the
+inputs each stage last ran on, so files untouched since the last run are not
+even parsed, and a stage only recomputes its section when its inputs change.
+Each run ends by refreshing the chapter lookup manifest (chapter_manifest.py).
+
+Usage:
+    python3 scripts/content_pipeline.py                        # all stages
+    python3 scripts/content_pipeline.py --stages qacards,longanswers
+    python3 scripts/content_pipeline.py --dry-run chapter-18-sound.json
+    python3 scripts/content_pipeline.py --full                 # ignore the manifest
+    python3 scripts/content_pipeline.py --jobs 8               # fan chapters out to 8 processes
+    python3 scripts/content_pipeline.py --instrument --profile-file chapter-18-sound.json
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+
+import instrumentation
+from build_manifest import BuildManifest, input_hash
+from chapter_corpus import corpus, save_chapter
+from chapter_manifest import classify, refresh_manifest
+from corpus_idf import carry_over, group_idf, terms_digest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+
+def load_script(filename):
+    """Import a script from scripts/ as a module, even if its name has hyphens."""
+    name = filename[:-3].replace("-", "_")
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class Stage:
+    """A named transform backed by a function in one of the content scripts.
+
+    `run(module, chapter, force)` returns True if it changed chapter.data; with
+    force it must recompute its section even if one is already present.
+    `inputs(chapter)` returns the parts of the chapter the stage reads, which
+    is what the build manifest hashes. Bump `version` when the stage logic
+    changes so existing sections are rebuilt. Set `edits_terms` if the stage
+    may rewrite the concept, test or metadata text the corpus IDF is built from.
+    """
+
+    def __init__(self, name, script, run, inputs, version=1, edits_terms=False):
+        self.name = name
+        self.script = script
+        self._run = run
+        self._inputs = inputs
+        self.version = version
+        self.edits_terms = edits_terms
+
+    def __call__(self, chapter, force=False):
+        return bool(self._run(load_script(self.script), chapter, force))
+
+    def digest(self, chapter):
+        return input_hash([self.version, self._inputs(chapter)])
+
+
+def _items(data, key):
+    value = data.get(key)
+    return [x for x in value if isinstance(x, dict)] if isinstance(value, list) else []
+
+
+def _exercise(data):
+    te = data.get("textbookExercise")
+    return te if isinstance(te, dict) else {}
+
+
+def _test_pairs(ch):
+    return [[q.get("question"), q.get("explanation")] for q in _items(ch.data, "test")]
+
+
+def _long_answer_inputs(ch):
+    concepts = [[c.get("title"), c.get("content"), c.get("keyPoints")] for c in _items(ch.data, "concepts")]
+    questions = [[q.get("type"), q.get("question"), q.get("subQuestions")] for q in _items(_exercise(ch.data), "questions")]
+    return [concepts, _test_pairs(ch), questions]
+
+
+def _interactive_inputs(ch):
+    return [ch.filename, ch.metadata.get("title"), ch.metadata.get("subject")]
+
+
+def _group_idf(ch):
+    # Key terms are weighed against the rest of the chapter's subject; that
+    # drifts slowly as other chapters change and is not part of the digest.
+    entry = classify(ch)
+    return group_idf(entry["subject"], entry["language"])
+
+
+def _trust_pass_inputs(ch):
+    answers = [[q.get("correctAnswer") for q in _items(ch.data, key)] for key in ("preAssessment", "test")]
+    return [ch.filename, ch.metadata.get("grade"), ch.metadata.get("subject"), answers,
+            _exercise(ch.data).get("longAnswers")]
+
+
+STAGES = [
+    Stage("qacards", "backfill-memorize-qacards.py",
+          lambda m, ch, force: m.backfill_qa_cards(ch.data, force=force), _test_pairs),
+    Stage("longanswers", "build-longanswers.py",
+          lambda m, ch, force: m.build_long_answers(ch.data, force=force, idf=_group_idf(ch)),
+          _long_answer_inputs, version=4),
+    Stage("interactive", "add-interactive-elements.py",
+          lambda m, ch, force: m.add_interactive_element(ch.filename, ch.data, force=force), _interactive_inputs),
+    Stage("trustpass", "trust_pass_fixer.py",
+          lambda m, ch, force: m.in_scope(ch) and m.fix_chapter(ch.data),
+          _trust_pass_inputs, version=4, edits_terms=True),
+]
+STAGES_BY_NAME = {s.name: s for s in STAGES}
+
+
+def select_stages(names=None):
+    if not names:
+        return list(STAGES)
+    unknown = [n for n in names if n not in STAGES_BY_NAME]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)} (choose from {', '.join(STAGES_BY_NAME)})")
+    # Always run in pipeline order, whatever order they were given in.
+    return [s for s in STAGES if s.name in names]
+
+
+def process_chapter(chapter, stages, recorded=None, full=False):
+    """Run the stages over one chapter.
+
+    `recorded` maps stage name -> input hash from the last build. A stage whose
+    inputs still hash the same is skipped; one whose inputs (or version)
+    changed is forced to recompute; one with no record falls back to its own
+    "already present" check. With full, every stage is forced. Returns (names
+    of stages that changed the chapter, new input hashes).
+    """
+    recorded = recorded or {}
+    changed = []
+    sections = {}
+    for stage in stages:
+        before = stage.digest(chapter)
+        previous = recorded.get(stage.name)
+        if not full and previous == before:
+            sections[stage.name] = before
+            continue
+        t0 = time.perf_counter()
+        ran = stage(chapter, force=full or previous is not None)
+        instrumentation.note_transform(chapter.filename, stage.name, time.perf_counter() - t0)
+        if ran:
+            changed.append(stage.name)
+        # Record what the section now corresponds to, so stages that fix their
+        # own inputs in place don't look stale on the next run.
+        sections[stage.name] = stage.digest(chapter)
+    return changed, sections
+
+
+def _process_file(filename, stage_names, recorded, dry_run, full=False):
+    """Load, transform and write one chapter. Runs in a worker process under --jobs.
+
+    Returns (filename, changed stages, error, section hashes, stat after the
+    write, metrics, whether the chapter's corpus IDF terms are unchanged).
+    """
+    chapters = corpus()
+    with instrumentation.profiled(filename):
+        ch = chapters.get(filename)
+        if ch is None:
+            return (filename, None, chapters.errors.get(filename, "unreadable"), None, None,
+                    instrumentation.take(filename), False)
+        stages = select_stages(stage_names)
+        terms = terms_digest(ch.data) if any(s.edits_terms for s in stages) else None
+        changed, sections = process_chapter(ch, stages, recorded, full)
+        if dry_run:
+            return filename, changed, None, sections, None, instrumentation.take(filename), False
+        if changed:
+            save_chapter(ch)
+    st = os.stat(ch.path)
+    same_terms = bool(changed) and (terms is None or terms_digest(ch.data) == terms)
+    return filename, changed, None, sections, (st.st_mtime_ns, st.st_size), instrumentation.take(filename), same_terms
+
+
+def _process_star(args):
+    return _process_file(*args)
+
+
+def run(stage_names=None, filenames=None, dry_run=False, full=False, jobs=1):
+    stages = select_stages(stage_names)
+    names = [s.name for s in stages]
+    versions = {s.name: s.version for s in stages}
+    chapters = corpus()
+    stats = chapters.file_stats()
+    manifest = BuildManifest(chapters.chapters_dir)
+
+    targets = sorted(stats)
+    if filenames:
+        wanted = {Path(f).name for f in filenames}
+        targets = [n for n in targets if n in wanted]
+
+    work = []
+    fresh = 0
+    for filename in targets:
+        if not full and manifest.is_fresh(filename, stats[filename], versions):
+            fresh += 1
+            instrumentation.note_skipped(filename)
+            continue
+        recorded = {} if full else {n: manifest.section_hash(filename, n) for n in names}
+        work.append((filename, names, {k: v for k, v in recorded.items() if v}, dry_run, full))
+
+    if jobs > 1 and len(work) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            # map() yields in submission order, so logs and counts match a serial run.
+            results = list(pool.map(_process_star, work, chunksize=max(1, len(work) // (jobs * 4))))
+    else:
+        results = [_process_file(*item) for item in work]
+
+    counts = {name: 0 for name in names}
+    updated = 0
+    total = fresh
+    rewrites = {}
+    for filename, changed, error, sections, stat, metrics, same_terms in results:
+        instrumentation.merge(filename, metrics)
+        if error is not None:
+            print(f"  ✗ ERROR {filename}: {error}")
+            continue
+        total += 1
+        if changed:
+            for name in changed:
+                counts[name] += 1
+            updated += 1
+            print(f"  ✓ {filename}: {', '.join(changed)}")
+        if stat is not None:
+            manifest.record(filename, stat, sections, versions)
+        if same_terms:
+            rewrites[filename] = (stats[filename], stat)
+
+    if not dry_run:
+        manifest.prune(stats)
+        manifest.save()
+        # Our own writes left the chapters' terms alone; don't make the next
+        # IDF refresh re-read them.
+        carry_over(rewrites, chapters.chapters_dir)
+        refresh_manifest()
+
+    per_stage = ", ".join(f"{k}: {v}" for k, v in counts.items())
+    verb = "Would update" if dry_run else "Updated"
+    print(f"{verb} {updated}/{total} chapters ({per_stage}; {fresh} unchanged since last build)")
+    return updated, total, counts
+
+
+def add_jobs_argument(parser):
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help=f"Worker processes to fan chapters out to (0 = all {os.cpu_count()} cores)")
+
+
+def resolve_jobs(jobs):
+    if jobs == 0:
+        return os.cpu_count() or 1
+    return max(1, jobs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run chapter transform stages in a single pass.")
+    parser.add_argument("files", nargs="*", help="Limit the run to these chapter filenames")
+    parser.add_argument("--stages", help=f"Comma-separated subset of: {', '.join(STAGES_BY_NAME)}")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing files")
+    parser.add_argument("--full", action="store_true", help="Ignore the build manifest and force every stage to recompute every chapter")
+    parser.add_argument("--instrument", action="store_true",
+                        help=f"Record per-file timings and I/O to {instrumentation.REPORT_PATH.name}")
+    parser.add_argument("--profile-file", metavar="CHAPTER",
+                        help="Also run this chapter under cProfile and tracemalloc (implies --instrument)")
+    add_jobs_argument(parser)
+    args = parser.parse_args(argv)
+
+    if args.instrument or args.profile_file:
+        instrumentation.enable(args.profile_file)
+    names = [n.strip() for n in args.stages.split(",") if n.strip()] if args.stages else None
+    try:
+        run(names, args.files, args.dry_run, args.full, resolve_jobs(args.jobs))
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
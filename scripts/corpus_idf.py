@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Document frequencies of chapter terms, per subject and language.
+
+Each chapter is one document: the concept and test text that long answers
+draw their context from. Terms are counted per (subject, language) group, so
+"force" is common in Science but rare in History, and Hindi chapters are
+weighed only against Hindi chapters.
+
+The table is cached in .cache/corpus-idf.json together with each chapter's
+(mtime, size) and term set. A refresh re-reads only the chapters that
+changed and adjusts the counts of their group by the terms they lost and
+gained, so keeping it current costs one scandir plus the edited files.
+Writers that rewrite chapters without touching their terms (the content
+pipeline) carry the cached entries over instead, so their own writes don't
+count as edits.
+
+Weights are BM25 idf, which stays positive for terms in every chapter of a
+group, and 0 for STOPWORDS: the function words that are frequent in every
+group ("the", "and", "में", "के", "आणि").
+
+Usage:
+    python3 scripts/corpus_idf.py build
+    python3 scripts/corpus_idf.py show Science en -n 20
+"""
+import argparse
+import json
+import os
+import sys
+
+from build_manifest import input_hash
+from chapter_corpus import CACHE_DIR, corpus
+from chapter_manifest import LANGUAGES, classify
+from retrieval import TOKENIZER_VERSION, bm25_idf, token_set
+
+IDF_PATH = CACHE_DIR / "corpus-idf.json"
+_VERSION = 1
+
+_STOPWORDS_EN = """
+about above after again against all also among and any are around because been before being below
+between both but can cannot could did does doing done down during each either etc even ever every
+few for from further give given had has have having her here hers herself him himself his how however
+into its itself just least less like made make many may might more most much must near neither nor
+not now off often once one only onto other others our ours ourselves out over own per same several
+shall she should since some such than that the their theirs them themselves then there these they
+this those though three through thus till too two under until upon use used uses using very via was
+were what when where whether which while who whom whose why will with within without would yet you
+your yours yourself
+answer answers chapter describe explain find following question questions state write
+"""
+_STOPWORDS_HI = """
+और का की के को में से पर है हैं था थे थी हो होता होती होते होना हुआ हुई हुए ने भी तो ही यह वह ये वे
+इस उस इन उन इसे उसे इसका उसका इसकी उसकी इसके उसके इनके उनके उनका उनकी इनका इनकी एक कुछ कई सब सभी
+जो जब तब तक कि या तथा एवं लेकिन परंतु किंतु अगर यदि क्या क्यों कैसे कौन किस किसी किसे कहाँ जहाँ वहाँ
+यहाँ अपना अपनी अपने साथ लिए द्वारा बाद पहले बहुत अधिक कम नहीं ना कर करके करना करने करता करती करते
+किया किए गया गई गए जाता जाती जाते जाना रहा रही रहे सकता सकती सकते वाला वाली वाले आदि अब फिर
+लिखिए बताइए समझाइए उत्तर प्रश्न
+"""
+_STOPWORDS_MR = """
+आणि आहे आहेत होता होती होते होत असे असा असून असते असतो असतात अशी या व हा ही हे तो ती ते त्या त्याचा
+त्याची त्याचे त्यांचा त्यांची त्यांचे त्यांच्या त्याच्या मध्ये मधील ला ना ने चा ची चे च्या वर साठी कडे पण किंवा
+म्हणून म्हणजे तर जर की काही सर्व एक कोण काय कसे कसा कशी कोणते कोणता कोणती का आपण आपल्या आपले
+नाही येथे तेथे जे जो जी केले केला केली करा करून करणे करतात तसेच अधिक खूप
+लिहा सांगा स्पष्ट उत्तर प्रश्न
+"""
+# Normalized the way the tokenizer normalizes text, so lookups match tokens.
+STOPWORDS = token_set(" ".join((_STOPWORDS_EN, _STOPWORDS_HI, _STOPWORDS_MR)))
+
+
+def long_answer_snippets(concepts: list, tests: list):
+    """Concept and test texts that long answers can draw context from."""
+    snippets = []
+    for c in concepts or []:
+        snippets.append(" ".join([
+            str(c.get("title", "")),
+            str(c.get("content", "")),
+            " ".join(k.get("text", k) if isinstance(k, dict) else str(k) for k in c.get("keyPoints", []) if k),
+        ]))
+    for t in tests or []:
+        snippets.append(" ".join([str(t.get("question", "")), str(t.get("explanation", ""))]))
+    return snippets
+
+
+def chapter_terms(data):
+    """Distinct terms of one chapter document."""
+    terms = set()
+    for text in long_answer_snippets(data.get("concepts"), data.get("test")):
+        terms |= token_set(text)
+    return terms
+
+
+def terms_digest(data):
+    """Hash of everything a chapter's cached entry is computed from: its group and its snippets."""
+    return input_hash([data_group(data), long_answer_snippets(data.get("concepts"), data.get("test"))])
+
+
+def group_key(subject, language):
+    return f"{subject}/{language}"
+
+
+def data_group(data):
+    """(subject, language) of chapter data, as classify() would give with complete metadata."""
+    meta = data.get("metadata") if isinstance(data.get("metadata"), dict) else {}
+    subject = meta.get("subject") or "General"
+    return subject, meta.get("language") or LANGUAGES.get(subject, "en")
+
+
+class GroupIdf:
+    """Term weights for one (subject, language) group; unknown terms weigh the most."""
+
+    def __init__(self, docs, df):
+        self.docs = docs
+        self.df = df
+        self._cache = {}
+
+    def __getitem__(self, term):
+        w = self._cache.get(term)
+        if w is None:
+            w = 0.0 if term in STOPWORDS else bm25_idf(self.docs, self.df.get(term, 0))
+            self._cache[term] = w
+        return w
+
+
+class IdfTable:
+    def __init__(self, groups):
+        self.groups = groups
+
+    def group(self, subject, language):
+        g = self.groups.get(group_key(subject, language)) or {"docs": 0, "df": {}}
+        return GroupIdf(g["docs"], g["df"])
+
+
+def _load_state(path, chapters_dir):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if (state.get("version") == _VERSION and state.get("tokenizer") == TOKENIZER_VERSION
+                and state.get("dir") == str(chapters_dir)):
+            return state
+    except (FileNotFoundError, ValueError):
+        pass
+    return {"files": {}, "groups": {}}
+
+
+def _count(groups, key, terms, delta):
+    g = groups.setdefault(key, {"docs": 0, "df": {}})
+    g["docs"] += delta
+    df = g["df"]
+    for term in terms:
+        n = df.get(term, 0) + delta
+        if n > 0:
+            df[term] = n
+        else:
+            df.pop(term, None)
+    if g["docs"] <= 0:
+        del groups[key]
+
+
+def build_idf(chapters=None, path=IDF_PATH):
+    """Bring the cached table up to date with the chapters. Returns (IdfTable, changed files)."""
+    chapters = chapters or corpus()
+    stats = chapters.file_stats()
+    state = _load_state(path, chapters.chapters_dir)
+    files, groups = state["files"], state["groups"]
+
+    changed = [n for n in stats if (files.get(n) or [None, None])[:2] != list(stats[n])]
+    removed = [n for n in files if n not in stats]
+    for name in removed + changed:
+        old = files.pop(name, None)
+        if old:
+            _count(groups, old[2], old[3], -1)
+    for name in changed:
+        ch = chapters.get(name)
+        if ch is None:
+            continue
+        entry = classify(ch)
+        key = group_key(entry["subject"], entry["language"])
+        terms = sorted(chapter_terms(ch.data))
+        files[name] = [*stats[name], key, terms]
+        _count(groups, key, terms, 1)
+
+    if changed or removed:
+        _save_state(path, chapters.chapters_dir, files, groups)
+    return IdfTable(groups), changed + removed
+
+
+def carry_over(rewrites, chapters_dir=None, path=IDF_PATH):
+    """Keep the cached entries of chapters rewritten with the same terms_digest().
+
+    rewrites maps filename -> (stat before, stat after the rewrite); an entry
+    is only carried over if it was current for the stat before. Returns the
+    number of entries carried over.
+    """
+    chapters_dir = chapters_dir or corpus().chapters_dir
+    state = _load_state(path, chapters_dir)
+    files = state["files"]
+    moved = 0
+    for name, (before, after) in rewrites.items():
+        entry = files.get(name)
+        if entry and entry[:2] == list(before):
+            entry[:2] = list(after)
+            moved += 1
+    if moved:
+        _save_state(path, chapters_dir, files, state["groups"])
+    return moved
+
+
+def _save_state(path, chapters_dir, files, groups):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"version": _VERSION, "tokenizer": TOKENIZER_VERSION,
+                            "dir": str(chapters_dir), "files": files, "groups": groups},
+                           ensure_ascii=False, separators=(",", ":")))
+    os.replace(tmp, path)
+
+
+_table = None
+
+
+def idf_table(refresh=False):
+    """The process-wide table, brought up to date on first use (or when asked to)."""
+    global _table
+    if _table is None or refresh:
+        _table = build_idf()[0]
+    return _table
+
+
+def group_idf(subject, language):
+    return idf_table().group(subject, language)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect the per-subject corpus IDF table.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help=f"Refresh {IDF_PATH}")
+    show = sub.add_parser("show", help="Print a group's most and least common terms")
+    show.add_argument("subject")
+    show.add_argument("language", nargs="?", help="en, hi or mr (default: the subject's language)")
+    show.add_argument("-n", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    table, changed = build_idf()
+    if args.command == "build":
+        print(f"{len(table.groups)} groups, {sum(g['docs'] for g in table.groups.values())} chapters "
+              f"({len(changed)} re-read) -> {IDF_PATH}")
+        for key in sorted(table.groups):
+            g = table.groups[key]
+            print(f"  {key}: {g['docs']} chapters, {len(g['df'])} terms")
+        return
+    language = args.language or LANGUAGES.get(args.subject, "en")
+    idf = table.group(args.subject, language)
+    if not idf.docs:
+        sys.exit(f"No {args.subject}/{language} chapters")
+    ranked = sorted(idf.df.items(), key=lambda item: (-item[1], item[0]))
+    print(f"{args.subject}/{language}: {idf.docs} chapters, {len(ranked)} terms")
+    for term, df in ranked[:args.n]:
+        print(f"  {df:4d}  {idf[term]:.3f}  {term}{'  (stopword)' if term in STOPWORDS else ''}")
+
+
+if __name__ == "__main__":
+    main()
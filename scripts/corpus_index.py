@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Corpus-wide BM25 index over chapter text, stored in a compact mmap-able file.
+
+Indexed fields, one snippet each:
+    concepts[i].content, concepts[i].keyPoints, test[i].explanation,
+    aiContext.keyConcepts, textbookExercise.qaCards[i]
+
+File layout (little-endian), all tables fixed-width so lookups are a binary
+search straight over the mapped bytes with no up-front deserialization:
+
+    header   MAGIC, version, tokenizer version, n_docs, n_terms, avg length,
+             corpus fingerprint, offsets of the four sections below
+    docs     n_docs  x (text offset, text length, source offset, source length, token count)
+    terms    n_terms x (term offset, term length, postings offset, doc frequency), sorted by term bytes
+    postings per term, df x (doc id, term frequency)
+    strings  UTF-8 blob holding terms, snippet texts and sources
+
+Usage:
+    python3 scripts/corpus_index.py build
+    python3 scripts/corpus_index.py query "why does sound need a medium" -k 5
+"""
+import argparse
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import sys
+import time
+from collections import Counter
+
+from chapter_corpus import CACHE_DIR, corpus
+from retrieval import TOKENIZER_VERSION, bm25_idf, bm25_term, token_set, tokenize
+
+INDEX_PATH = CACHE_DIR / "corpus-index.bin"
+MAGIC = b"HARYAIX1"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sIIIIf16sQQQQ")
+_DOC = struct.Struct("<IIIII")
+_TERM = struct.Struct("<IIII")
+_POSTING = struct.Struct("<II")
+
+
+def corpus_fingerprint(stats):
+    """Hash of every chapter's (name, mtime, size); changes whenever the corpus does."""
+    h = hashlib.blake2b(digest_size=16)
+    for name in sorted(stats):
+        mtime_ns, size = stats[name]
+        h.update(f"{name}\0{mtime_ns}\0{size}\n".encode("utf-8"))
+    return h.digest()
+
+
+def _text(value):
+    if isinstance(value, list):
+        return " ".join(_text(v) for v in value if v)
+    if isinstance(value, dict):
+        return str(value.get("text", ""))
+    return str(value or "")
+
+
+def chapter_snippets(chapter):
+    """(source, text) pairs for every indexed field of one chapter."""
+    data = chapter.data
+    name = chapter.filename
+    out = []
+    for i, c in enumerate(data.get("concepts") or []):
+        if not isinstance(c, dict):
+            continue
+        out.append((f"{name}#concepts[{i}].content", _text(c.get("content"))))
+        out.append((f"{name}#concepts[{i}].keyPoints", _text(c.get("keyPoints"))))
+    for i, t in enumerate(data.get("test") or []):
+        if isinstance(t, dict):
+            out.append((f"{name}#test[{i}].explanation", _text(t.get("explanation"))))
+    ai = data.get("aiContext")
+    if isinstance(ai, dict):
+        out.append((f"{name}#aiContext.keyConcepts", _text(ai.get("keyConcepts"))))
+    te = data.get("textbookExercise")
+    if isinstance(te, dict):
+        for i, qa in enumerate(te.get("qaCards") or []):
+            if isinstance(qa, dict):
+                out.append((f"{name}#textbookExercise.qaCards[{i}]",
+                            f"{_text(qa.get('question'))} {_text(qa.get('answer'))}"))
+    return [(src, text) for src, text in out if text.strip()]
+
+
+def build_index(path=INDEX_PATH, chapters=None):
+    """Tokenize every snippet in the corpus and write the binary index to path."""
+    chapters = chapters or corpus()
+    fingerprint = corpus_fingerprint(chapters.file_stats())
+
+    strings = bytearray()
+
+    def intern(s):
+        raw = s.encode("utf-8")
+        off = len(strings)
+        strings.extend(raw)
+        return off, len(raw)
+
+    docs = []
+    postings = {}
+    for ch in chapters.chapters():
+        for source, text in chapter_snippets(ch):
+            doc_id = len(docs)
+            terms = Counter(tokenize(text))
+            docs.append((*intern(text), *intern(source), sum(terms.values())))
+            for term, tf in terms.items():
+                postings.setdefault(term.encode("utf-8"), []).append((doc_id, tf))
+
+    term_rows = []
+    posting_bytes = bytearray()
+    for term in sorted(postings):
+        plist = postings[term]
+        term_off, term_len = len(strings), len(term)
+        strings.extend(term)
+        term_rows.append((term_off, term_len, len(posting_bytes), len(plist)))
+        for doc_id, tf in plist:
+            posting_bytes.extend(_POSTING.pack(doc_id, tf))
+
+    avg_length = (sum(d[4] for d in docs) / len(docs)) if docs else 0.0
+    docs_off = _HEADER.size
+    terms_off = docs_off + _DOC.size * len(docs)
+    postings_off = terms_off + _TERM.size * len(term_rows)
+    strings_off = postings_off + len(posting_bytes)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, TOKENIZER_VERSION, len(docs), len(term_rows), avg_length,
+                             fingerprint, docs_off, terms_off, postings_off, strings_off))
+        for row in docs:
+            f.write(_DOC.pack(*row))
+        for row in term_rows:
+            f.write(_TERM.pack(*row))
+        f.write(posting_bytes)
+        f.write(strings)
+    os.replace(tmp, path)
+    return len(docs), len(term_rows)
+
+
+class CorpusIndex:
+    """Read-only view over a memory-mapped index file."""
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, tok_version, self.n_docs, self.n_terms, self.avg_length, self.fingerprint,
+         self._docs, self._terms, self._postings, self._strings) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a corpus index this version can read")
+        self.tokenizer_version = tok_version
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def is_current(self, chapters=None):
+        chapters = chapters or corpus()
+        return (self.tokenizer_version == TOKENIZER_VERSION
+                and self.fingerprint == corpus_fingerprint(chapters.file_stats()))
+
+    def _string(self, off, length):
+        start = self._strings + off
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _find_term(self, term):
+        """Binary search the sorted term table; returns (postings offset, df) or None."""
+        key = term.encode("utf-8")
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            t_off, t_len, p_off, df = _TERM.unpack_from(self._mm, self._terms + mid * _TERM.size)
+            start = self._strings + t_off
+            probe = self._mm[start:start + t_len]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return p_off, df
+        return None
+
+    def document(self, doc_id):
+        """(source, text) for one indexed snippet."""
+        t_off, t_len, s_off, s_len, _ = _DOC.unpack_from(self._mm, self._docs + doc_id * _DOC.size)
+        return self._string(s_off, s_len), self._string(t_off, t_len)
+
+    def search(self, query, k=5):
+        """Top k (score, source, text) results for a free-text query."""
+        if not self.avg_length:
+            return []
+        scores = {}
+        for term in token_set(query):
+            found = self._find_term(term)
+            if found is None:
+                continue
+            p_off, df = found
+            idf = bm25_idf(self.n_docs, df)
+            base = self._postings + p_off
+            for i in range(df):
+                doc_id, tf = _POSTING.unpack_from(self._mm, base + i * _POSTING.size)
+                length = _DOC.unpack_from(self._mm, self._docs + doc_id * _DOC.size)[4]
+                scores[doc_id] = scores.get(doc_id, 0.0) + bm25_term(idf, tf, length, self.avg_length)
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(score, *self.document(doc_id)) for doc_id, score in best]
+
+
+def open_index(path=INDEX_PATH, rebuild_if_stale=True):
+    """Open the index, rebuilding it first if it is missing or out of date."""
+    if path.exists():
+        index = CorpusIndex(path)
+        if not rebuild_if_stale or index.is_current():
+            return index
+        index.close()
+    build_index(path)
+    return CorpusIndex(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the corpus-wide retrieval index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help=f"Rebuild {INDEX_PATH}")
+    q = sub.add_parser("query", help="Search the index (rebuilds it first if stale)")
+    q.add_argument("text")
+    q.add_argument("-k", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        t0 = time.perf_counter()
+        n_docs, n_terms = build_index()
+        print(f"Indexed {n_docs} snippets, {n_terms} terms in {time.perf_counter() - t0:.2f}s -> {INDEX_PATH}")
+        return
+
+    with open_index() as index:
+        t0 = time.perf_counter()
+        results = index.search(args.text, args.k)
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        for score, source, text in results:
+            print(f"{score:6.2f}  {source}\n        {text[:160]}")
+        print(f"{len(results)} results in {elapsed_ms:.2f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
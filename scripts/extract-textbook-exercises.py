@@ -1,35 +1,46 @@
 #!/usr/bin/env python3
 """
 Extract textbook exercises from science PDF and inject into chapter JSON files.
-Maps PDF exercise line numbers to chapter JSON files.
+
+The PDF text is scanned as a stream: chapter headings and "Exercise" /
+"Project :" / "ttt" boundaries are detected while reading, so no line-number
+table is needed and memory stays flat however long the textbook is.
+
+The text comes from the PDF text cache (pdf_text_cache.py), so the book is
+only extracted the first time; `--text` reads a text file instead.
+
+Usage:
+    python3 scripts/extract-textbook-exercises.py [--subject science] [--pdf path/to/book.pdf]
+    python3 scripts/extract-textbook-exercises.py --text science7.txt
 """
-import json, os, re
-
-PDF_TEXT = '/tmp/science7.txt'
-CHAPTERS_DIR = '/opt/h-arya/content/chapters'
-
-# Map: (pdf_exercise_line, next_exercise_line) -> chapter json filename
-CHAPTER_MAP = [
-    (856,  1269, 'chapter-1-science-7-living-world.json',      'The Living World'),
-    (1269, 1918, 'chapter-2-science-7-plants.json',            'Plants: Structure and Function'),
-    (1918, 2435, 'chapter-3-science-7-natural-resources.json', 'Properties of Natural Resources'),
-    (2435, 2915, 'chapter-4-science-7-nutrition.json',         'Nutrition in Living Organisms'),
-    (2915, 3309, 'chapter-5-science-7-food-safety.json',       'Food Safety'),
-    (3309, 3675, 'chapter-6-science-7-measurement.json',       'Measurement of Physical Quantities'),
-    (3675, 4232, 'chapter-7-science-7-motion-force-work.json', 'Motion, Force and Work'),
-    (4232, 4596, 'chapter-8-science-7-static-electricity.json','Static Electricity'),
-    (4596, 5036, 'chapter-9-science-7-heat.json',              'Heat'),
-    (5036, 5684, 'chapter-10-disasters.json',                  'Disasters'),
-    (5684, 6180, 'chapter-11-cell-structure-micro-organisms.json', 'Cell Structure'),
-    (6180, 6454, 'chapter-12-muscular-digestive-system.json',  'Muscular and Digestive System'),
-    (6454, 6969, 'chapter-13-physical-chemical-changes.json',  'Physical and Chemical Changes'),
-    (6969, 7218, 'chapter-14-elements-compounds-and-mixtures.json', 'Elements, Compounds and Mixtures'),
-    (7218, 7838, 'chapter-15-materials-we-use.json',           'Materials We Use'),
-    (7838, 8181, 'chapter-16-natural-resources.json',          'Natural Resources'),
-    (8181, 8697, 'chapter-17-effects-of-light.json',           'Effects of Light'),
-    (8697, 9018, 'chapter-18-sound.json',                      'Sound'),
-    (9018, 9476, 'chapter-19-properties-of-magnetic-field.json','Properties of Magnetic Field'),
-    (9476, 9515, 'chapter-20-in-the-world-of-stars.json',      'In the World of Stars'),
+import argparse, re, sys
+
+from chapter_corpus import corpus, save_chapter
+from chapter_manifest import chapter_manifest
+from pdf_text_cache import cached_text, textbook_pdf
+
+# Chapters of the Std 7 science textbook, in book order: (chapter json filename, heading)
+CHAPTERS = [
+    ('chapter-1-science-7-living-world.json', 'The Living World'),
+    ('chapter-2-science-7-plants.json', 'Plants: Structure and Function'),
+    ('chapter-3-science-7-natural-resources.json', 'Properties of Natural Resources'),
+    ('chapter-4-science-7-nutrition.json', 'Nutrition in Living Organisms'),
+    ('chapter-5-science-7-food-safety.json', 'Food Safety'),
+    ('chapter-6-science-7-measurement.json', 'Measurement of Physical Quantities'),
+    ('chapter-7-science-7-motion-force-work.json', 'Motion, Force and Work'),
+    ('chapter-8-science-7-static-electricity.json', 'Static Electricity'),
+    ('chapter-9-science-7-heat.json', 'Heat'),
+    ('chapter-10-disasters.json', 'Disasters'),
+    ('chapter-11-cell-structure-micro-organisms.json', 'Cell Structure'),
+    ('chapter-12-muscular-digestive-system.json', 'Muscular and Digestive System'),
+    ('chapter-13-physical-chemical-changes.json', 'Physical and Chemical Changes'),
+    ('chapter-14-elements-compounds-and-mixtures.json', 'Elements, Compounds and Mixtures'),
+    ('chapter-15-materials-we-use.json', 'Materials We Use'),
+    ('chapter-16-natural-resources.json', 'Natural Resources'),
+    ('chapter-17-effects-of-light.json', 'Effects of Light'),
+    ('chapter-18-sound.json', 'Sound'),
+    ('chapter-19-properties-of-magnetic-field.json', 'Properties of Magnetic Field'),
+    ('chapter-20-in-the-world-of-stars.json', 'In the World of Stars'),
 ]
 
 def clean_text(text):
@@ -38,6 +49,94 @@ def clean_text(text):
     text = re.sub(r' +', ' ', text)
     return text.strip()
 
+# Question-type cues in priority order: the first type with any cue in the
+# text wins, whatever position the cue appears at.
+QUESTION_TYPES = [
+    ('fill_blanks', ['fill in the blank', 'fill appropriate', 'fill the blank', 'write appropriate',
+                     'रिक्त स्थान', 'गाळलेल्या जागा']),
+    ('match_pairs', ['match the pair', 'match the column', 'who are my companion', 'find my match', 'with whom should',
+                     'जोड़ियाँ मिलाइए', 'जोड्या लावा', 'जोड्या जुळवा']),
+    ('true_false', ['true or false', 'state whether', 'सही या गलत', 'चूक की बरोबर']),
+    ('give_reasons', ['give reason', 'why is', 'explain', 'कारण लिखिए', 'कारणे लिहा']),
+    ('short_answer', ['answer the following', 'write answer', 'answer in your own', 'describe', 'what is', 'what are',
+                      'how', 'उत्तर लिखिए', 'उत्तरे लिहा']),
+    ('activity', ['classify', 'find the odd', 'odd man out', 'complete the']),
+]
+_CUE_TYPES = {}
+for _priority, (_type, _cues) in enumerate(QUESTION_TYPES):
+    for _cue in _cues:
+        _CUE_TYPES.setdefault(_cue, (_priority, _type))
+# One combined pattern. The lookahead makes finditer try every start position,
+# so overlapping cues are all seen; at a given position the alternatives are
+# ordered by priority, so the first one that matches is the best one there.
+_CUE_RE = re.compile('(?=(' + '|'.join(re.escape(c) for c in sorted(_CUE_TYPES, key=lambda c: _CUE_TYPES[c])) + '))')
+
+_SUB_MARKER_RE = re.compile(r'\(([a-z]|[अआइईउऊएऐओऔकखगघ])\)')
+
+
+def classify_question(content):
+    """Return (question type, matched cue) in a single scan; cue is None for the default."""
+    best = None
+    for m in _CUE_RE.finditer(content.lower()):
+        cue = m.group(1)
+        priority = _CUE_TYPES[cue][0]
+        if best is None or priority < best[0]:
+            best = (priority, cue)
+            if priority == 0:
+                break
+    if best is None:
+        return 'short_answer', None
+    return _CUE_TYPES[best[1]][1], best[1]
+
+
+def split_sub_questions(content):
+    """Split "(a) ... (b) ..." sub-questions in one left-to-right pass.
+
+    A sub-question runs from its marker to the end of the line (or an opening
+    parenthesis on that first line), plus any following lines that do not
+    themselves start with a marker.
+    """
+    out = []
+    n = len(content)
+    pos = 0
+    while True:
+        m = _SUB_MARKER_RE.search(content, pos)
+        if not m:
+            break
+        start = m.end()
+        while start < n and content[start].isspace():
+            start += 1
+        end = start
+        while end < n and content[end] not in '\n(':
+            end += 1
+        if end == start:
+            # Nothing usable after the whitespace: like the old regex's
+            # backtracking, fall back to the last non-newline whitespace char.
+            start -= 1
+            while start >= m.end() and content[start] == '\n':
+                start -= 1
+            if start < m.end():
+                pos = m.end()
+                continue
+            end = start
+            while end < n and content[end] not in '\n(':
+                end += 1
+        if end < n and content[end] == '\n':
+            # Continuation lines, until one starts with a marker or is empty.
+            while end < n and content[end] == '\n':
+                line_start = end + 1
+                if _SUB_MARKER_RE.match(content, line_start):
+                    break
+                line_end = content.find('\n', line_start)
+                line_end = n if line_end == -1 else line_end
+                if line_end == line_start:
+                    break
+                end = line_end
+        out.append(content[start:end])
+        pos = end
+    return out
+
+
 def parse_questions(raw_text):
     """Parse raw exercise text into structured Q&A format."""
     questions = []
@@ -62,26 +161,10 @@ def parse_questions(raw_text):
         if not content or len(content) < 5:
             continue
         
-        # Determine question type
-        content_lower = content.lower()
-        
-        if any(x in content_lower for x in ['fill in the blank', 'fill appropriate', 'fill the blank', 'write appropriate']):
-            q_type = 'fill_blanks'
-        elif any(x in content_lower for x in ['match the pair', 'match the column', 'who are my companion', 'find my match', 'with whom should']):
-            q_type = 'match_pairs'
-        elif any(x in content_lower for x in ['true or false', 'state whether']):
-            q_type = 'true_false'
-        elif any(x in content_lower for x in ['give reason', 'why is', 'explain']):
-            q_type = 'give_reasons'
-        elif any(x in content_lower for x in ['answer the following', 'write answer', 'answer in your own', 'describe', 'what is', 'what are', 'how']):
-            q_type = 'short_answer'
-        elif any(x in content_lower for x in ['classify', 'find the odd', 'odd man out', 'complete the']):
-            q_type = 'activity'
-        else:
-            q_type = 'short_answer'
+        q_type, _ = classify_question(content)
         
         # Extract sub-questions (a), (b), (c)...
-        sub_questions = re.findall(r'\([a-z]\)\s*([^\n\(]+(?:\n(?!\([a-z]\))[^\n]+)*)', content)
+        sub_questions = split_sub_questions(content)
         sub_questions = [sq.strip() for sq in sub_questions if len(sq.strip()) > 5]
         
         questions.append({
@@ -93,36 +176,88 @@ def parse_questions(raw_text):
     
     return questions[:10]  # Max 10 questions per chapter
 
-def extract_exercise(lines, start_line, end_line):
-    """Extract exercise text between line numbers."""
-    # Lines are 1-indexed in our map, 0-indexed in list
-    raw = ''.join(lines[start_line - 1:end_line - 1])
-    # Remove "Exercise" header
-    raw = re.sub(r'^Exercise\s*\n', '', raw)
-    # Stop at "Project :" or "ttt" or next chapter
-    raw = re.split(r'\nProject\s*:', raw)[0]
-    raw = re.split(r'\nttt\n', raw)[0]
-    return clean_text(raw)
-
-def main():
-    with open(PDF_TEXT) as f:
-        lines = f.readlines()
-    
-    for start, end, filename, chapter_name in CHAPTER_MAP:
-        filepath = os.path.join(CHAPTERS_DIR, filename)
-        if not os.path.exists(filepath):
+_EXERCISE_RE = re.compile(r'^Exercise\s*$')
+_END_RE = re.compile(r'^(Project\s*:|ttt\s*$)')
+
+
+def _heading_key(line):
+    """Normalize a line for heading comparison: drop a leading chapter number and punctuation."""
+    line = re.sub(r'^\s*\d+[.)]?\s*', '', line.lower())
+    return re.sub(r'[^a-z0-9\u0900-\u097f]+', '', line)
+
+
+def scan_exercises(lines, chapters):
+    """Yield (filename, chapter_name, raw exercise text) from a stream of text lines.
+
+    A line matching a chapter heading marks the current chapter. Everything
+    after an "Exercise" line up to "Project :", "ttt", the next heading or the
+    next "Exercise" is that chapter's exercise. If no heading was recognised
+    (headings are often mangled by PDF extraction) the block goes to the next
+    chapter in book order that has not had one yet.
+    """
+    headings = {_heading_key(name): i for i, (_, name) in enumerate(chapters)}
+    done = set()
+    current = None
+    block = None
+
+    def emit():
+        nonlocal current
+        idx = current if current is not None and current not in done else \
+            next((i for i in range(len(chapters)) if i not in done), None)
+        current = None
+        if idx is None:
+            return None
+        done.add(idx)
+        filename, name = chapters[idx]
+        return filename, name, clean_text(''.join(block))
+
+    for line in lines:
+        stripped = line.strip()
+        heading = headings.get(_heading_key(stripped)) if stripped else None
+        if block is not None and (heading is not None or _EXERCISE_RE.match(stripped) or _END_RE.match(stripped)):
+            result = emit()
+            block = None
+            if result:
+                yield result
+        if heading is not None:
+            current = heading
+        elif _EXERCISE_RE.match(stripped):
+            block = []
+        elif block is not None:
+            block.append(line)
+
+    if block is not None:
+        result = emit()
+        if result:
+            yield result
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8', errors='replace') as f:
+        yield from f
+
+
+def textbook_chapters(subject):
+    """(filename, title) in chapter order for a subject's grade 7 chapters."""
+    if subject.lower() == 'science':
+        return CHAPTERS
+    found = sorted(chapter_manifest().find(subject, grade=7), key=lambda e: e['chapterNumber'] or 0)
+    return [(e['file'], corpus().get(e['file']).metadata.get('title', '')) for e in found]
+
+
+def inject_exercises(lines, chapters):
+    """Parse each chapter's exercise from the text lines into its chapter JSON file."""
+    for filename, chapter_name, raw in scan_exercises(lines, chapters):
+        ch = corpus().get(filename)
+        if ch is None:
             print(f'  SKIP (file not found): {filename}')
             continue
-        
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = ch.data
         
         if 'textbookExercise' in data:
             print(f'  SKIP (already has textbookExercise): {filename}')
             continue
         
-        # Extract raw exercise text
-        raw = extract_exercise(lines, start, end)
         questions = parse_questions(raw)
         
         if not questions:
@@ -136,10 +271,29 @@ def main():
             'rawText': raw[:2000],  # Store raw for reference
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        save_chapter(ch)
         
         print(f'  ✓ {filename}: {len(questions)} questions extracted')
 
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Extract textbook exercises into chapter JSON files.')
+    parser.add_argument('--subject', default='science', help='Subject whose grade 7 chapters the book covers')
+    parser.add_argument('--pdf', help='Textbook PDF (default: content/textbooks/std7/<subject>-7-en.pdf)')
+    parser.add_argument('--text', help='Read this pdftotext output instead of the cached PDF text')
+    args = parser.parse_args(argv)
+
+    chapters = textbook_chapters(args.subject)
+    if args.text:
+        inject_exercises(read_lines(args.text), chapters)
+        return
+    try:
+        text = cached_text(args.pdf or textbook_pdf(args.subject))
+    except FileNotFoundError as e:
+        print(f'error: {e}', file=sys.stderr)
+        sys.exit(1)
+    with text:
+        inject_exercises(text.lines(), chapters)
+
 if __name__ == '__main__':
     main()
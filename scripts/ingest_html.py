@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Stream saved textbook source pages (content/textbooks/<std>/source-*.html)
+into headings, body text and links, without a network.
+
+Each page is read in fixed-size chunks and fed to an incremental HTMLParser,
+so memory stays bounded by the chunk size plus the text block being built,
+however large the page. Text is flushed block by block (paragraphs, list
+items, table cells, ...) straight to `<out>/<page>.jsonl`, one record per
+line:
+
+    {"kind": "heading", "level": 2, "text": "..."}
+    {"kind": "text", "text": "..."}
+    {"kind": "link", "url": "https://...", "text": "anchor text"}
+
+Pages are ingested in parallel worker processes. Links are resolved against
+the page URL (its <base>, canonical link, or the `N url` line for source-N in
+fetch.log) and deduplicated on the fly, first within each page and then
+across pages in page order; the unique links go to `<out>/links.tsv`
+(url, first page, anchor text) and the PDF links to `<out>/pdf-links.txt`.
+
+Usage:
+    python3 scripts/ingest_html.py                                  # std7 sources
+    python3 scripts/ingest_html.py path/to/pages/*.html --out /tmp/ingested --jobs 8
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+from chapter_corpus import REPO_ROOT
+
+SOURCES_DIR = REPO_ROOT / "content" / "textbooks" / "std7"
+CHUNK_SIZE = 64 * 1024
+MAX_BLOCK = 4096  # flush very long runs of inline text in pieces
+
+_SKIP = {"script", "style", "noscript", "template", "svg", "head", "iframe"}
+_BLOCKS = {"p", "div", "li", "ul", "ol", "section", "article", "main", "aside", "header", "footer", "nav",
+           "table", "tr", "td", "th", "blockquote", "pre", "figcaption", "dt", "dd", "form", "br", "hr"}
+_HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _clean(text):
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def is_pdf_link(url):
+    return urlsplit(url).path.lower().endswith(".pdf")
+
+
+class PageIngester(HTMLParser):
+    """Incremental parser that hands each heading, text block and new link to `emit`."""
+
+    def __init__(self, emit, base_url=None):
+        super().__init__(convert_charrefs=True)
+        self.emit = emit
+        self.base_url = base_url
+        self._base_locked = False  # a <base href> wins over the canonical link
+        self._skip_depth = 0
+        self._text = []
+        self._text_len = 0
+        self._heading = None  # (level, parts)
+        self._link = None  # (url, parts)
+        self.seen_links = set()
+        self.counts = {"heading": 0, "text": 0, "link": 0}
+
+    def _emit(self, record):
+        self.counts[record["kind"]] += 1
+        self.emit(record)
+
+    def _flush_text(self):
+        if self._text:
+            text = _clean("".join(self._text))
+            self._text, self._text_len = [], 0
+            if text:
+                self._emit({"kind": "text", "text": text})
+
+    def _resolve(self, href):
+        href = href.strip()
+        if not href or href.startswith(("#", "javascript:", "mailto:", "tel:", "data:")):
+            return None
+        url = urldefrag(urljoin(self.base_url or "", href))[0]
+        return url if urlsplit(url).scheme in ("http", "https") else None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("base", "link", "meta"):
+            a = dict(attrs)
+            if tag == "base" and a.get("href"):
+                self.base_url, self._base_locked = urljoin(self.base_url or "", a["href"]), True
+            elif not self._base_locked and tag == "link" and a.get("rel") == "canonical" and a.get("href"):
+                self.base_url = a["href"]
+            return
+        if tag in _SKIP:
+            self._skip_depth += 1
+            return
+        if self._skip_depth:
+            return
+        if tag in _HEADINGS:
+            self._flush_text()
+            self._heading = (_HEADINGS[tag], [])
+        elif tag in _BLOCKS and self._heading is None:
+            self._flush_text()
+        if tag == "a":
+            href = dict(attrs).get("href")
+            url = self._resolve(href) if href else None
+            self._link = (url, []) if url else None
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if self._skip_depth:
+            return
+        if tag == "a" and self._link is not None:
+            url, parts = self._link
+            self._link = None
+            if url not in self.seen_links:
+                self.seen_links.add(url)
+                self._emit({"kind": "link", "url": url, "text": _clean("".join(parts))})
+        elif tag in _HEADINGS and self._heading is not None:
+            level, parts = self._heading
+            self._heading = None
+            text = _clean("".join(parts))
+            if text:
+                self._emit({"kind": "heading", "level": level, "text": text})
+        elif tag in _BLOCKS and self._heading is None:
+            self._flush_text()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._link is not None:
+            self._link[1].append(data)
+        if self._heading is not None:
+            self._heading[1].append(data)
+            return
+        self._text.append(data)
+        self._text_len += len(data)
+        if self._text_len > MAX_BLOCK:
+            self._flush_text()
+
+    def close(self):
+        super().close()
+        self._flush_text()
+
+
+def page_urls(sources_dir):
+    """{"source-N.html": url} from the `N url` lines of fetch.log, if present."""
+    urls = {}
+    try:
+        with open(Path(sources_dir) / "fetch.log", "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and parts[0].isdigit():
+                    urls[f"source-{parts[0]}.html"] = parts[1]
+    except FileNotFoundError:
+        pass
+    return urls
+
+
+def ingest_page(path, out_dir, base_url=None):
+    """Stream one page into out_dir/<stem>.jsonl. Returns (page name, [(url, text)], counts)."""
+    path = Path(path)
+    out_path = Path(out_dir) / f"{path.stem}.jsonl"
+    links = []
+    tmp = out_path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as out:
+        def emit(record):
+            if record["kind"] == "link":
+                links.append((record["url"], record["text"]))
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        parser = PageIngester(emit, base_url)
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+        parser.close()
+    os.replace(tmp, out_path)
+    return path.name, links, parser.counts
+
+
+def _ingest_star(args):
+    return ingest_page(*args)
+
+
+def ingest(paths, out_dir, jobs=1):
+    """Ingest pages, writing per-page JSONL plus the deduplicated link lists.
+
+    Returns {"pages", "headings", "texts", "links", "uniqueLinks", "pdfLinks"}.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    urls = {}
+    for d in {Path(p).parent for p in paths}:
+        urls.update(page_urls(d))
+    work = [(p, out_dir, urls.get(Path(p).name)) for p in paths]
+
+    if jobs > 1 and len(work) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=jobs)
+        # map() yields in submission order, so link order and each link's first
+        # page are the same as in a serial run.
+        results = pool.map(_ingest_star, work)
+    else:
+        pool = None
+        results = (ingest_page(*item) for item in work)
+
+    seen = set()
+    totals = {"pages": 0, "headings": 0, "texts": 0, "links": 0, "uniqueLinks": 0, "pdfLinks": 0}
+    try:
+        with open(out_dir / "links.tsv.tmp", "w", encoding="utf-8") as links_f, \
+                open(out_dir / "pdf-links.txt.tmp", "w", encoding="utf-8") as pdf_f:
+            for name, links, counts in results:
+                totals["pages"] += 1
+                totals["headings"] += counts["heading"]
+                totals["texts"] += counts["text"]
+                totals["links"] += len(links)
+                for url, text in links:
+                    if url in seen:
+                        continue
+                    seen.add(url)
+                    totals["uniqueLinks"] += 1
+                    links_f.write(f"{url}\t{name}\t{text}\n")
+                    if is_pdf_link(url):
+                        totals["pdfLinks"] += 1
+                        pdf_f.write(url + "\n")
+                print(f"  ✓ {name}: {counts['heading']} headings, {counts['text']} text blocks, "
+                      f"{counts['link']} links")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    os.replace(out_dir / "links.tsv.tmp", out_dir / "links.tsv")
+    os.replace(out_dir / "pdf-links.txt.tmp", out_dir / "pdf-links.txt")
+    return totals
+
+
+def main(argv=None):
+    from content_pipeline import add_jobs_argument, resolve_jobs
+
+    parser = argparse.ArgumentParser(description="Extract headings, text and links from saved HTML pages.")
+    parser.add_argument("pages", nargs="*", help=f"HTML files (default: {SOURCES_DIR.relative_to(REPO_ROOT)}/source-*.html)")
+    parser.add_argument("--out", help="Output directory (default: ingested/ next to the pages)")
+    add_jobs_argument(parser)
+    args = parser.parse_args(argv)
+
+    paths = [Path(p) for p in args.pages] or sorted(SOURCES_DIR.glob("source-*.html"),
+                                                    key=lambda p: (len(p.name), p.name))
+    if not paths:
+        parser.error("no pages to ingest")
+    out_dir = Path(args.out) if args.out else paths[0].parent / "ingested"
+    totals = ingest(paths, out_dir, resolve_jobs(args.jobs))
+    print(f"Ingested {totals['pages']} pages: {totals['headings']} headings, {totals['texts']} text blocks, "
+          f"{totals['uniqueLinks']} unique links ({totals['pdfLinks']} PDF) of {totals['links']} -> {out_dir}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
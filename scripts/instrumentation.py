@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Opt-in timing and I/O accounting for the content scripts.
+
+Enable with HARYA_INSTRUMENT=1 (or `content_pipeline.py --instrument`). Every
+chapter the corpus parses or saves is then recorded: parse, transform and
+serialize time, bytes read and written, and whether the file was skipped,
+left unchanged or rewritten. When the script exits, the records are written
+to ops/reports/content-instrumentation-report.json (override with
+HARYA_INSTRUMENT_REPORT).
+
+HARYA_PROFILE_FILE=<chapter filename> (or `--profile-file`) additionally
+runs that one chapter's pipeline pass under cProfile and tracemalloc; the
+pstats file is written next to the report and a summary goes into it.
+
+When disabled, each hook is a single flag check.
+"""
+import atexit
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPORT_PATH = Path(os.environ.get(
+    "HARYA_INSTRUMENT_REPORT",
+    Path(__file__).resolve().parent.parent / "ops" / "reports" / "content-instrumentation-report.json"))
+
+_enabled = False
+_profile_file = None
+_files = {}
+
+
+def _new_record():
+    return {"parseSeconds": 0.0, "transformSeconds": {}, "serializeSeconds": 0.0,
+            "bytesRead": 0, "bytesWritten": 0, "action": "unchanged"}
+
+
+def enable(profile_file=None):
+    """Turn recording on for this process and any worker processes it starts."""
+    global _enabled, _profile_file
+    _enabled = True
+    _profile_file = profile_file or os.environ.get("HARYA_PROFILE_FILE") or None
+    os.environ["HARYA_INSTRUMENT"] = "1"
+    if _profile_file:
+        os.environ["HARYA_PROFILE_FILE"] = _profile_file
+    if "HARYA_INSTRUMENT_OWNER" not in os.environ:
+        # Only the process that turned instrumentation on writes the report.
+        os.environ["HARYA_INSTRUMENT_OWNER"] = str(os.getpid())
+        atexit.register(write_report)
+
+
+def _record(filename):
+    rec = _files.get(filename)
+    if rec is None:
+        rec = _files[filename] = _new_record()
+    return rec
+
+
+def note_parse(filename, nbytes, seconds):
+    if _enabled:
+        rec = _record(filename)
+        rec["parseSeconds"] += seconds
+        rec["bytesRead"] += nbytes
+
+
+def note_transform(filename, stage, seconds):
+    if _enabled:
+        times = _record(filename)["transformSeconds"]
+        times[stage] = times.get(stage, 0.0) + seconds
+
+
+def note_save(filename, nbytes, seconds, written):
+    if _enabled:
+        rec = _record(filename)
+        rec["serializeSeconds"] += seconds
+        if written:
+            rec["bytesWritten"] += nbytes
+            rec["action"] = "rewritten"
+
+
+def note_skipped(filename):
+    if _enabled:
+        _record(filename)["action"] = "skipped"
+
+
+def take(filename):
+    """Remove and return one file's record, to ship it from a worker to the parent."""
+    return _files.pop(filename, None) if _enabled else None
+
+
+def merge(filename, record):
+    if _enabled and record:
+        _files[filename] = record
+
+
+@contextmanager
+def profiled(filename):
+    """Profile the enclosed block if filename is the chapter chosen for profiling."""
+    if not _enabled or filename != _profile_file:
+        yield
+        return
+    # Imported here so scripts that never profile don't pay for them at startup.
+    import cProfile
+    import tracemalloc
+    tracemalloc.start(25)
+    profiler = cProfile.Profile()
+    t0 = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - t0
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # Kept on the file's record so it travels back from worker processes.
+        _record(filename)["profile"] = _summarize_profile(filename, profiler, snapshot, peak, elapsed)
+
+
+def _summarize_profile(filename, profiler, snapshot, peak, elapsed):
+    import io
+    import pstats
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    pstats_path = REPORT_PATH.with_name(f"{REPORT_PATH.stem}-{Path(filename).stem}.pstats")
+    profiler.dump_stats(pstats_path)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(20)
+    top = snapshot.statistics("lineno")[:10]
+    return {
+        "file": filename,
+        "seconds": round(elapsed, 6),
+        "pstats": str(pstats_path),
+        "cumulative": out.getvalue().strip().splitlines(),
+        "tracemalloc": {
+            "peakBytes": peak,
+            "top": [{"where": str(s.traceback[0]), "bytes": s.size, "count": s.count} for s in top],
+        },
+    }
+
+
+def report():
+    files = [{"file": name, **rec} for name, rec in sorted(_files.items())]
+    profiles = [rec.pop("profile") for rec in files if "profile" in rec]
+    stages = {}
+    for rec in _files.values():
+        for stage, seconds in rec["transformSeconds"].items():
+            stages[stage] = stages.get(stage, 0.0) + seconds
+    actions = {}
+    for rec in _files.values():
+        actions[rec["action"]] = actions.get(rec["action"], 0) + 1
+    totals = {
+        "files": len(files),
+        "actions": actions,
+        "parseSeconds": round(sum(r["parseSeconds"] for r in _files.values()), 6),
+        "transformSeconds": {k: round(v, 6) for k, v in sorted(stages.items())},
+        "serializeSeconds": round(sum(r["serializeSeconds"] for r in _files.values()), 6),
+        "bytesRead": sum(r["bytesRead"] for r in _files.values()),
+        "bytesWritten": sum(r["bytesWritten"] for r in _files.values()),
+    }
+    for rec in files:
+        rec["parseSeconds"] = round(rec["parseSeconds"], 6)
+        rec["serializeSeconds"] = round(rec["serializeSeconds"], 6)
+        rec["transformSeconds"] = {k: round(v, 6) for k, v in rec["transformSeconds"].items()}
+    out = {
+        "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "command": [Path(sys.argv[0]).name, *sys.argv[1:]] if sys.argv else [],
+        "totals": totals,
+        "files": files,
+    }
+    if profiles:
+        out["profile"] = profiles[0]
+    return out
+
+
+def write_report(path=None):
+    if not _enabled or os.environ.get("HARYA_INSTRUMENT_OWNER") != str(os.getpid()):
+        return
+    path = Path(path or REPORT_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(report(), indent=2, ensure_ascii=False) + "\n")
+    os.replace(tmp, path)
+    print(f"Instrumentation report: {path}", file=sys.stderr)
+
+
+if os.environ.get("HARYA_INSTRUMENT"):
+    enable()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Find near-duplicate questions across the whole corpus with MinHash + LSH.
+
+Every preAssessment, test, qaCards and longAnswers question is reduced to a
+set of word shingles (unigrams plus bigrams, Devanagari-aware) and a MinHash
+signature. Signatures are cut into bands and hashed into buckets, so only
+questions that share a bucket are ever compared, instead of all pairs.
+Candidate pairs are confirmed with the exact Jaccard similarity of their
+shingle sets and merged into clusters.
+
+The report (ops/reports/near-duplicate-questions.json) lists each cluster
+with its members' JSON sources, largest and most cross-chapter first.
+
+Usage:
+    python3 scripts/near_duplicates.py
+    python3 scripts/near_duplicates.py --threshold 0.6 --top 20
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from itertools import combinations
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from chapter_corpus import REPO_ROOT, corpus
+from retrieval import normalize_text
+
+REPORT_PATH = REPO_ROOT / "ops" / "reports" / "near-duplicate-questions.json"
+
+# Compare a question with at most this many earlier members of a shared bucket,
+# so a pathological bucket can't turn the pass quadratic.
+_BUCKET_LIMIT = 64
+# Whole Devanagari words (with their vowel signs), other words and numbers,
+# and single symbols, so "72 ÷ 6" and "(3^5) ÷ (3^2)" stay distinct.
+_WORD_RE = re.compile(r"[\u0900-\u0963\u0971-\u097F]+|\w+|[^\w\s]")
+
+
+def question_records(chapter):
+    """(sources, question text) for every distinct question in one chapter.
+
+    qaCards and longAnswers are often derived from the chapter's own test
+    questions; exact copies within a chapter are folded into one record with
+    several sources, so clusters only show duplication worth acting on.
+    """
+    data = chapter.data
+    name = chapter.filename
+    sections = [(key, data.get(key)) for key in ("preAssessment", "test")]
+    te = data.get("textbookExercise")
+    if isinstance(te, dict):
+        sections += [(f"textbookExercise.{key}", te.get(key)) for key in ("qaCards", "longAnswers")]
+    by_text = {}
+    for path, items in sections:
+        for i, item in enumerate(items if isinstance(items, list) else []):
+            text = item.get("question") if isinstance(item, dict) else None
+            if isinstance(text, str) and text.strip():
+                key = " ".join(_words(text))
+                by_text.setdefault(key, ([], text.strip()))[0].append(f"{name}#{path}[{i}].question")
+    return list(by_text.values())
+
+
+def _words(text):
+    return _WORD_RE.findall(normalize_text(text))
+
+
+@lru_cache(maxsize=1 << 18)
+def _hash(gram):
+    return int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def shingles(text):
+    """Unigram and bigram shingles over words, numbers and symbols, hashed to 64-bit ints."""
+    tokens = _words(text)
+    return set(map(_hash, tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]))
+
+
+class MinHasher:
+    """One-permutation MinHash with optimal densification (Shrivastava, 2017).
+
+    Each shingle hash is used once: it falls into one of num_perm bins and
+    only the bin minimum is kept, so a signature costs O(shingles + num_perm)
+    instead of O(shingles * num_perm). An empty bin copies the first filled
+    bin in its own fixed random probe order, which keeps the chance that two
+    signatures agree in a bin equal to their Jaccard similarity without
+    making neighbouring bins (and so whole LSH bands) copy the same value.
+    """
+
+    def __init__(self, num_perm=64, seed=1):
+        self.num_perm = num_perm
+        rng = random.Random(seed)
+        self._probes = []
+        for _ in range(num_perm):
+            order = list(range(num_perm))
+            rng.shuffle(order)
+            self._probes.append(order)
+
+    def signature(self, hashes):
+        if not hashes:
+            return None
+        k = self.num_perm
+        sig = [None] * k
+        for h in hashes:
+            b, v = h % k, h // k
+            if sig[b] is None or v < sig[b]:
+                sig[b] = v
+        if None in sig:
+            sig = [v if v is not None else next(sig[j] for j in self._probes[i] if sig[j] is not None)
+                   for i, v in enumerate(sig)]
+        return tuple(sig)
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def find_clusters(records, threshold=0.7, num_perm=64, bands=16):
+    """Group (sources, text) records into near-duplicate clusters.
+
+    Returns a list of clusters, each a list of record indexes (size >= 2),
+    plus the number of candidate pairs that were checked.
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm must be a multiple of bands")
+    rows = num_perm // bands
+    hasher = MinHasher(num_perm)
+    sets = [shingles(text) for _, text in records]
+    uf = _UnionFind(len(records))
+
+    # Identical shingle sets are duplicates outright; only one per set goes through LSH.
+    by_set = {}
+    unique = []
+    for i, s in enumerate(sets):
+        if not s:
+            continue
+        key = frozenset(s)
+        first = by_set.setdefault(key, i)
+        if first == i:
+            unique.append(i)
+        else:
+            uf.union(first, i)
+
+    buckets = defaultdict(list)
+    checked = 0
+    for i in unique:
+        sig = hasher.signature(sets[i])
+        matched = set()
+        for band in range(bands):
+            bucket = buckets[(band, sig[band * rows:(band + 1) * rows])]
+            for j in bucket[:_BUCKET_LIMIT]:
+                # Once i joined a cluster, its other members need no comparison.
+                if j in matched or uf.find(j) == uf.find(i):
+                    continue
+                checked += 1
+                if jaccard(sets[i], sets[j]) >= threshold:
+                    uf.union(i, j)
+                matched.add(j)
+            bucket.append(i)
+
+    groups = defaultdict(list)
+    for i in range(len(records)):
+        if sets[i]:
+            groups[uf.find(i)].append(i)
+    return [g for g in groups.values() if len(g) > 1], checked
+
+
+def build_report(records, clusters, threshold, num_perm, bands, seconds):
+    out = []
+    for members in clusters:
+        files = {src.split("#", 1)[0] for i in members for src in records[i][0]}
+        sets = [shingles(records[i][1]) for i in members]
+        out.append({
+            "size": len(members),
+            "chapters": len(files),
+            # Clusters are linked pair by pair, so two members can be less alike than the threshold.
+            "minSimilarity": round(min(jaccard(a, b) for a, b in combinations(sets, 2)), 3),
+            "members": [{"question": records[i][1], "sources": records[i][0]} for i in members],
+        })
+    out.sort(key=lambda c: (-c["chapters"], -c["size"], c["members"][0]["sources"][0]))
+    return {
+        "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "threshold": threshold,
+        "numPerm": num_perm,
+        "bands": bands,
+        "questions": len(records),
+        "duplicateQuestions": sum(c["size"] for c in out),
+        "crossChapterClusters": sum(1 for c in out if c["chapters"] > 1),
+        "seconds": round(seconds, 3),
+        "clusters": out,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report near-duplicate questions across the corpus.")
+    parser.add_argument("--threshold", type=float, default=0.7, help="Jaccard similarity to count as duplicate")
+    parser.add_argument("--num-perm", type=int, default=64, help="MinHash signature length")
+    parser.add_argument("--bands", type=int, default=16, help="LSH bands (num-perm must divide evenly)")
+    parser.add_argument("--top", type=int, default=10, help="Clusters to print")
+    parser.add_argument("--out", default=str(REPORT_PATH), help="Report path")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    records = [r for ch in corpus().chapters() for r in question_records(ch)]
+    try:
+        clusters, checked = find_clusters(records, args.threshold, args.num_perm, args.bands)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - t0
+    report = build_report(records, clusters, args.threshold, args.num_perm, args.bands, elapsed)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        f.write(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+
+    for c in report["clusters"][:args.top]:
+        print(f"  {c['size']} questions in {c['chapters']} chapter(s), similarity >= {c['minSimilarity']}")
+        for m in c["members"][:4]:
+            more = f" (+{len(m['sources']) - 1})" if len(m["sources"]) > 1 else ""
+            print(f"      {m['sources'][0]}{more}: {m['question'][:90]}")
+    print(f"{len(clusters)} clusters ({report['crossChapterClusters']} cross-chapter) among {len(records)} questions; "
+          f"{checked} candidate pairs checked in {elapsed:.2f}s -> {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
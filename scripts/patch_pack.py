@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Apply patch packs: batches of JSON Patch-style edits to chapter files.
+
+A patch pack is a JSON file listing operations, each naming the chapter file
+it edits:
+
+    {
+      "version": 1,
+      "description": "Rewrite long answers for science chapter 1",
+      "operations": [
+        {"file": "chapter-1-science-7-living-world.json", "op": "replace",
+         "path": "/textbookExercise/longAnswers", "value": [...]},
+        {"file": "chapter-3-hindi-dadi-maa-ka-parivar.json", "op": "test",
+         "path": "/test", "maxItems": 7},
+        {"file": "chapter-3-hindi-dadi-maa-ka-parivar.json", "op": "add",
+         "path": "/test/-", "value": {...}}
+      ]
+    }
+
+`op` is one of add, remove, replace and test, with RFC 6902 semantics on
+RFC 6901 paths. A test op may also give `minItems` / `maxItems` to check an
+array's length. Tests are preconditions: if one fails, that file is skipped
+and left untouched.
+
+All operations are grouped by file, so each chapter is read once, has its
+operations applied in pack order, and is written at most once (not at all if
+nothing changed). A file whose operations cannot be applied (missing path,
+bad index), or that two packs edit at overlapping paths, is reported as a
+conflict and not written.
+
+Usage:
+    python3 scripts/patch_pack.py content/patches/science-7-long-answers.json
+    python3 scripts/patch_pack.py content/patches/*.json --dry-run
+"""
+import argparse
+import copy
+import json
+import sys
+from pathlib import Path
+
+from chapter_corpus import REPO_ROOT, corpus, save_chapter
+
+PATCHES_DIR = REPO_ROOT / "content" / "patches"
+PACK_VERSION = 1
+OPS = ("add", "remove", "replace", "test")
+
+
+class PatchError(Exception):
+    """An operation that cannot be applied to the document it targets."""
+
+
+class PreconditionFailed(PatchError):
+    """A test operation did not hold."""
+
+
+def parse_pointer(pointer):
+    """RFC 6901 pointer -> list of reference tokens."""
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise ValueError(f"JSON pointer must start with '/': {pointer!r}")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _index(container, token, pointer, allow_end=False):
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token[0] == "0"):
+        raise PatchError(f"{pointer}: {token!r} is not an array index")
+    i = int(token)
+    if i > len(container) or (i == len(container) and not allow_end):
+        raise PatchError(f"{pointer}: index {i} is out of range ({len(container)} items)")
+    return i
+
+
+def _resolve(doc, tokens, pointer):
+    node = doc
+    for token in tokens:
+        if isinstance(node, dict):
+            if token not in node:
+                raise PatchError(f"{pointer}: '{token}' does not exist")
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_index(node, token, pointer)]
+        else:
+            raise PatchError(f"{pointer}: cannot descend into {type(node).__name__}")
+    return node
+
+
+def _same(a, b):
+    return json.dumps(a, sort_keys=True) == json.dumps(b, sort_keys=True)
+
+
+def apply_operation(doc, op):
+    """Apply one operation to doc in place and return the (possibly new) document."""
+    kind, pointer = op["op"], op["path"]
+    tokens = parse_pointer(pointer)
+    if kind == "test":
+        target = _resolve(doc, tokens, pointer)
+        if "value" in op and not _same(target, op["value"]):
+            raise PreconditionFailed(f"{pointer}: value differs")
+        if "minItems" in op or "maxItems" in op:
+            if not isinstance(target, list):
+                raise PreconditionFailed(f"{pointer}: not an array")
+            if len(target) < op.get("minItems", 0) or len(target) > op.get("maxItems", len(target)):
+                raise PreconditionFailed(f"{pointer}: has {len(target)} items")
+        return doc
+
+    if not tokens:
+        if kind == "remove":
+            raise PatchError("cannot remove the whole document")
+        return copy.deepcopy(op["value"])
+    parent = _resolve(doc, tokens[:-1], pointer)
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        if kind != "add" and key not in parent:
+            raise PatchError(f"{pointer}: '{key}' does not exist")
+        if kind == "remove":
+            del parent[key]
+        else:
+            parent[key] = copy.deepcopy(op["value"])
+    elif isinstance(parent, list):
+        i = _index(parent, key, pointer, allow_end=kind == "add")
+        if kind == "add":
+            parent.insert(i, copy.deepcopy(op["value"]))
+        elif kind == "remove":
+            del parent[i]
+        else:
+            parent[i] = copy.deepcopy(op["value"])
+    else:
+        raise PatchError(f"{pointer}: parent is a {type(parent).__name__}")
+    return doc
+
+
+def check_operation(op):
+    """Raise ValueError if op is not a well-formed pack operation."""
+    if not isinstance(op, dict):
+        raise ValueError("operation must be an object")
+    for key in ("file", "op", "path"):
+        if not isinstance(op.get(key), str):
+            raise ValueError(f"operation needs a string '{key}'")
+    if op["op"] not in OPS:
+        raise ValueError(f"unsupported op '{op['op']}' (expected one of {', '.join(OPS)})")
+    if op["op"] in ("add", "replace") and "value" not in op:
+        raise ValueError(f"'{op['op']}' needs a value")
+    parse_pointer(op["path"])
+
+
+def make_pack(operations, description=""):
+    for op in operations:
+        check_operation(op)
+    return {"version": PACK_VERSION, "description": description, "operations": list(operations)}
+
+
+def write_pack(path, pack):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(pack, indent=2, ensure_ascii=False) + "\n")
+
+
+def load_pack(path):
+    path = Path(path)
+    if not path.is_absolute() and not path.exists() and (PATCHES_DIR / path).exists():
+        path = PATCHES_DIR / path
+    with open(path, "r", encoding="utf-8") as f:
+        pack = json.load(f)
+    if not isinstance(pack, dict) or pack.get("version") != PACK_VERSION:
+        raise ValueError(f"{path}: not a version {PACK_VERSION} patch pack")
+    ops = pack.get("operations")
+    if not isinstance(ops, list):
+        raise ValueError(f"{path}: 'operations' must be a list")
+    for i, op in enumerate(ops):
+        try:
+            check_operation(op)
+        except ValueError as e:
+            raise ValueError(f"{path}: operation {i}: {e}") from None
+    return pack
+
+
+def _appends_into(append, other):
+    # Where an append lands depends on the array's length when it runs, so it
+    # may be the very element an explicit index in the same array names.
+    parent = append[:-1]
+    return (append[-1:] == ["-"] and len(other) > len(parent)
+            and other[:len(parent)] == parent and other[len(parent)].isdigit())
+
+
+def _overlaps(a, b):
+    """True if two write paths touch the same part of a document.
+
+    Several appends to one array ("/x/-") commute and do not conflict, but
+    an append and an explicit index into the same array ("/x/3") do.
+    """
+    if a == b and a and a[-1] == "-":
+        return False
+    n = min(len(a), len(b))
+    return a[:n] == b[:n] or _appends_into(a, b) or _appends_into(b, a)
+
+
+def group_operations(packs):
+    """{filename: [(pack index, op)]} in pack order, plus cross-pack conflicts.
+
+    Within one pack operations apply in order, as in RFC 6902. Two different
+    packs writing overlapping paths of the same file is a conflict, since the
+    result would depend on which pack happened to be listed first.
+    """
+    by_file = {}
+    for p, pack in enumerate(packs):
+        for op in pack["operations"]:
+            by_file.setdefault(op["file"], []).append((p, op))
+
+    conflicts = {}
+    for filename, ops in by_file.items():
+        writes = [(p, op["path"], parse_pointer(op["path"])) for p, op in ops if op["op"] != "test"]
+        for i, (p1, path1, t1) in enumerate(writes):
+            clash = next(((p2, path2) for p2, path2, t2 in writes[i + 1:] if p2 != p1 and _overlaps(t1, t2)), None)
+            if clash:
+                conflicts[filename] = f"packs {p1} and {clash[0]} both edit {path1} / {clash[1]}"
+                break
+    return by_file, conflicts
+
+
+def apply_packs(packs, dry_run=False, source=None):
+    """Apply packs to the corpus. Returns {"applied", "unchanged", "skipped", "conflicts"}.
+
+    skipped and conflicts map filename -> reason; applied and unchanged list
+    filenames.
+    """
+    source = source or corpus()
+    by_file, conflicts = group_operations(packs)
+    result = {"applied": [], "unchanged": [], "skipped": {}, "conflicts": dict(conflicts)}
+    for filename in sorted(by_file):
+        if filename in conflicts:
+            continue
+        ch = source.get(filename)
+        if ch is None:
+            result["conflicts"][filename] = "chapter not found or unreadable"
+            continue
+        before = json.dumps(ch.data, sort_keys=True)
+        doc = ch.data
+        try:
+            for _, op in by_file[filename]:
+                doc = apply_operation(doc, op)
+        except PreconditionFailed as e:
+            result["skipped"][filename] = f"precondition failed: {e}"
+            continue
+        except PatchError as e:
+            result["conflicts"][filename] = str(e)
+            continue
+        if json.dumps(doc, sort_keys=True) == before:
+            result["unchanged"].append(filename)
+            continue
+        ch.data = doc
+        if not dry_run:
+            save_chapter(ch)
+        result["applied"].append(filename)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply patch packs to chapter files.")
+    parser.add_argument("packs", nargs="+", help="Patch pack files (bare names are looked up in content/patches)")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        packs = [load_pack(p) for p in args.packs]
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    result = apply_packs(packs, dry_run=args.dry_run)
+
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        for name in result["applied"]:
+            print(f"  ✓ {name}")
+        for name, reason in result["skipped"].items():
+            print(f"  - {name}: {reason}")
+        for name, reason in result["conflicts"].items():
+            print(f"  ✗ {name}: {reason}")
+    ops = sum(len(p["operations"]) for p in packs)
+    verb = "would update" if args.dry_run else "updated"
+    print(f"{ops} operations in {len(packs)} pack(s): {verb} {len(result['applied'])}, "
+          f"unchanged {len(result['unchanged'])}, skipped {len(result['skipped'])}, "
+          f"conflicts {len(result['conflicts'])}", file=sys.stderr)
+    sys.exit(1 if result["conflicts"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of text extracted from textbook PDFs.
+
+The text of each PDF is stored under the SHA-256 of the PDF's bytes, in
+.cache/pdf-text/:
+
+    <hash>.txt    pdftotext output, pages separated by form feeds (\\f)
+    <hash>.pages  page index: the magic "HARYAPG2", the detected page offset,
+                  then the byte offset of each page start plus the end of
+                  the text (all little-endian uint64 after the magic)
+
+So re-running anything that needs a book's text never re-extracts it, even
+if the PDF was renamed or moved, and a new edition (different bytes) gets
+its own entry. PdfText maps the text file and uses the index to seek
+straight to the pages a chapter names in `metadata.pages` ("24-28") or a
+question's `pageReference`, without reading the rest of the book.
+
+Those are printed page numbers, which run behind the PDF's pages by the
+book's front matter. The offset is detected once, when the entry is stored,
+from the page numbers printed at the top or bottom of each page; pass
+page_offset (`--offset`) for a book whose numbering is too irregular to
+detect.
+
+Extraction runs `pdftotext -enc UTF-8` (poppler-utils); set HARYA_PDFTOTEXT
+to use another binary. Text already extracted elsewhere can be stored with
+`import`.
+
+Usage:
+    python3 scripts/pdf_text_cache.py extract content/textbooks/std7/science-7-en.pdf
+    python3 scripts/pdf_text_cache.py import content/textbooks/std7/science-7-en.pdf /tmp/science7.txt
+    python3 scripts/pdf_text_cache.py pages content/textbooks/std7/science-7-en.pdf 24-28
+    python3 scripts/pdf_text_cache.py pages content/textbooks/std7/science-7-en.pdf 24-28 --offset 6
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import re
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+
+from chapter_corpus import CACHE_DIR, REPO_ROOT
+
+TEXT_CACHE_DIR = CACHE_DIR / "pdf-text"
+TEXTBOOKS_DIR = REPO_ROOT / "content" / "textbooks"
+PDFTOTEXT = os.environ.get("HARYA_PDFTOTEXT", "pdftotext")
+
+# Subject -> textbook file stem, as named in content/textbooks/std<grade>/INDEX.md.
+TEXTBOOK_STEMS = {"mathematics": "maths", "civics": "history"}
+_INDEX_MAGIC = b"HARYAPG2"
+_OFFSET = struct.Struct("<Q")
+_PAGES_RE = re.compile(r"^\s*(\d+)\s*(?:[-–]\s*(\d+))?\s*$")
+_PAGE_NUMBER_RE = re.compile(r"^\s*(\d{1,3})\s*$")
+
+
+def pdf_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def textbook_pdf(subject, grade=7, language="en"):
+    """Path of the board textbook for a subject, e.g. content/textbooks/std7/science-7-en.pdf."""
+    stem = TEXTBOOK_STEMS.get(subject.lower(), subject.lower())
+    return TEXTBOOKS_DIR / f"std{grade}" / f"{stem}-{grade}-{language}.pdf"
+
+
+def parse_pages(spec):
+    """(first, last) page numbers from "24-28" or "7"; None for anything else ("textbook")."""
+    m = _PAGES_RE.match(str(spec)) if spec is not None else None
+    if not m:
+        return None
+    first = int(m.group(1))
+    last = int(m.group(2) or first)
+    return (first, last) if last >= first else (last, first)
+
+
+def _page_offsets(path):
+    """Byte offsets of each page start plus the end, scanning for form feeds in a bounded buffer."""
+    offsets = [0]
+    pos = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            start = 0
+            while True:
+                i = block.find(b"\f", start)
+                if i < 0:
+                    break
+                offsets.append(pos + i + 1)
+                start = i + 1
+            pos += len(block)
+    # pdftotext ends the last page with a form feed too; don't count an empty page after it.
+    if offsets[-1] == pos and len(offsets) > 1:
+        offsets.pop()
+    offsets.append(pos)
+    return offsets
+
+
+def _write_index(digest, text_file):
+    """Index a text file's pages and detect its page offset, into <digest>.pages.tmp."""
+    offsets = _page_offsets(text_file)
+    with open(text_file, "rb") as f:
+        page_offset = detect_page_offset(
+            f.read(end - start).decode("utf-8", "replace") for start, end in zip(offsets, offsets[1:]))
+    idx_tmp = TEXT_CACHE_DIR / f"{digest}.pages.tmp"
+    with open(idx_tmp, "wb") as f:
+        f.write(_INDEX_MAGIC + b"".join(_OFFSET.pack(o) for o in [page_offset] + offsets))
+    return idx_tmp
+
+
+def _read_index(digest):
+    """(page offset, page start offsets) from a PDF's index; None if missing or an older format."""
+    try:
+        with open(TEXT_CACHE_DIR / f"{digest}.pages", "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return None
+    if not raw.startswith(_INDEX_MAGIC):
+        return None
+    page_offset, *offsets = (o for (o,) in _OFFSET.iter_unpack(raw[len(_INDEX_MAGIC):]))
+    return page_offset, offsets
+
+
+def _store(digest, text_file):
+    """Move an extracted text file into the cache and write its page index."""
+    TEXT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    idx_tmp = _write_index(digest, text_file)
+    os.replace(text_file, TEXT_CACHE_DIR / f"{digest}.txt")
+    # The index is renamed last, so its presence means the entry is complete.
+    os.replace(idx_tmp, TEXT_CACHE_DIR / f"{digest}.pages")
+
+
+def detect_page_offset(pages):
+    """PDF pages before printed page 1, from the page numbers printed on each page.
+
+    `pages` is the text of each PDF page in order. Each page votes with a bare
+    number among its first or last two lines; the offset needs the support of
+    at least 3 pages and a tenth of the book, else 0.
+    """
+    votes = Counter()
+    count = 0
+    for index, page in enumerate(pages, 1):
+        count += 1
+        lines = [line for line in page.splitlines() if line.strip()]
+        for line in lines[-2:] + lines[:2]:
+            m = _PAGE_NUMBER_RE.match(line)
+            if m and 0 < int(m.group(1)) <= index:
+                votes[index - int(m.group(1))] += 1
+                break
+    if votes:
+        offset, support = votes.most_common(1)[0]
+        if support >= max(3, count // 10):
+            return offset
+    return 0
+
+
+def cached_text(pdf_path, page_offset=None):
+    """PdfText for a PDF, extracting it first if this exact file was never seen."""
+    digest = pdf_hash(pdf_path)
+    index = TEXT_CACHE_DIR / f"{digest}.pages"
+    if index.exists() and _read_index(digest) is None:
+        # Stored before the index recorded the page offset: re-index the cached text.
+        os.replace(_write_index(digest, TEXT_CACHE_DIR / f"{digest}.txt"), index)
+    elif not index.exists():
+        if shutil.which(PDFTOTEXT) is None:
+            raise FileNotFoundError(
+                f"{PDFTOTEXT} not found; install poppler-utils or store existing text with "
+                f"`pdf_text_cache.py import {pdf_path} <text file>`")
+        TEXT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=TEXT_CACHE_DIR, suffix=".txt.tmp")
+        os.close(fd)
+        try:
+            subprocess.run([PDFTOTEXT, "-enc", "UTF-8", str(pdf_path), tmp], check=True)
+            _store(digest, tmp)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+    return PdfText(digest, page_offset)
+
+
+def import_text(pdf_path, text_path, page_offset=None):
+    """Cache text extracted outside this script (e.g. an old /tmp/science7.txt) for a PDF."""
+    digest = pdf_hash(pdf_path)
+    TEXT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=TEXT_CACHE_DIR, suffix=".txt.tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(text_path, tmp)
+        _store(digest, tmp)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    return PdfText(digest, page_offset)
+
+
+class PdfText:
+    """Memory-mapped cached text of one PDF, addressable by PDF page or printed page.
+
+    page_offset is the number of PDF pages before printed page 1; None uses
+    the offset detected when the text was stored.
+    """
+
+    def __init__(self, digest, page_offset=None):
+        self.digest = digest
+        self.path = TEXT_CACHE_DIR / f"{digest}.txt"
+        index = _read_index(digest)
+        if index is None:
+            raise FileNotFoundError(f"no page index for {digest}; store the text with cached_text()")
+        detected, self._offsets = index
+        self.page_offset = detected if page_offset is None else page_offset
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    @property
+    def page_count(self):
+        return len(self._offsets) - 1
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _slice(self, start, end):
+        if self._map is None:
+            return ""
+        return self._map[start:end].decode("utf-8", "replace").replace("\f", "\n")
+
+    def page(self, number):
+        """Text of one PDF page, 1-based; "" past the end of the book."""
+        if not 1 <= number <= self.page_count:
+            return ""
+        return self._slice(self._offsets[number - 1], self._offsets[number])
+
+    def pages(self, spec):
+        """Text of the printed pages named by "24-28" / "7" / (first, last); "" if spec names no pages."""
+        span = spec if isinstance(spec, tuple) else parse_pages(spec)
+        if span is None:
+            return ""
+        first = max(1, span[0] + self.page_offset)
+        last = min(self.page_count, span[1] + self.page_offset)
+        if first > last:
+            return ""
+        return self._slice(self._offsets[first - 1], self._offsets[last])
+
+    def lines(self):
+        """Every line of the book, in order, with page breaks removed."""
+        if self._map is None:
+            return
+        pos = 0
+        end = self._offsets[-1]
+        while pos < end:
+            nl = self._map.find(b"\n", pos, end)
+            stop = end if nl < 0 else nl + 1
+            yield self._map[pos:stop].decode("utf-8", "replace").replace("\f", "")
+            pos = stop
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract and cache textbook PDF text by content hash.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    e = sub.add_parser("extract", help="Extract (or reuse) the text of PDFs")
+    e.add_argument("pdfs", nargs="+")
+    i = sub.add_parser("import", help="Store already-extracted text for a PDF")
+    i.add_argument("pdf")
+    i.add_argument("text")
+    p = sub.add_parser("pages", help="Print the text of a printed page range")
+    p.add_argument("pdf")
+    p.add_argument("pages", help='e.g. "24-28" or "7", as printed in the book')
+    p.add_argument("--offset", type=int, help="PDF pages before printed page 1 (default: detected)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "extract":
+            for pdf in args.pdfs:
+                with cached_text(pdf) as text:
+                    print(f"  ✓ {pdf}: {text.page_count} pages (printed page 1 is PDF page "
+                          f"{text.page_offset + 1}) -> {text.path}")
+        elif args.command == "import":
+            with import_text(args.pdf, args.text) as text:
+                print(f"  ✓ {args.pdf}: {text.page_count} pages -> {text.path}")
+        else:
+            if parse_pages(args.pages) is None:
+                parser.error(f"not a page range: {args.pages}")
+            with cached_text(args.pdf, page_offset=args.offset) as text:
+                sys.stdout.write(text.pages(args.pages))
+    except (FileNotFoundError, subprocess.CalledProcessError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
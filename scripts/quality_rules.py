@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Registered quality rules for chapter documents, run in one traversal.
+
+Each rule targets one kind of node -- the document itself, a preAssessment/
+test question, or a textbookExercise long answer -- and may fix the node,
+score its remaining risk, or both. RuleEngine visits every node once and
+runs the rules registered for it, fixes before risk checks, so one pass
+over a chapter yields the fixes and the risk score together.
+
+String matchers are compiled once, when the rule module is imported.
+
+Usage:
+    from quality_rules import RuleEngine
+    result = RuleEngine().run(chapter.data, grade=7)
+    result["changed"], result["risk"], result["findings"]
+"""
+import re
+
+DOCUMENT, QUESTION, LONG_ANSWER = "document", "question", "longAnswer"
+QUESTION_SECTIONS = ("preAssessment", "test")
+
+BOILERPLATE = "This can be observed in standard textbook examples from this chapter"
+GENERIC_KEY_POINTS = (
+    "Defines the concept asked in",
+    "Explains key causes/features in textbook style",
+    "Links the answer to a chapter-based example",
+    BOILERPLATE,
+)
+SHORT_MODEL_ANSWER = 50
+ANSWER_LETTERS = {0: "A", 1: "B", 2: "C", 3: "D"}
+
+_BOILERPLATE_RE = re.compile(rf" ?{re.escape(BOILERPLATE)}\.?")
+_GENERIC_RE = re.compile("|".join(map(re.escape, GENERIC_KEY_POINTS)))
+
+
+class Rule:
+    """A named check on one node type.
+
+    `fix(node, ctx)` returns True if it changed the node; `risk(node, ctx)`
+    returns the risk points the node still carries. Either may be None.
+    """
+
+    def __init__(self, name, target, fix=None, risk=None):
+        if target not in (DOCUMENT, QUESTION, LONG_ANSWER):
+            raise ValueError(f"Unknown rule target: {target}")
+        self.name = name
+        self.target = target
+        self.fix = fix
+        self.risk = risk
+
+
+RULES = []
+
+
+def register(name, target, fix=None, risk=None):
+    """Add a rule to the default set used by RuleEngine()."""
+    if any(r.name == name for r in RULES):
+        raise ValueError(f"Rule already registered: {name}")
+    rule = Rule(name, target, fix, risk)
+    RULES.append(rule)
+    return rule
+
+
+def _fix_missing_grade(data, ctx):
+    meta = data.get("metadata")
+    if isinstance(meta, dict) and "grade" not in meta and ctx.get("grade") is not None:
+        meta["grade"] = ctx["grade"]
+        return True
+    return False
+
+
+def _fix_numeric_answer(q, ctx):
+    value = q.get("correctAnswer")
+    if isinstance(value, int) and not isinstance(value, bool) and value in ANSWER_LETTERS:
+        q["correctAnswer"] = ANSWER_LETTERS[value]
+        return True
+    return False
+
+
+def _fix_boilerplate(la, ctx):
+    answer = la.get("modelAnswer")
+    if isinstance(answer, str) and BOILERPLATE in answer:
+        la["modelAnswer"] = _BOILERPLATE_RE.sub("", answer).strip()
+        return True
+    return False
+
+
+def _fix_generic_key_points(la, ctx):
+    points = la.get("keyPoints")
+    if not isinstance(points, list):
+        return False
+    kept = [p for p in points if not (isinstance(p, str) and _GENERIC_RE.search(p))]
+    if len(kept) != len(points):
+        la["keyPoints"] = kept
+        return True
+    return False
+
+
+register("missing_grade", DOCUMENT, fix=_fix_missing_grade)
+register("numeric_correct_answer", QUESTION, fix=_fix_numeric_answer)
+register("boilerplate_model_answer", LONG_ANSWER, fix=_fix_boilerplate)
+register("generic_key_points", LONG_ANSWER, fix=_fix_generic_key_points)
+register("empty_key_points", LONG_ANSWER, risk=lambda la, ctx: 0 if la.get("keyPoints") else 2)
+register("short_model_answer", LONG_ANSWER,
+         risk=lambda la, ctx: 1 if len(la.get("modelAnswer") or "") < SHORT_MODEL_ANSWER else 0)
+
+
+class RuleEngine:
+    """Runs a set of rules (default: every registered rule) over documents."""
+
+    def __init__(self, rules=None, fix=True):
+        rules = list(RULES if rules is None else rules)
+        self.fix = fix
+        self._by_target = {}
+        for target in (DOCUMENT, QUESTION, LONG_ANSWER):
+            chosen = [r for r in rules if r.target == target]
+            self._by_target[target] = (
+                [r for r in chosen if r.fix is not None and fix],
+                [r for r in chosen if r.risk is not None],
+            )
+
+    def _visit(self, node, target, ctx, result):
+        fixes, risks = self._by_target[target]
+        for rule in fixes:
+            if rule.fix(node, ctx):
+                result["changed"] = True
+                result["findings"][rule.name] = result["findings"].get(rule.name, 0) + 1
+        for rule in risks:
+            points = rule.risk(node, ctx)
+            if points:
+                result["risk"] += points
+                result["findings"][rule.name] = result["findings"].get(rule.name, 0) + 1
+
+    def run(self, data, **ctx):
+        """Fix and score one chapter document in place.
+
+        Returns {"changed": bool, "risk": int, "findings": {rule name: count}}.
+        Keyword arguments (e.g. grade=7) are passed to every rule.
+        """
+        result = {"changed": False, "risk": 0, "findings": {}}
+        if not isinstance(data, dict):
+            return result
+        self._visit(data, DOCUMENT, ctx, result)
+        if self._by_target[QUESTION] != ([], []):
+            for section in QUESTION_SECTIONS:
+                for q in data.get(section) or []:
+                    if isinstance(q, dict):
+                        self._visit(q, QUESTION, ctx, result)
+        te = data.get("textbookExercise")
+        if isinstance(te, dict) and self._by_target[LONG_ANSWER] != ([], []):
+            for la in te.get("longAnswers") or []:
+                if isinstance(la, dict):
+                    self._visit(la, LONG_ANSWER, ctx, result)
+        return result
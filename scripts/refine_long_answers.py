@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Refine long answers for the whole corpus with a completion endpoint.
+
+Collects the questions get_qs.py picks for refinement from every chapter
+(or the ones named), builds one prompt per question with the chapter's best
+matching concept and test text as context, and sends them concurrently:
+at most --concurrency requests in flight and at most --rate started per
+second, retrying rate-limit (429), server and network errors with backoff.
+
+Each answer is appended to a checkpoint (.cache/refine-long-answers.jsonl)
+as soon as it arrives, keyed by a hash of the model and prompt, so an
+interrupted run picks up where it stopped and a chapter whose text changed
+is asked again. Completions are also kept in the shared response cache
+(response_cache.py), so later runs over unchanged chapters send nothing.
+
+Chapters whose questions all have answers are written as a patch pack
+replacing their textbookExercise.longAnswers; review it and apply it with
+`patch_pack.py`.
+
+The endpoint speaks the OpenAI chat completions protocol
+(HARYA_LLM_URL, HARYA_LLM_MODEL, HARYA_LLM_API_KEY). `stub` serves canned
+answers locally for trying the runner out.
+
+Usage:
+    python3 scripts/refine_long_answers.py stub --port 8765 &
+    python3 scripts/refine_long_answers.py run --endpoint http://127.0.0.1:8765/v1/chat/completions
+    python3 scripts/refine_long_answers.py run chapter-1-science-7-living-world.json --rate 2
+    python3 scripts/patch_pack.py refined-long-answers.json --dry-run
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from build_manifest import input_hash
+from chapter_corpus import CACHE_DIR, corpus
+from chapter_manifest import chapter_manifest, classify
+from corpus_idf import long_answer_snippets
+from get_qs import questions_to_refine
+from patch_pack import PATCHES_DIR, make_pack, write_pack
+from response_cache import response_cache
+from retrieval import SnippetIndex
+
+ENDPOINT = os.environ.get("HARYA_LLM_URL", "http://127.0.0.1:8765/v1/chat/completions")
+MODEL = os.environ.get("HARYA_LLM_MODEL", "gpt-4o-mini")
+API_KEY = os.environ.get("HARYA_LLM_API_KEY", "")
+CHECKPOINT_PATH = CACHE_DIR / "refine-long-answers.jsonl"
+PACK_PATH = PATCHES_DIR / "refined-long-answers.json"
+MAX_QUESTIONS = 8
+
+SYSTEM_PROMPT = (
+    "You write model answers for school textbook exercises. Answer the question in 4-6 clear "
+    "sentences at the level of the chapter, using the chapter text given. Reply with JSON only: "
+    '{"modelAnswer": "...", "keyPoints": ["...", "...", "..."]} with 3-5 short key points.'
+)
+_JSON_RE = re.compile(r"\{.*\}", re.S)
+
+
+class Job:
+    """One question of one chapter, and the prompt that asks for its answer."""
+
+    def __init__(self, file, question, prompt, model, content_hash=""):
+        self.file = file
+        self.question = question
+        self.prompt = prompt
+        self.content_hash = content_hash
+        self.key = hashlib.sha256(json.dumps([model, SYSTEM_PROMPT, prompt], ensure_ascii=False)
+                                  .encode("utf-8")).hexdigest()[:32]
+
+
+def build_prompt(chapter, question, context):
+    meta = chapter.metadata
+    lines = [f"Subject: {meta.get('subject', '')}, grade {classify(chapter)['grade']}",
+             f"Chapter: {meta.get('title', chapter.filename)}", "", "Chapter text:"]
+    lines += [f"- {c.strip()}" for c in context if c.strip()]
+    lines += ["", f"Question: {question}"]
+    return "\n".join(lines)
+
+
+def collect_jobs(chapters, model=MODEL, max_questions=MAX_QUESTIONS):
+    """Jobs for every question worth refining, in chapter order."""
+    jobs = []
+    for ch in chapters:
+        try:
+            questions = questions_to_refine(ch.data) or []
+        except (AttributeError, TypeError) as e:
+            print(f"  - {ch.filename}: skipped ({e})", file=sys.stderr)
+            continue
+        if not questions:
+            continue
+        snippets = long_answer_snippets(ch.data.get("concepts"), ch.data.get("test"))
+        content_hash = input_hash(snippets)
+        index = SnippetIndex(snippets)
+        for q in questions[:max_questions]:
+            jobs.append(Job(ch.filename, q, build_prompt(ch, q, index.search(q, k=3)), model, content_hash))
+    return jobs
+
+
+def parse_answer(text):
+    """{"modelAnswer", "keyPoints"} from a completion; ValueError if it has neither."""
+    m = _JSON_RE.search(text or "")
+    if not m:
+        raise ValueError("no JSON object in completion")
+    raw = json.loads(m.group(0))
+    answer = raw.get("modelAnswer") if isinstance(raw, dict) else None
+    points = raw.get("keyPoints") if isinstance(raw, dict) else None
+    if not isinstance(answer, str) or not answer.strip():
+        raise ValueError("completion has no modelAnswer")
+    if not isinstance(points, list) or not all(isinstance(p, str) for p in points):
+        raise ValueError("completion has no keyPoints list")
+    return {"modelAnswer": answer.strip(), "keyPoints": [p.strip() for p in points if p.strip()]}
+
+
+class RetryableError(Exception):
+    """A failure worth another attempt: rate limit, server error, timeout or a garbled reply."""
+
+
+class CompletionClient:
+    """Blocking client for an OpenAI-style /chat/completions endpoint."""
+
+    def __init__(self, endpoint=ENDPOINT, model=MODEL, api_key=API_KEY, timeout=60.0):
+        self.endpoint = endpoint
+        self.model = model
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def complete(self, prompt):
+        body = json.dumps({
+            "model": self.model,
+            "temperature": 0.2,
+            "messages": [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": prompt}],
+        }).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        request = urllib.request.Request(self.endpoint, data=body, headers=headers, method="POST")
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                reply = json.load(response)
+        except urllib.error.HTTPError as e:
+            if e.code == 429 or e.code >= 500:
+                raise RetryableError(f"HTTP {e.code}") from None
+            raise
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+            raise RetryableError(str(getattr(e, "reason", e))) from None
+        try:
+            return reply["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            raise RetryableError("malformed completion response") from None
+
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+def load_checkpoint(path):
+    """{job key: answer} from a checkpoint file; a torn last line is ignored."""
+    done = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    done[record["key"]] = record["answer"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def _record(checkpoint, job, result):
+    checkpoint.write(json.dumps({"key": job.key, "file": job.file, "question": job.question,
+                                 "answer": result}, ensure_ascii=False) + "\n")
+    checkpoint.flush()
+
+
+async def run_jobs(jobs, client, done, checkpoint, concurrency=8, rate=4.0, retries=4, cache=None):
+    """Answer every job not already in done, appending each answer to checkpoint.
+
+    With a ResponseCache, cached completions are used without a request and
+    new ones are stored. Returns {job key: error message} for the jobs that
+    still failed; an HTTP error that is not worth retrying fails only its job.
+    """
+    pending = []
+    for job in {j.key: j for j in jobs if j.key not in done}.values():
+        text = cache.get(client.model, f"{SYSTEM_PROMPT}\n\n{job.prompt}", job.content_hash) if cache else None
+        try:
+            result = parse_answer(text) if text is not None else None
+        except ValueError:
+            result = None
+        if result is None:
+            pending.append(job)
+            continue
+        done[job.key] = result
+        _record(checkpoint, job, result)
+    if cache and cache.hits:
+        print(f"  {cache.hits} answered from the response cache", file=sys.stderr)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate)
+    failures = {}
+    total = len(pending)
+    finished = 0
+
+    loop = asyncio.get_running_loop()
+
+    async def answer(job, pool):
+        nonlocal finished
+        async with semaphore:
+            for attempt in range(retries + 1):
+                await limiter.wait()
+                try:
+                    text = await loop.run_in_executor(pool, client.complete, job.prompt)
+                    result = parse_answer(text)
+                    if cache:
+                        cache.put(client.model, f"{SYSTEM_PROMPT}\n\n{job.prompt}", job.content_hash, text)
+                    break
+                except (RetryableError, ValueError) as e:
+                    if attempt == retries:
+                        failures[job.key] = f"{job.file}: {e}"
+                        return
+                    await asyncio.sleep(min(30.0, 2 ** attempt) * (0.5 + random.random()))
+                except urllib.error.HTTPError as e:
+                    failures[job.key] = f"{job.file}: HTTP {e.code}"
+                    return
+        done[job.key] = result
+        _record(checkpoint, job, result)
+        finished += 1
+        if finished % 25 == 0 and finished < total:
+            print(f"  {finished}/{total} answered", file=sys.stderr, flush=True)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        await asyncio.gather(*(answer(j, pool) for j in pending))
+    if total:
+        failed = f", {len(failures)} failed" if failures else ""
+        print(f"  {finished}/{total} answered{failed}", file=sys.stderr, flush=True)
+    return failures
+
+
+def build_pack(jobs, done, source=None):
+    """Patch pack replacing longAnswers of every chapter whose questions were all answered.
+
+    Returns (pack, [incomplete chapter files]).
+    """
+    source = source or corpus()
+    by_file = {}
+    for job in jobs:
+        by_file.setdefault(job.file, []).append(job)
+    operations, incomplete = [], []
+    for filename, file_jobs in by_file.items():
+        if any(j.key not in done for j in file_jobs):
+            incomplete.append(filename)
+            continue
+        te = source.get(filename).data["textbookExercise"]
+        previous = {la.get("question", "").strip(): la for la in te.get("longAnswers") or [] if isinstance(la, dict)}
+        answers = []
+        for i, job in enumerate(file_jobs, start=1):
+            old = previous.get(job.question, {})
+            answers.append({
+                "id": old.get("id", f"la{i}"),
+                "question": job.question,
+                **done[job.key],
+                "marks": old.get("marks", 3 if i <= 3 else 5),
+            })
+        operations.append({"file": filename, "op": "replace" if "longAnswers" in te else "add",
+                           "path": "/textbookExercise/longAnswers", "value": answers})
+    return make_pack(operations, "Long answers refined with a completion model"), incomplete
+
+
+def serve_stub(port, latency=0.0, fail_rate=0.0):
+    """Serve canned completions on 127.0.0.1:port, failing fail_rate of requests with 429."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            time.sleep(latency)
+            if random.random() < fail_rate:
+                self.send_error(429, "Too Many Requests")
+                return
+            prompt = (body.get("messages") or [{}])[-1].get("content", "")
+            question = next((line[len("Question: "):] for line in prompt.splitlines()
+                             if line.startswith("Question: ")), "the question")
+            content = json.dumps({"modelAnswer": f"Stub answer: {question}",
+                                  "keyPoints": ["First point.", "Second point.", "Third point."]})
+            payload = json.dumps({"model": body.get("model"),
+                                  "choices": [{"message": {"role": "assistant", "content": content}}]}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    print(f"Stub completion endpoint on http://127.0.0.1:{server.server_port}/v1/chat/completions", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refine long answers with a completion endpoint, as a patch pack.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="Collect, send and checkpoint refinement prompts; write the patch pack")
+    run.add_argument("files", nargs="*", help="Chapter files (default: every chapter)")
+    run.add_argument("--grade", type=int, help="Only chapters of this grade")
+    run.add_argument("--subject", help="Only chapters of this subject")
+    run.add_argument("--endpoint", default=ENDPOINT, help="Chat completions URL (default: $HARYA_LLM_URL)")
+    run.add_argument("--model", default=MODEL, help="Model name (default: $HARYA_LLM_MODEL)")
+    run.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once")
+    run.add_argument("--rate", type=float, default=4.0, help="Requests started per second (0: unlimited)")
+    run.add_argument("--retries", type=int, default=4, help="Attempts after the first for retryable errors")
+    run.add_argument("--checkpoint", type=Path, default=CHECKPOINT_PATH, help="Answers log used to resume")
+    run.add_argument("--fresh", action="store_true", help="Ignore answers already in the checkpoint")
+    run.add_argument("--no-cache", action="store_true", help="Neither read nor fill the response cache")
+    run.add_argument("--out", type=Path, default=PACK_PATH, help="Patch pack to write")
+    run.add_argument("--dry-run", action="store_true", help="Only report the prompts that would be sent")
+    stub = sub.add_parser("stub", help="Serve canned completions locally")
+    stub.add_argument("--port", type=int, default=8765)
+    stub.add_argument("--latency", type=float, default=0.0, help="Seconds per response")
+    stub.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    args = parser.parse_args(argv)
+
+    if args.command == "stub":
+        serve_stub(args.port, args.latency, args.fail_rate)
+        return
+
+    source = corpus()
+    if args.files:
+        chapters = [source.get(os.path.basename(f)) for f in args.files]
+        missing = [f for f, ch in zip(args.files, chapters) if ch is None]
+        if missing:
+            parser.error(f"not found or unreadable: {', '.join(missing)}")
+    else:
+        chapters = [source.get(e["file"]) for e in chapter_manifest().find(args.subject, args.grade)]
+    jobs = collect_jobs(chapters, args.model)
+    done = {} if args.fresh else load_checkpoint(args.checkpoint)
+    todo = len({j.key for j in jobs} - done.keys())
+    print(f"{len(jobs)} questions in {len({j.file for j in jobs})} chapters; {todo} to ask "
+          f"{args.model} at {args.endpoint}", file=sys.stderr)
+    if args.dry_run:
+        if jobs:
+            print(jobs[0].prompt)
+        return
+
+    t0 = time.perf_counter()
+    failures = {}
+    if todo:
+        args.checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        client = CompletionClient(args.endpoint, args.model)
+        with open(args.checkpoint, "w" if args.fresh else "a", encoding="utf-8") as checkpoint:
+            failures = asyncio.run(run_jobs(jobs, client, done, checkpoint, args.concurrency, args.rate,
+                                            args.retries, None if args.no_cache else response_cache()))
+    for message in list(failures.values())[:10]:
+        print(f"  ✗ {message}", file=sys.stderr)
+
+    pack, incomplete = build_pack(jobs, done, source)
+    write_pack(args.out, pack)
+    print(f"Answered {todo - len(failures)}/{todo} in {time.perf_counter() - t0:.1f}s; "
+          f"{len(pack['operations'])} chapters -> {args.out}"
+          f"{f'; {len(incomplete)} incomplete (rerun to resume)' if incomplete else ''}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
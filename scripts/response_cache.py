@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of model responses for content generation, in SQLite.
+
+A response is stored under the SHA-256 of (model, prompt, content hash),
+where the content hash identifies the chapter text the prompt was built
+from. Asking the same model the same thing about unchanged content is a
+lookup; editing the chapter, the prompt or the model is a miss.
+
+Entries expire after a TTL (default 30 days) and the cache is kept under a
+size bound (default 256 MiB of responses) by evicting the least recently
+used entries. The database (.cache/responses.sqlite) runs in WAL mode, so
+several scripts, or parallel workers, can share it; use response_cache()
+for the process-wide instance.
+
+Usage:
+    python3 scripts/response_cache.py stats
+    python3 scripts/response_cache.py prune --max-mb 64
+    python3 scripts/response_cache.py clear
+"""
+import argparse
+import hashlib
+import sqlite3
+import threading
+import time
+
+from chapter_corpus import CACHE_DIR
+
+CACHE_PATH = CACHE_DIR / "responses.sqlite"
+DEFAULT_TTL = 30 * 24 * 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+def cache_key(model, prompt, content_hash):
+    h = hashlib.sha256()
+    for part in (model, prompt, content_hash or ""):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class ResponseCache:
+    """TTL- and size-bounded LRU cache of responses keyed by (model, prompt, content hash).
+
+    ttl is in seconds (None: never expire); max_bytes bounds the total size of
+    stored responses (None: unbounded).
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, model, prompt, content_hash):
+        """The cached response, or None if there is none or it expired."""
+        key = cache_key(model, prompt, content_hash)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, model, prompt, content_hash, response):
+        key = cache_key(model, prompt, content_hash)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, model, content_hash, response, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, content_hash or "", response, len(response.encode("utf-8")), now, now))
+            if self.max_bytes is not None:
+                self._evict(self.max_bytes)
+
+    def _evict(self, max_bytes):
+        """Drop least recently used entries until the responses fit in max_bytes."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= max_bytes:
+            return 0
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if total <= max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", victims)
+        return len(victims)
+
+    def prune(self, max_bytes=None):
+        """Delete expired entries, then LRU entries over the size bound. Returns the number removed."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            removed = 0
+            if self.ttl is not None:
+                removed += self._db.execute("DELETE FROM responses WHERE created < ?",
+                                            (time.time() - self.ttl,)).rowcount
+            if max_bytes is not None:
+                removed += self._evict(max_bytes)
+            return removed
+
+    def clear(self):
+        with self._lock:
+            return self._db.execute("DELETE FROM responses").rowcount
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            models = self._db.execute("SELECT model, COUNT(*) FROM responses GROUP BY model ORDER BY model").fetchall()
+        return {"entries": entries, "bytes": size, "models": dict(models)}
+
+
+_default = None
+
+
+def response_cache():
+    """Process-wide cache at the default path."""
+    global _default
+    if _default is None:
+        _default = ResponseCache()
+    return _default
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or prune the model response cache.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Entries and size, per model")
+    prune = sub.add_parser("prune", help="Remove expired entries and shrink to the size bound")
+    prune.add_argument("--max-mb", type=float, help="Size bound in MiB (default: 256)")
+    sub.add_parser("clear", help="Remove every entry")
+    args = parser.parse_args(argv)
+
+    with ResponseCache() as cache:
+        if args.command == "prune":
+            max_bytes = int(args.max_mb * 1024 * 1024) if args.max_mb is not None else None
+            print(f"Removed {cache.prune(max_bytes)} entries")
+        elif args.command == "clear":
+            print(f"Removed {cache.clear()} entries")
+        stats = cache.stats()
+        print(f"{stats['entries']} responses, {stats['bytes'] / 1024 / 1024:.1f} MiB -> {cache.path}")
+        for model, count in stats["models"].items():
+            print(f"  {model}: {count}")
+
+
+if __name__ == "__main__":
+    main()
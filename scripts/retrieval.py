@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Small BM25 inverted index for picking the chapter snippets that best match a prompt.
+
+The index is built once per chapter; each query then only touches the postings
+of its own terms and selects the top k with a heap, instead of re-tokenizing
+and intersecting every snippet for every prompt.
+"""
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+# Bump whenever tokenize() changes, so persisted indexes built with the old
+# tokenizer are rebuilt instead of silently missing terms.
+TOKENIZER_VERSION = 2
+
+# Devanagari letters, vowel signs (matras), virama and anusvara/visarga, but
+# not the danda (U+0964/0965) or Devanagari digits (U+0966-096F).
+_DEVANAGARI = "\u0900-\u0963\u0971-\u097F"
+_TOKEN_RE = re.compile(f"[{_DEVANAGARI}]{{2,}}|[^\\W\\d_]{{3,}}")
+_FOLD = str.maketrans({
+    "\u093C": None,     # nukta: ज़ -> ज, फ़ -> फ
+    "\u200C": None,     # zero-width non-joiner
+    "\u200D": None,     # zero-width joiner
+    "\u0901": "\u0902",  # chandrabindu -> anusvara
+})
+
+
+def normalize_text(s: str):
+    """Case-fold and Unicode-normalize text so spelling variants share tokens.
+
+    NFD first splits precomposed nukta letters (U+0958-095F) so the nukta can be
+    dropped, then NFC recombines everything else.
+    """
+    s = unicodedata.normalize("NFD", s).translate(_FOLD)
+    return unicodedata.normalize("NFC", s).casefold()
+
+
+@lru_cache(maxsize=65536)
+def _tokens(s: str):
+    return tuple(_TOKEN_RE.findall(normalize_text(s)))
+
+
+def tokenize(s: str):
+    """Word tokens for English, Hindi, Marathi or mixed-script text.
+
+    Latin words need 3+ letters (as before); Devanagari words need 2+ code
+    points, since short words like "जल" are meaningful. Results are memoized
+    per text, so a snippet shared by many prompts is only normalized once.
+    """
+    return list(_tokens(s))
+
+
+@lru_cache(maxsize=65536)
+def token_set(s: str):
+    return frozenset(_tokens(s))
+
+
+def bm25_idf(n_docs, df):
+    return math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+
+def bm25_term(idf, tf, length, avg_length, k1=1.2, b=0.75):
+    norm = k1 * (1 - b + b * length / avg_length)
+    return idf * tf * (k1 + 1) / (tf + norm)
+
+
+class SnippetIndex:
+    def __init__(self, snippets, tokenize=tokenize, k1=1.2, b=0.75):
+        self.snippets = list(snippets)
+        self.tokenize = tokenize
+        self.k1 = k1
+        self.b = b
+        # term -> [(snippet id, term frequency)]
+        self.postings = defaultdict(list)
+        self.lengths = []
+        for doc_id, text in enumerate(self.snippets):
+            terms = Counter(tokenize(text))
+            self.lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                self.postings[term].append((doc_id, tf))
+        n = len(self.snippets)
+        self.avg_length = (sum(self.lengths) / n) if n else 0.0
+        self.idf = {term: bm25_idf(n, len(p)) for term, p in self.postings.items()}
+
+    def scores(self, query):
+        """{snippet id: BM25 score} for every snippet sharing a term with the query."""
+        out = defaultdict(float)
+        if not self.avg_length:
+            return out
+        terms = token_set(query) if self.tokenize is tokenize else set(self.tokenize(query))
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf[term]
+            for doc_id, tf in postings:
+                out[doc_id] += bm25_term(idf, tf, self.lengths[doc_id], self.avg_length, self.k1, self.b)
+        return out
+
+    def top(self, query, k=3):
+        """Ids of the k best-matching snippets, highest score first (ties keep snippet order)."""
+        best = heapq.nlargest(k, self.scores(query).items(), key=lambda item: (item[1], -item[0]))
+        return [doc_id for doc_id, _ in best]
+
+    def search(self, query, k=3):
+        """The k best-matching snippets, highest score first (ties keep snippet order)."""
+        return [self.snippets[doc_id] for doc_id in self.top(query, k)]
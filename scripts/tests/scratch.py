@@ -0,0 +1,25 @@
+"""Scratch content tree shared by the tests.
+
+Scripts read their content and cache paths when first imported, so test
+modules import this before any of them. chapter-manifest.json is written next
+to the chapters directory, so it stays in the scratch tree too.
+"""
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+CHAPTERS = ["chapter-1-science-7-living-world.json", "chapter-2-science-7-plants.json"]
+
+ROOT = Path(tempfile.mkdtemp(prefix="content-scripts-test-"))
+CHAPTERS_DIR = ROOT / "chapters"
+os.environ["HARYA_CHAPTERS_DIR"] = str(CHAPTERS_DIR)
+os.environ["HARYA_CACHE_DIR"] = str(ROOT / "cache")
+CHAPTERS_DIR.mkdir()
+for _name in CHAPTERS:
+    shutil.copy(SCRIPTS_DIR.parent / "content" / "chapters" / _name, CHAPTERS_DIR)
+sys.path.insert(0, str(SCRIPTS_DIR))
+atexit.register(shutil.rmtree, ROOT, ignore_errors=True)
@@ -0,0 +1,50 @@
+"""Which existing interactive elements add-interactive-elements.py may replace.
+
+    python3 -m pytest scripts/tests
+"""
+import unittest
+
+import scratch  # noqa: F401  sets up the scratch tree; import before any script
+
+from content_pipeline import load_script
+
+interactive = load_script("add-interactive-elements.py")
+
+FILENAME = "chapter-9-science-7-heat.json"
+CURATED = {"type": "match-pairs", "title": "Match the Disaster!", "description": "Hand-written.",
+           "data": {"pairs": [{"term": "Famine", "match": "Severe shortage of food"}]}}
+
+
+def chapter(title, subject, element=None):
+    data = {"metadata": {"title": title, "subject": subject}}
+    if element is not None:
+        data["interactiveElement"] = element
+    return data
+
+
+class AddInteractiveElementTest(unittest.TestCase):
+    def test_curated_element_survives_force(self):
+        data = chapter("Heat ", "Science", CURATED)
+        self.assertFalse(interactive.add_interactive_element(FILENAME, data, force=True))
+        self.assertEqual(data["interactiveElement"], CURATED)
+
+    def test_generated_element_follows_its_inputs(self):
+        before = interactive.get_interactive_element(FILENAME, {"title": "Heat", "subject": "Science"})
+        after = interactive.get_interactive_element(FILENAME, {"title": "Heat", "subject": "Civics"})
+        self.assertNotEqual(before, after)
+        data = chapter("Heat", "Civics", before)
+        self.assertFalse(interactive.add_interactive_element(FILENAME, data))
+        self.assertTrue(interactive.add_interactive_element(FILENAME, data, force=True))
+        self.assertEqual(data["interactiveElement"], after)
+
+    def test_fallback_element_is_recognised_whatever_the_title(self):
+        element = interactive.get_interactive_element(FILENAME, {"title": "Old title", "subject": "Drawing"})
+        self.assertTrue(interactive.is_generated(element))
+        data = chapter("New title", "Drawing", element)
+        self.assertTrue(interactive.add_interactive_element(FILENAME, data, force=True))
+        self.assertEqual(data["interactiveElement"],
+                         interactive.get_interactive_element(FILENAME, data["metadata"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
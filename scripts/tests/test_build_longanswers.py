@@ -0,0 +1,74 @@
+"""Which existing long answers build-longanswers.py may replace.
+
+    python3 -m pytest scripts/tests
+"""
+import importlib.util
+import unittest
+
+from scratch import SCRIPTS_DIR  # sets up the scratch tree; import before any script
+
+from corpus_idf import GroupIdf
+
+_spec = importlib.util.spec_from_file_location("build_longanswers", SCRIPTS_DIR / "build-longanswers.py")
+build_longanswers = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(build_longanswers)
+
+
+QUESTIONS = ["Why do leaves fall in autumn?", "Explain how roots absorb water."]
+
+
+def chapter(long_answers):
+    return {
+        "concepts": [{"title": "Roots", "content": "Roots absorb water and minerals from the soil."}],
+        "test": [{"question": "What do roots absorb?", "explanation": "Roots absorb water."}],
+        "textbookExercise": {"questions": [{"type": "short_answer", "question": q} for q in QUESTIONS],
+                             "longAnswers": long_answers},
+    }
+
+
+def curated(question, i):
+    return {"id": f"la{i}", "question": question, "modelAnswer": "A hand-written answer.",
+            "keyPoints": ["A point."], "marks": 3}
+
+
+def stale(question, i):
+    points = ["Define the concept in textbook terms."]
+    return {"id": f"la{i}", "question": question, "modelAnswer": build_longanswers._outline(question, points),
+            "keyPoints": points, "marks": 3}
+
+
+def build(data, force=False):
+    return build_longanswers.build_long_answers(data, force=force, idf=GroupIdf(0, {}))
+
+
+class BuildLongAnswersTest(unittest.TestCase):
+    def setUp(self):
+        fresh = chapter([])
+        build(fresh)
+        self.generated = fresh["textbookExercise"]["longAnswers"]
+        self.assertTrue(all(build_longanswers.is_generated(a) for a in self.generated))
+
+    def test_curated_answers_survive_a_count_change(self):
+        data = chapter([curated(QUESTIONS[0], 1)])
+        self.assertFalse(build(data))
+        self.assertFalse(build(data, force=True))
+        self.assertEqual(data["textbookExercise"]["longAnswers"], [curated(QUESTIONS[0], 1)])
+
+    def test_force_regenerates_only_generated_answers(self):
+        question = self.generated[1]["question"]
+        data = chapter([curated(QUESTIONS[0], 1), stale(question, 7)])
+        self.assertFalse(build(data))
+        self.assertTrue(build(data, force=True))
+        first, second = data["textbookExercise"]["longAnswers"]
+        self.assertEqual(first, curated(QUESTIONS[0], 1))
+        self.assertEqual(second, {**self.generated[1], "id": "la7", "marks": 3})
+
+    def test_generated_answers_are_replaced(self):
+        data = chapter([stale(a["question"], i) for i, a in enumerate(self.generated, start=1)])
+        self.assertFalse(build(data))
+        self.assertTrue(build(data, force=True))
+        self.assertEqual(data["textbookExercise"]["longAnswers"], self.generated)
+
+
+if __name__ == "__main__":
+    unittest.main()
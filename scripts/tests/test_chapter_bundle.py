@@ -0,0 +1,39 @@
+"""Which chapters chapter_bundle.py packs for the content API to serve unchecked.
+
+    python3 -m pytest scripts/tests
+"""
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from scratch import CHAPTERS, CHAPTERS_DIR  # sets up the scratch tree; import before any script
+
+import chapter_bundle
+
+UNFILED = "chapter-3-science-7-unfiled.json"
+
+
+class BuildBundleTest(unittest.TestCase):
+    def setUp(self):
+        (CHAPTERS_DIR / UNFILED).write_text(json.dumps({"metadata": {"chapterNumber": 3}}), encoding="utf-8")
+        self.path = Path(tempfile.mkdtemp()) / "chapters.bundle"
+
+    def tearDown(self):
+        (CHAPTERS_DIR / UNFILED).unlink()
+        self.path.unlink(missing_ok=True)
+        self.path.parent.rmdir()
+
+    def test_chapters_without_metadata_subject_are_left_out(self):
+        count, _ = chapter_bundle.build_bundle(self.path)
+        self.assertEqual(count, len(CHAPTERS))
+        with chapter_bundle.ChapterBundle(self.path) as bundle:
+            files = {filename for filename, _, _ in bundle.entries.values()}
+            for subject, grade, number in bundle.entries:
+                metadata = json.loads(bundle.raw(subject, grade, number))["metadata"]
+                self.assertEqual((metadata["subject"], metadata["chapterNumber"]), (subject, number))
+        self.assertEqual(files, set(CHAPTERS))
+
+
+if __name__ == "__main__":
+    unittest.main()
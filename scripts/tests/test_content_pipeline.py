@@ -0,0 +1,70 @@
+"""Build-manifest behaviour of the content pipeline, on a scratch copy of a few chapters.
+
+    python3 -m pytest scripts/tests
+"""
+import unittest
+from pathlib import Path
+
+from scratch import CHAPTERS  # sets up the scratch tree; import before any script
+
+import content_pipeline
+
+
+class VersionBumpTest(unittest.TestCase):
+    def setUp(self):
+        self.stage = content_pipeline.STAGES_BY_NAME["longanswers"]
+        self.version = self.stage.version
+        self.original = self.stage._run
+        self.calls = []
+
+        def counting(module, chapter, force):
+            self.calls.append((chapter.filename, force))
+            return self.original(module, chapter, force)
+
+        self.stage._run = counting
+
+    def tearDown(self):
+        self.stage._run = self.original
+        self.stage.version = self.version
+
+    def test_unchanged_files_are_skipped(self):
+        content_pipeline.run(["longanswers"])
+        self.calls.clear()
+        content_pipeline.run(["longanswers"])
+        self.assertEqual(self.calls, [])
+
+    def test_version_bump_triggers_a_rebuild(self):
+        content_pipeline.run(["longanswers"])
+        self.calls.clear()
+        self.stage.version += 1
+        content_pipeline.run(["longanswers"])
+        self.assertEqual(sorted(self.calls), [(name, True) for name in CHAPTERS])
+        # Recorded at the new version, so the next run skips them again.
+        self.calls.clear()
+        content_pipeline.run(["longanswers"])
+        self.assertEqual(self.calls, [])
+
+    def test_full_forces_every_stage(self):
+        content_pipeline.run(["longanswers"])
+        self.calls.clear()
+        content_pipeline.run(["longanswers"], full=True)
+        self.assertEqual(sorted(self.calls), [(name, True) for name in CHAPTERS])
+
+
+class IdfCarryOverTest(unittest.TestCase):
+    def test_pipeline_rewrites_do_not_stale_the_idf_cache(self):
+        import corpus_idf
+        from chapter_corpus import corpus, dump_chapter
+
+        ch = corpus().get(CHAPTERS[0])
+        data = dict(ch.data, textbookExercise={k: v for k, v in ch.data["textbookExercise"].items()
+                                               if k != "longAnswers"})
+        Path(ch.path).write_bytes(dump_chapter(data))
+        corpus_idf.build_idf()
+        updated, _, _ = content_pipeline.run(["longanswers"], [CHAPTERS[0]])
+        self.assertEqual(updated, 1)
+        self.assertEqual(corpus_idf.build_idf()[1], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+"""Which writes from different patch packs patch_pack.py treats as conflicting.
+
+    python3 -m pytest scripts/tests
+"""
+import unittest
+
+import scratch  # noqa: F401  sets up the scratch tree; import before any script
+
+from patch_pack import group_operations
+
+FILENAME = "chapter-1-science-7-living-world.json"
+
+
+def pack(*paths):
+    return {"operations": [{"file": FILENAME, "op": "add", "path": p, "value": {}} for p in paths]}
+
+
+class ConflictTest(unittest.TestCase):
+    def conflicts(self, first, second):
+        return group_operations([pack(first), pack(second)])[1]
+
+    def test_appends_to_one_array_commute(self):
+        self.assertEqual(self.conflicts("/test/-", "/test/-"), {})
+
+    def test_append_and_index_in_one_array_conflict(self):
+        self.assertIn(FILENAME, self.conflicts("/test/-", "/test/3"))
+        self.assertIn(FILENAME, self.conflicts("/test/0/options", "/test/-"))
+
+    def test_append_and_index_in_different_arrays(self):
+        self.assertEqual(self.conflicts("/test/-", "/preAssessment/3"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""The page offset pdf_text_cache.py stores with each book's page index.
+
+    python3 -m pytest scripts/tests
+"""
+import shutil
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+import scratch  # noqa: F401  sets up the scratch tree; import before any script
+
+import pdf_text_cache
+
+# Two pages of front matter, then printed pages 1-30 numbered at the bottom.
+PAGES = ["Cover\n", "Contents\n"] + [f"Page {n} text\n{n}\n" for n in range(1, 31)]
+
+
+class PageOffsetTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.pdf = self.dir / "science-7-en.pdf"
+        self.pdf.write_bytes(b"%PDF-1.4 " + self.id().encode())
+        (self.dir / "book.txt").write_text("\f".join(PAGES) + "\f", encoding="utf-8")
+        pdf_text_cache.import_text(self.pdf, self.dir / "book.txt").close()
+        self.digest = pdf_text_cache.pdf_hash(self.pdf)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def index(self):
+        return pdf_text_cache.TEXT_CACHE_DIR / f"{self.digest}.pages"
+
+    def test_offset_is_read_from_the_index(self):
+        self.assertEqual(pdf_text_cache._read_index(self.digest)[0], 2)
+        # Blank the text: a reader that re-detected the offset would now find 0.
+        text_path = pdf_text_cache.TEXT_CACHE_DIR / f"{self.digest}.txt"
+        text_path.write_bytes(b" " * text_path.stat().st_size)
+        with pdf_text_cache.cached_text(self.pdf) as text:
+            self.assertEqual(text.page_offset, 2)
+
+    def test_offset_override(self):
+        with pdf_text_cache.cached_text(self.pdf, page_offset=0) as text:
+            self.assertEqual(text.pages("3"), "Page 1 text\n1\n\n")
+        with pdf_text_cache.cached_text(self.pdf) as text:
+            self.assertEqual(text.pages("3"), "Page 3 text\n3\n\n")
+
+    def test_older_index_is_rebuilt_from_the_cached_text(self):
+        _, offsets = pdf_text_cache._read_index(self.digest)
+        self.index().write_bytes(b"".join(struct.pack("<Q", o) for o in offsets))
+        with pdf_text_cache.cached_text(self.pdf) as text:
+            self.assertEqual(text.page_offset, 2)
+        self.assertEqual(pdf_text_cache._read_index(self.digest), (2, offsets))
+
+
+if __name__ == "__main__":
+    unittest.main()
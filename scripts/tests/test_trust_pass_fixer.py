@@ -0,0 +1,35 @@
+"""Which chapters the trust pass (and simple_fixer.py) cover.
+
+    python3 -m pytest scripts/tests
+"""
+import unittest
+
+import scratch  # noqa: F401  sets up the scratch tree; import before any script
+
+from chapter_corpus import Chapter
+import trust_pass_fixer
+
+
+def chapter(filename, **metadata):
+    return Chapter(scratch.CHAPTERS_DIR / filename, {"metadata": metadata})
+
+
+class InScopeTest(unittest.TestCase):
+    def test_chapter_eight_of_grade_seven_is_in_scope(self):
+        for filename, subject in [("chapter-8-history-ideal-ruler.json", "History"),
+                                  ("chapter-8-science-7-static-electricity.json", "Science"),
+                                  ("chapter-8-geography-how-seasons-occur-part2.json", "Geography")]:
+            self.assertTrue(trust_pass_fixer.in_scope(chapter(filename, subject=subject)), filename)
+
+    def test_scope_follows_the_manifest_not_the_filename(self):
+        self.assertFalse(trust_pass_fixer.in_scope(chapter("chapter-1-science-8-living-world.json",
+                                                           subject="Science")))
+        self.assertTrue(trust_pass_fixer.in_scope(chapter("chapter-11-circle.json", subject="Mathematics")))
+        self.assertFalse(trust_pass_fixer.in_scope(chapter("chapter-3-science-poem.json", subject="English")))
+
+    def test_files_come_from_the_manifest(self):
+        self.assertEqual(sorted(trust_pass_fixer.trust_pass_files()), sorted(scratch.CHAPTERS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+"""Chapters the validator must report even though the manifest leaves them out.
+
+    python3 -m pytest scripts/tests
+"""
+import unittest
+
+from scratch import CHAPTERS, CHAPTERS_DIR  # sets up the scratch tree; import before any script
+
+import validate_chapters
+
+BROKEN = "chapter-99-broken.json"
+
+
+class UnreadableChapterTest(unittest.TestCase):
+    def setUp(self):
+        (CHAPTERS_DIR / BROKEN).write_text('{"metadata": ', encoding="utf-8")
+
+    def tearDown(self):
+        (CHAPTERS_DIR / BROKEN).unlink()
+
+    def test_unparseable_file_is_a_violation(self):
+        results, _ = validate_chapters.run([BROKEN])
+        self.assertEqual(list(results), [BROKEN])
+        self.assertEqual([path for path, _ in results[BROKEN]], ["$"])
+
+    def test_full_run_includes_unparseable_files(self):
+        results, _ = validate_chapters.run()
+        self.assertEqual(sorted(results), sorted(CHAPTERS + [BROKEN]))
+        self.assertTrue(results[BROKEN])
+
+    def test_missing_file_is_a_violation(self):
+        results, _ = validate_chapters.run(["chapter-98-missing.json"])
+        self.assertEqual([path for path, _ in results["chapter-98-missing.json"]], ["$"])
+
+    def test_exit_status(self):
+        with self.assertRaises(SystemExit) as exit_:
+            validate_chapters.main([BROKEN])
+        self.assertEqual(exit_.exception.code, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,136 +1,73 @@
 import json
-import os
-import re
-
-chapters_dir = 'content/chapters'
-files = [f for f in os.listdir(chapters_dir) if f.endswith('.json')]
-relevant_subjects = ['science', 'mathematics', 'history', 'civics', 'geography']
-
-report = {
-    "reviewed": 0,
-    "flagged": 0,
-    "fixed": 0,
-    "remaining_risk": 0,
-    "top_risk_chapters": []
-}
-
-changed_files = []
-
-def clean_long_answers(data):
-    modified = False
-    boilerplate = "This can be observed in standard textbook examples from this chapter"
-    
-    if 'textbookExercise' in data and 'longAnswers' in data['textbookExercise']:
-        for la in data['textbookExercise']['longAnswers']:
-            # Remove boilerplate from modelAnswer
-            if boilerplate in la.get('modelAnswer', ''):
-                la['modelAnswer'] = la['modelAnswer'].replace(f" {boilerplate}.", "").strip()
-                la['modelAnswer'] = la['modelAnswer'].replace(f"{boilerplate}.", "").strip()
-                la['modelAnswer'] = la['modelAnswer'].replace(f" {boilerplate}", "").strip()
-                la['modelAnswer'] = la['modelAnswer'].replace(f"{boilerplate}", "").strip()
-                modified = True
-            
-            # Remove generic keyPoints
-            generic_pts = [
-                "Defines the concept asked in",
-                "Explains key causes/features in textbook style",
-                "Links the answer to a chapter-based example",
-                boilerplate
-            ]
-            if 'keyPoints' in la:
-                original_len = len(la['keyPoints'])
-                la['keyPoints'] = [p for p in la['keyPoints'] if not any(gp in p for gp in generic_pts)]
-                if len(la['keyPoints']) != original_len:
-                    modified = True
-    return modified
-
-def convert_correct_answer(data):
-    modified = False
-    mapping = {0: "A", 1: "B", 2: "C", 3: "D"}
-    
-    sections = ['preAssessment', 'test']
-    for section in sections:
-        if section in data:
-            for q in data[section]:
-                if isinstance(q.get('correctAnswer'), int):
-                    val = q['correctAnswer']
-                    if val in mapping:
-                        q['correctAnswer'] = mapping[val]
-                        modified = True
-    return modified
-
-for filename in files:
-    if not any(subj in filename.lower() for subj in relevant_subjects):
-        continue
-    
-    # Exclude Grade 8 files explicitly by filename
-    if 'grade-8' in filename.lower() or '-8-' in filename.lower():
-        continue
-    
-    # Exclude English/Marathi/etc if they somehow got in
-    if any(other in filename.lower() for other in ['english', 'marathi', 'hindi']):
-        continue
-
-    path = os.path.join(chapters_dir, filename)
-    report["reviewed"] += 1
-    
-    with open(path, 'r') as f:
-        try:
-            data = json.load(f)
-        except Exception as e:
-            print(f"Error reading {filename}: {e}")
+
+from chapter_corpus import corpus, save_chapter
+from chapter_manifest import chapter_manifest, classify
+from quality_rules import RuleEngine
+
+GRADE = 7
+SUBJECTS = {"Science", "Mathematics", "History", "Civics", "Geography"}
+
+ENGINE = RuleEngine()
+RISK_ENGINE = RuleEngine(fix=False)
+
+def in_scope(entry):
+    """Grade 7 science/maths/social-science chapters covered by the trust pass.
+
+    `entry` is a chapter manifest entry (or a Chapter, which is classified).
+    """
+    if not isinstance(entry, dict):
+        entry = classify(entry)
+    return entry["grade"] == GRADE and entry["subject"] in SUBJECTS
+
+def trust_pass_files():
+    """Filenames of the chapters in scope, in manifest order."""
+    return [e["file"] for e in chapter_manifest().entries if in_scope(e)]
+
+def fix_chapter(data):
+    """Apply all trust-pass fixes to one chapter. Returns True if data changed."""
+    return ENGINE.run(data, grade=GRADE)["changed"]
+
+def risk_score(data):
+    # High risk: empty key points or model answers that are too short after cleaning
+    return RISK_ENGINE.run(data)["risk"]
+
+def main():
+    report = {
+        "reviewed": 0,
+        "flagged": 0,
+        "fixed": 0,
+        "remaining_risk": 0,
+        "top_risk_chapters": []
+    }
+    changed_files = []
+
+    scope = trust_pass_files()
+    for name, err in sorted(corpus().errors.items()):
+        print(f"Error reading {name}: {err}")
+
+    # One pass: the engine fixes each chapter and scores what is left.
+    high_risk = []
+    for filename in sorted(scope):
+        ch = corpus().get(filename)
+        if ch is None:
             continue
 
-    is_fixed = False
-    
-    # 1. Add missing grade: 7
-    if 'metadata' in data:
-        if 'grade' not in data['metadata']:
-            data['metadata']['grade'] = 7
-            is_fixed = True
-    
-    # 2. Check for generic content
-    if clean_long_answers(data):
-        is_fixed = True
-
-    # 3. Check for numeric correct answers
-    if convert_correct_answer(data):
-        is_fixed = True
-
-    if is_fixed:
-        with open(path, 'w') as f:
-            json.dump(data, f, indent=2)
-        if filename not in changed_files:
+        report["reviewed"] += 1
+        result = ENGINE.run(ch.data, grade=GRADE)
+        if result["changed"]:
+            save_chapter(ch)
             changed_files.append(filename)
             report["fixed"] += 1
-    else:
-        # Debug why not fixed
-        pass
-
-# Recalculate remaining risk
-report["flagged"] = len([f for f in changed_files]) # All fixed were flagged
-report["remaining_risk"] = 0
-
-# High risk: empty key points or model answers that are too short after cleaning
-high_risk = []
-for filename in files:
-    if not any(subj in filename.lower() for subj in relevant_subjects): continue
-    if 'grade-8' in filename.lower() or '-8-' in filename.lower(): continue
-    
-    path = os.path.join(chapters_dir, filename)
-    with open(path, 'r') as f:
-        data = json.load(f)
-        
-    risk_score = 0
-    if 'textbookExercise' in data and 'longAnswers' in data['textbookExercise']:
-        for la in data['textbookExercise']['longAnswers']:
-            if not la.get('keyPoints'): risk_score += 2
-            if len(la.get('modelAnswer', '')) < 50: risk_score += 1
-    
-    if risk_score > 0:
-        high_risk.append({"chapter": filename, "score": risk_score})
-
-high_risk.sort(key=lambda x: x['score'], reverse=True)
-report["top_risk_chapters"] = high_risk[:10]
-
-print(json.dumps({"report": report, "changed_files": changed_files}, indent=2))
+        if result["risk"] > 0:
+            high_risk.append({"chapter": filename, "score": result["risk"]})
+
+    report["flagged"] = len(changed_files) # All fixed were flagged
+    report["remaining_risk"] = 0
+
+    high_risk.sort(key=lambda x: x['score'], reverse=True)
+    report["top_risk_chapters"] = high_risk[:10]
+
+    print(json.dumps({"report": report, "changed_files": changed_files}, indent=2))
+
+if __name__ == "__main__":
+    main()
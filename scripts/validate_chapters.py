@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Validate every chapter against content/schema/chapter-schema.json.
+
+The schema is compiled once into a tree of small check functions (one per
+keyword actually present), so validating a document is a straight walk with
+no per-node keyword dispatch. Results are cached in .cache/validation.json by
+chapter content hash and schema hash; only chapters whose content changed
+are revalidated, and those are fanned out across processes with --jobs.
+
+Supports the draft-07 keywords the schema uses (type, required, properties,
+additionalProperties, items, enum, const, min/maxItems, min/maxLength,
+minimum/maximum, pattern); any other validation keyword is an error rather
+than being silently ignored.
+
+Usage:
+    python3 scripts/validate_chapters.py
+    python3 scripts/validate_chapters.py chapter-18-sound.json
+    python3 scripts/validate_chapters.py --jobs 0 --json
+"""
+import argparse
+import json
+import operator
+import os
+import re
+import sys
+from functools import lru_cache
+
+from build_manifest import input_hash
+from chapter_corpus import CACHE_DIR, REPO_ROOT, corpus
+from chapter_manifest import chapter_manifest
+from content_pipeline import add_jobs_argument, resolve_jobs
+
+SCHEMA_PATH = REPO_ROOT / "content" / "schema" / "chapter-schema.json"
+RESULTS_PATH = CACHE_DIR / "validation.json"
+_VERSION = 1
+
+_ANNOTATIONS = {"$schema", "$id", "$comment", "title", "description", "examples", "default"}
+_TYPES = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def _type_name(value):
+    for name in ("boolean", "integer", "number", "string", "array", "object", "null"):
+        if _TYPES[name](value):
+            return name
+    return type(value).__name__
+
+
+def _json_equal(a, b):
+    # In Python True == 1, but not in JSON.
+    return a == b and isinstance(a, bool) == isinstance(b, bool)
+
+
+def compile_schema(schema):
+    """Turn a schema node into check(value, path, errors), appending (path, message) pairs."""
+    unknown = set(schema) - _ANNOTATIONS - {
+        "type", "required", "properties", "additionalProperties", "items", "enum", "const",
+        "minItems", "maxItems", "minLength", "maxLength", "minimum", "maximum", "pattern"}
+    if unknown:
+        raise ValueError(f"Unsupported schema keyword(s): {', '.join(sorted(unknown))}")
+
+    type_check = None
+    shape = []  # checks that only make sense once the type matched
+
+    if "type" in schema:
+        names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        tests = [_TYPES[n] for n in names]
+        expected = " or ".join(names)
+
+        def check_type(value, path, errors):
+            if not any(t(value) for t in tests):
+                errors.append((path, f"expected {expected}, got {_type_name(value)}"))
+                return False
+            return True
+        type_check = check_type
+
+    if "enum" in schema:
+        allowed = schema["enum"]
+        shown = ", ".join(json.dumps(a, ensure_ascii=False) for a in allowed)
+
+        def check_enum(value, path, errors):
+            if not any(_json_equal(value, a) for a in allowed):
+                errors.append((path, f"{json.dumps(value, ensure_ascii=False)} is not one of {shown}"))
+        shape.append(check_enum)
+
+    if "const" in schema:
+        const = schema["const"]
+
+        def check_const(value, path, errors):
+            if not _json_equal(value, const):
+                errors.append((path, f"expected {json.dumps(const, ensure_ascii=False)}"))
+        shape.append(check_const)
+
+    if "required" in schema:
+        required = list(schema["required"])
+
+        def check_required(value, path, errors):
+            if isinstance(value, dict):
+                for key in required:
+                    if key not in value:
+                        errors.append((path, f"missing required property '{key}'"))
+        shape.append(check_required)
+
+    if "properties" in schema or "additionalProperties" in schema:
+        props = {k: compile_schema(v) for k, v in schema.get("properties", {}).items()}
+        extra = schema.get("additionalProperties", True)
+        extra_check = compile_schema(extra) if isinstance(extra, dict) else None
+
+        def check_properties(value, path, errors):
+            if not isinstance(value, dict):
+                return
+            for key, item in value.items():
+                sub = props.get(key)
+                if sub is not None:
+                    sub(item, f"{path}.{key}", errors)
+                elif extra is False:
+                    errors.append((path, f"unexpected property '{key}'"))
+                elif extra_check is not None:
+                    extra_check(item, f"{path}.{key}", errors)
+        shape.append(check_properties)
+
+    if "items" in schema:
+        item_check = compile_schema(schema["items"])
+
+        def check_items(value, path, errors):
+            if isinstance(value, list):
+                for i, item in enumerate(value):
+                    item_check(item, f"{path}[{i}]", errors)
+        shape.append(check_items)
+
+    def bound(keyword, measure, applies, op, describe):
+        limit = schema[keyword]
+
+        def check_bound(value, path, errors):
+            if applies(value) and not op(measure(value), limit):
+                errors.append((path, describe(limit, measure(value))))
+        shape.append(check_bound)
+
+    is_list = _TYPES["array"]
+    is_str = _TYPES["string"]
+    is_num = _TYPES["number"]
+    if "minItems" in schema:
+        bound("minItems", len, is_list, operator.ge, lambda n, got: f"expected at least {n} items, got {got}")
+    if "maxItems" in schema:
+        bound("maxItems", len, is_list, operator.le, lambda n, got: f"expected at most {n} items, got {got}")
+    if "minLength" in schema:
+        bound("minLength", len, is_str, operator.ge, lambda n, got: f"expected at least {n} characters, got {got}")
+    if "maxLength" in schema:
+        bound("maxLength", len, is_str, operator.le, lambda n, got: f"expected at most {n} characters, got {got}")
+    if "minimum" in schema:
+        bound("minimum", lambda v: v, is_num, operator.ge, lambda n, got: f"{got} is less than {n}")
+    if "maximum" in schema:
+        bound("maximum", lambda v: v, is_num, operator.le, lambda n, got: f"{got} is greater than {n}")
+
+    if "pattern" in schema:
+        pattern = re.compile(schema["pattern"])
+
+        def check_pattern(value, path, errors):
+            if isinstance(value, str) and not pattern.search(value):
+                errors.append((path, f"does not match /{schema['pattern']}/"))
+        shape.append(check_pattern)
+
+    if type_check is not None:
+        def check(value, path, errors):
+            if type_check(value, path, errors):
+                for c in shape:
+                    c(value, path, errors)
+    else:
+        def check(value, path, errors):
+            for c in shape:
+                c(value, path, errors)
+    return check
+
+
+def load_schema(path=SCHEMA_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def compiled_schema(path=SCHEMA_PATH):
+    """Compiled validator for the schema file; built once per process."""
+    return compile_schema(load_schema(path))
+
+
+def validate(data, check=None):
+    """[(json path, message)] for one chapter document."""
+    errors = []
+    (check or compiled_schema())(data, "$", errors)
+    return errors
+
+
+def _validate_file(filename):
+    ch = corpus().get(filename)
+    if ch is None:
+        return filename, [("$", f"unreadable: {corpus().errors.get(filename, 'missing')}")]
+    return filename, validate(ch.data)
+
+
+class ValidationCache:
+    """Last validation result per chapter, keyed by content hash and schema hash."""
+
+    def __init__(self, schema_hash, path=RESULTS_PATH):
+        self.path = path
+        self.schema_hash = schema_hash
+        self.results = {}
+        self._dirty = False
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            if raw.get("version") == _VERSION and raw.get("schemaHash") == schema_hash:
+                self.results = raw.get("chapters", {})
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def get(self, filename, content_hash):
+        entry = self.results.get(filename)
+        if entry and entry["contentHash"] == content_hash:
+            return [tuple(e) for e in entry["errors"]]
+        return None
+
+    def put(self, filename, content_hash, errors):
+        self.results[filename] = {"contentHash": content_hash, "errors": [list(e) for e in errors]}
+        self._dirty = True
+
+    def save(self, filenames):
+        """Persist results, dropping chapters that no longer exist."""
+        kept = {k: v for k, v in self.results.items() if k in filenames}
+        if not self._dirty and len(kept) == len(self.results):
+            return
+        self.results = kept
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": _VERSION, "schemaHash": self.schema_hash, "chapters": self.results},
+                               ensure_ascii=False, separators=(",", ":")))
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+def run(filenames=None, full=False, jobs=1):
+    """Validate chapters; returns {filename: [(path, message)]} for every checked chapter.
+
+    Files the manifest leaves out because they do not parse (and requested
+    files that do not exist) are reported as a violation at `$`.
+    """
+    entries = chapter_manifest().entries
+    unlisted = set(corpus().file_stats()) - {e["file"] for e in entries}
+    if filenames:
+        wanted = {os.path.basename(f) for f in filenames}
+        entries = [e for e in entries if e["file"] in wanted]
+        unlisted = wanted - {e["file"] for e in entries}
+
+    cache = ValidationCache(input_hash(load_schema()))
+    results = {}
+    stale = []
+    for e in entries:
+        cached = None if full else cache.get(e["file"], e["contentHash"])
+        if cached is None:
+            stale.append(e)
+        else:
+            results[e["file"]] = cached
+
+    names = [e["file"] for e in stale] + sorted(unlisted)
+    if jobs > 1 and len(names) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            fresh = list(pool.map(_validate_file, names, chunksize=max(1, len(names) // (jobs * 4))))
+    else:
+        fresh = [_validate_file(n) for n in names]
+    hashes = {e["file"]: e["contentHash"] for e in stale}
+    for filename, errors in fresh:
+        results[filename] = errors
+        if filename in hashes:
+            cache.put(filename, hashes[filename], errors)
+
+    cache.save({e["file"] for e in chapter_manifest().entries})
+    return dict(sorted(results.items())), len(names)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate chapters against the chapter JSON schema.")
+    parser.add_argument("files", nargs="*", help="Limit validation to these chapter filenames")
+    parser.add_argument("--full", action="store_true", help="Revalidate every chapter, ignoring cached results")
+    parser.add_argument("--json", action="store_true", help="Print violations as JSON")
+    add_jobs_argument(parser)
+    args = parser.parse_args(argv)
+
+    results, checked = run(args.files, args.full, resolve_jobs(args.jobs))
+    bad = {name: errors for name, errors in results.items() if errors}
+    if args.json:
+        print(json.dumps({name: [{"path": p, "message": m} for p, m in errors] for name, errors in bad.items()},
+                         indent=2, ensure_ascii=False))
+    else:
+        for name, errors in bad.items():
+            for path, message in errors:
+                print(f"  ✗ {name}: {path}: {message}")
+    total = sum(len(e) for e in bad.values())
+    print(f"Validated {len(results)} chapters ({checked} checked, {len(results) - checked} unchanged): "
+          f"{total} violations in {len(bad)} files", file=sys.stderr)
+    sys.exit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()
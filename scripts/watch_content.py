@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Watch content/chapters and rebuild only what depends on the files that changed.
+
+When chapter files are saved, the watcher waits for a short quiet period
+(so an editor's save-and-rename, or a batch of saves, becomes one rebuild),
+then for just those files:
+
+    1. runs the derived-content stages (default: qacards, longanswers),
+    2. revalidates them against the chapter schema,
+    3. refreshes the chapter manifest and, if one exists, the chapter bundle.
+
+Everything runs in this one long-lived process, so the stage scripts, the
+compiled schema and the parsed corpus stay warm between rebuilds and a
+single-file change is reflected well within a second.
+
+On Linux the chapters directory is watched with inotify; elsewhere (or if
+inotify is unavailable) it is polled with one scandir per interval.
+
+Usage:
+    python3 scripts/watch_content.py
+    python3 scripts/watch_content.py --stages qacards,longanswers,interactive --bundle
+"""
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+import content_pipeline
+import validate_chapters
+from chapter_bundle import BUNDLE_PATH, build_bundle
+from chapter_corpus import corpus
+from chapter_manifest import refresh_manifest
+from corpus_idf import idf_table
+
+DEFAULT_STAGES = ("qacards", "longanswers")
+
+# inotify(7) event bits.
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_NONBLOCK = 0o4000
+_EVENT = struct.Struct("iIII")
+
+
+class PollingSource:
+    """Changed chapter names found by comparing (mtime, size) between scans."""
+
+    def __init__(self, chapters, interval):
+        self.chapters = chapters
+        self.interval = interval
+        self.stats = chapters.file_stats()
+
+    def wait(self, timeout):
+        time.sleep(min(timeout, self.interval) if timeout is not None else self.interval)
+        now = self.chapters.file_stats()
+        changed = {n for n in now.keys() | self.stats.keys() if now.get(n) != self.stats.get(n)}
+        self.stats = now
+        return changed
+
+    def absorb(self, names):
+        """Take our own writes to these files as the new baseline."""
+        now = self.chapters.file_stats()
+        for n in names:
+            if n in now:
+                self.stats[n] = now[n]
+            else:
+                self.stats.pop(n, None)
+
+    def close(self):
+        pass
+
+
+class InotifySource:
+    """Changed chapter names reported by inotify on the chapters directory."""
+
+    def __init__(self, chapters):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+        if libc.inotify_add_watch(self.fd, os.fsencode(chapters.chapters_dir), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"cannot watch {chapters.chapters_dir}")
+        self.chapters = chapters
+        self.stats = chapters.file_stats()
+
+    def wait(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        names = set()
+        try:
+            while True:
+                buf = os.read(self.fd, 64 * 1024)
+                offset = 0
+                while offset < len(buf):
+                    _, _, _, length = _EVENT.unpack_from(buf, offset)
+                    offset += _EVENT.size
+                    name = buf[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+                    offset += length
+                    if name.endswith(".json"):
+                        names.add(name)
+        except BlockingIOError:
+            pass
+        # Events also fire for writes that leave the file as it was (and for
+        # our own saves); only report files whose (mtime, size) really moved.
+        now = self.chapters.file_stats()
+        changed = {n for n in names if now.get(n) != self.stats.get(n)}
+        for n in changed:
+            if n in now:
+                self.stats[n] = now[n]
+            else:
+                self.stats.pop(n, None)
+        return changed
+
+    def absorb(self, names):
+        now = self.chapters.file_stats()
+        for n in names:
+            if n in now:
+                self.stats[n] = now[n]
+            else:
+                self.stats.pop(n, None)
+
+    def close(self):
+        os.close(self.fd)
+
+
+def open_source(chapters, interval, polling=False):
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifySource(chapters)
+        except (OSError, AttributeError) as e:
+            print(f"inotify unavailable ({e}); polling every {interval}s", file=sys.stderr)
+    return PollingSource(chapters, interval)
+
+
+def rebuild(names, stages, bundle):
+    """Run the dependent steps for one coalesced batch of changed files."""
+    t0 = time.perf_counter()
+    chapters = corpus()
+    present = sorted(n for n in names if (chapters.chapters_dir / n).exists())
+    removed = sorted(set(names) - set(present))
+    for n in removed:
+        chapters.invalidate(n)
+        print(f"  - removed {n}")
+
+    # Long answers weigh key terms by subject-wide document frequencies.
+    idf_table(refresh=True)
+    if present:
+        content_pipeline.run(stages, present)
+        results, _ = validate_chapters.run(present)
+        for name, errors in results.items():
+            for path, message in errors[:5]:
+                print(f"  ✗ {name}: {path}: {message}")
+            if len(errors) > 5:
+                print(f"  ✗ {name}: ... {len(errors) - 5} more")
+    else:
+        refresh_manifest()
+    if bundle:
+        build_bundle()
+    print(f"Rebuilt {len(present)} changed, {len(removed)} removed in {time.perf_counter() - t0:.2f}s", flush=True)
+
+
+def watch(stages=DEFAULT_STAGES, debounce=0.15, interval=0.25, bundle=False, polling=False):
+    chapters = corpus()
+    source = open_source(chapters, interval, polling)
+    # Warm everything a rebuild needs, so the first change is as fast as the rest.
+    for stage in content_pipeline.select_stages(stages):
+        content_pipeline.load_script(stage.script)
+    validate_chapters.compiled_schema()
+    chapters.refresh()
+    print(f"Watching {chapters.chapters_dir} ({type(source).__name__[:-6].lower()}); "
+          f"stages: {', '.join(stages)}{', bundle' if bundle else ''}. Ctrl-C to stop.", flush=True)
+
+    pending = set()
+    quiet_since = None
+    try:
+        while True:
+            timeout = None if not pending else max(0.0, debounce - (time.monotonic() - quiet_since))
+            changed = source.wait(timeout)
+            if changed:
+                pending |= changed
+                quiet_since = time.monotonic()
+                continue
+            if pending and time.monotonic() - quiet_since >= debounce:
+                batch, pending = pending, set()
+                print(f"{len(batch)} file(s) changed: {', '.join(sorted(batch)[:5])}"
+                      f"{' ...' if len(batch) > 5 else ''}", flush=True)
+                try:
+                    rebuild(batch, stages, bundle)
+                except Exception as e:  # keep watching after a bad save
+                    print(f"  ✗ rebuild failed: {e}", flush=True)
+                source.absorb(batch)
+    except KeyboardInterrupt:
+        print("Stopped.")
+    finally:
+        source.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild derived content for chapter files as they change.")
+    parser.add_argument("--stages", default=",".join(DEFAULT_STAGES),
+                        help=f"Comma-separated pipeline stages to rerun (from: {', '.join(content_pipeline.STAGES_BY_NAME)})")
+    parser.add_argument("--bundle", action="store_true",
+                        help="Also rebuild the chapter bundle (default: only if one already exists)")
+    parser.add_argument("--debounce", type=float, default=0.15, help="Quiet period before rebuilding, in seconds")
+    parser.add_argument("--interval", type=float, default=0.25, help="Polling interval, in seconds")
+    parser.add_argument("--poll", action="store_true", help="Poll even where inotify is available")
+    args = parser.parse_args(argv)
+
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    try:
+        content_pipeline.select_stages(stages)
+    except ValueError as e:
+        parser.error(str(e))
+    watch(stages, args.debounce, args.interval, args.bundle or BUNDLE_PATH.exists(), args.poll)
+
+
+if __name__ == "__main__":
+    main()